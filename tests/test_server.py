@@ -0,0 +1,40 @@
+import asyncio
+import unittest
+
+from uriscv.errors import UriscvError
+from uriscv.server import SimulationServer, request
+
+PROGRAM = "ori x1, x0, 5\nori x2, x0, 7\n"
+
+
+class MalformedRequestTest(unittest.IsolatedAsyncioTestCase):
+    """A request with fields of the wrong type is refused without losing a worker"""
+
+    async def asyncSetUp(self):
+        self.server = SimulationServer(workers=1)
+        self.address = await self.server.start(port=0)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_malformed_then_valid(self):
+        malformed = [
+            {"op": "run", "source": 123},
+            {"op": "run", "source": PROGRAM, "memory": [1]},
+            {"op": "run", "source": PROGRAM, "pipeline": 5},
+            {"op": "run", "source": PROGRAM, "dump": [0]},
+            {"op": "assemble", "source": None},
+        ]
+        for message in malformed:
+            with self.subTest(message=message):
+                with self.assertRaises(UriscvError):
+                    await asyncio.wait_for(request(self.address, message), 10)
+
+        reply = await asyncio.wait_for(request(self.address, {"op": "run", "source": PROGRAM}), 10)
+        self.assertEqual(reply["status"], "complete")
+        self.assertEqual(reply["registers"][1:3], [5, 7])
+        self.assertEqual(self.server.stats['failed'], len(malformed))
+
+
+if __name__ == "__main__":
+    unittest.main()
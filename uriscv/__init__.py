@@ -0,0 +1,35 @@
+"""μRISCV assembler and pipeline simulator
+
+The assembler and engine are importable without tkinter; the Tk front
+end lives in uriscv.gui and is only loaded when it is imported, and
+SimulationServer (which needs asyncio) is loaded on first use.
+"""
+from .isa import (
+    DATA_START, DATA_END, PROG_START, PROG_END,
+    R_TYPE, I_TYPE, S_TYPE, B_TYPE, DIRECTIVE, SUPPORTED_INSTRUCTIONS,
+)
+from .errors import UriscvError, AssemblyError, SimulationError
+from .assembler import (
+    split_source, validate_instruction, validate_program, assemble,
+    encode_single_instruction, generate_opcodes, IncrementalAssembler,
+)
+from .memory import PagedMemory
+from .images import load_image, dump_image
+from .cache import DataCache
+from .geometry import PipelineGeometry
+from .engine import PipelineEngine, RunResult, DEFAULT_MAX_CYCLES, DEFAULT_MAX_SECONDS
+from .superscalar import DualIssueEngine
+from .functional import FunctionalSimulator
+from .batch import BatchSimulator
+from .checkpoint import save_checkpoint, load_checkpoint
+from .profiler import Profiler
+from .statehash import HashStream, bisect_divergence
+from .multihart import MultiHartSimulator
+
+
+def __getattr__(name):
+    # The server pulls in asyncio, so it is only imported when asked for
+    if name == "SimulationServer":
+        from .server import SimulationServer
+        return SimulationServer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,313 @@
+from .instructions import OPCODE_BRANCH, handler_for
+
+# ============================================================
+# μRISCV static analysis: control-flow graph, RAW hazards, CPI estimate
+# ============================================================
+
+# The pipeline has no data-hazard interlock: a value written back is only
+# visible to an instruction decoded at least this many slots later.
+HAZARD_GAP = 3
+
+# Timing of PipelineEngine with the pipeline-freeze policy
+PIPELINE_FILL = 4       # priming cycle plus draining the last instruction
+FREEZE_PENALTY = 1      # fetch slot lost for every taken branch
+
+# Branch outcome guesses used to weight the CFG
+DEFAULT_LOOP_TRIPS = 10
+DEFAULT_FORWARD_TAKEN = 0.5
+
+BLT_FUNCT3 = 0b100
+BGE_FUNCT3 = 0b101
+
+
+class BasicBlock:
+    """Straight-line run of instructions ending at a branch or before a branch target"""
+
+    def __init__(self, index, addresses):
+        self.index = index
+        self.addresses = addresses
+        # (target address, probability, taken) for every way out of the block;
+        # a target outside program memory means the program ends there
+        self.successors = []
+        self.taken_probability = 0.0
+        self.frequency = 0.0
+
+    @property
+    def start(self):
+        return self.addresses[0]
+
+    @property
+    def end(self):
+        return self.addresses[-1]
+
+    def freeze_cycles(self):
+        """Expected freeze cycles per execution of the block"""
+        return self.taken_probability * FREEZE_PENALTY
+
+    def cycles(self):
+        """Expected cycles per execution of the block"""
+        return len(self.addresses) + self.freeze_cycles()
+
+    def cpi(self):
+        return self.cycles() / len(self.addresses)
+
+    def as_dict(self):
+        return {
+            'block': self.index,
+            'start': self.start,
+            'end': self.end,
+            'instructions': len(self.addresses),
+            'frequency': round(self.frequency, 4),
+            'taken_probability': round(self.taken_probability, 4),
+            'freeze_cycles': round(self.freeze_cycles(), 4),
+            'cpi': round(self.cpi(), 4),
+        }
+
+
+class Hazard:
+    """A register read fewer than HAZARD_GAP slots after the instruction that writes it"""
+
+    def __init__(self, address, producer, register, distance):
+        self.address = address
+        self.producer = producer
+        self.register = register
+        self.distance = distance
+
+    @property
+    def stalls(self):
+        """Cycles an interlock would have to insert (the pipeline reads the stale value instead)"""
+        return HAZARD_GAP - self.distance
+
+    def as_dict(self):
+        return {
+            'address': self.address,
+            'producer': self.producer,
+            'register': self.register,
+            'distance': self.distance,
+            'stalls': self.stalls,
+        }
+
+
+class Analysis:
+    """Result of analyze(): blocks, hazards and the cycle estimate"""
+
+    def __init__(self, blocks, hazards):
+        self.blocks = blocks
+        self.hazards = hazards
+        self.block_of = {addr: block for block in blocks for addr in block.addresses}
+
+        self.instructions = sum(block.frequency * len(block.addresses) for block in blocks)
+        self.freeze_cycles = sum(block.frequency * block.freeze_cycles() for block in blocks)
+        self.cycles = PIPELINE_FILL + self.instructions + self.freeze_cycles if self.instructions else 0.0
+        self.stall_cycles = sum(self.block_of[h.address].frequency * h.stalls for h in hazards)
+
+    def cpi(self):
+        return self.cycles / self.instructions if self.instructions else 0.0
+
+    def summary(self):
+        return (
+            f"Estimated {self.cycles:.1f} cycles for {self.instructions:.1f} instructions "
+            f"(CPI {self.cpi():.3f}, {self.freeze_cycles:.1f} freeze cycles, "
+            f"{len(self.hazards)} RAW hazard(s) worth {self.stall_cycles:.1f} interlock stall cycles)"
+        )
+
+    def as_dict(self):
+        return {
+            'cycles': round(self.cycles, 4),
+            'instructions': round(self.instructions, 4),
+            'freeze_cycles': round(self.freeze_cycles, 4),
+            'stall_cycles': round(self.stall_cycles, 4),
+            'cpi': round(self.cpi(), 4),
+            'blocks': [block.as_dict() for block in self.blocks],
+            'hazards': [hazard.as_dict() for hazard in self.hazards],
+        }
+
+
+# -------------------------
+# Control-flow graph
+# -------------------------
+
+def branch_target(addr, instruction):
+    return (addr + handler_for(instruction).immediate(instruction)) & 0xFFFFFFFF
+
+
+def is_branch(instruction):
+    return instruction & 0x7F == OPCODE_BRANCH
+
+
+def taken_probability(addr, instruction, loop_trips, forward_taken):
+    """Guess how often a branch is taken from its encoding and direction"""
+    funct3 = (instruction >> 12) & 0x7
+    rs1 = (instruction >> 15) & 0x1F
+    rs2 = (instruction >> 20) & 0x1F
+    if funct3 not in (BLT_FUNCT3, BGE_FUNCT3):
+        return 0.0
+    backward = branch_target(addr, instruction) <= addr
+    # A loop must exit for the estimate to be finite
+    loop_probability = 1.0 - 1.0 / max(loop_trips, 1.0)
+    if rs1 == rs2:
+        # bge x, x is an unconditional jump, blt x, x never branches
+        if funct3 == BLT_FUNCT3:
+            return 0.0
+        return loop_probability if backward else 1.0
+    return loop_probability if backward else forward_taken
+
+
+def build_cfg(program_memory, loop_trips=DEFAULT_LOOP_TRIPS, forward_taken=DEFAULT_FORWARD_TAKEN):
+    """Split program memory into basic blocks linked by fall-through and branch edges"""
+    addresses = sorted(program_memory)
+    leaders = {addresses[0]} if addresses else set()
+    for addr in addresses:
+        instruction = program_memory[addr]
+        if is_branch(instruction):
+            leaders.add(branch_target(addr, instruction))
+            leaders.add(addr + 4)
+
+    blocks = []
+    current = []
+    for addr in addresses:
+        if current and (addr in leaders or addr != current[-1] + 4):
+            blocks.append(BasicBlock(len(blocks), current))
+            current = []
+        current.append(addr)
+        if is_branch(program_memory[addr]):
+            blocks.append(BasicBlock(len(blocks), current))
+            current = []
+    if current:
+        blocks.append(BasicBlock(len(blocks), current))
+
+    for block in blocks:
+        last = program_memory[block.end]
+        if is_branch(last):
+            p = taken_probability(block.end, last, loop_trips, forward_taken)
+            block.taken_probability = p
+            block.successors.append((branch_target(block.end, last), p, True))
+            block.successors.append((block.end + 4, 1.0 - p, False))
+        else:
+            block.successors.append((block.end + 4, 1.0, False))
+    return blocks
+
+
+def estimate_frequencies(blocks):
+    """Expected executions of each block for one run, from the edge probabilities
+
+    The frequencies satisfy f[b] = entry[b] + sum of f[pred] * p(pred -> b)
+    over b's incoming edges. That linear system is solved directly by
+    sparse Gaussian elimination in block order, so a loop expected to run
+    50000 times gets 50000 and not whatever an iteration reaches. Every
+    cycle of the CFG contains a backward edge taken with probability
+    below 1, so the system always has a solution.
+    """
+    if not blocks:
+        return
+    by_start = {block.start: block for block in blocks}
+    # Row b of (I - P^T) as {column: coefficient}, and which rows use each column
+    rows = [{block.index: 1.0} for block in blocks]
+    users = [set() for _ in blocks]
+    for block in blocks:
+        for target, probability, _ in block.successors:
+            successor = by_start.get(target)
+            if successor is not None and probability > 0:
+                row = rows[successor.index]
+                row[block.index] = row.get(block.index, 0.0) - probability
+                users[block.index].add(successor.index)
+    rhs = [0.0] * len(blocks)
+    rhs[0] = 1.0
+
+    for k, pivot_row in enumerate(rows):
+        pivot = pivot_row[k]
+        for r in sorted(users[k]):
+            if r <= k:
+                continue
+            row = rows[r]
+            factor = row.pop(k) / pivot
+            for column, value in pivot_row.items():
+                if column != k:
+                    row[column] = row.get(column, 0.0) - factor * value
+                    users[column].add(r)
+            rhs[r] -= factor * rhs[k]
+
+    for k in range(len(blocks) - 1, -1, -1):
+        row = rows[k]
+        total = rhs[k] - sum(value * blocks[column].frequency for column, value in row.items() if column > k)
+        blocks[k].frequency = total / row[k]
+
+
+# -------------------------
+# Hazards
+# -------------------------
+
+def find_hazards(program_memory, blocks):
+    """RAW dependencies closer than HAZARD_GAP slots along any CFG path
+
+    A taken branch puts a freeze bubble between the branch and its target,
+    so that edge counts as two slots.
+    """
+    by_start = {block.start: block for block in blocks}
+    block_of = {addr: block for block in blocks for addr in block.addresses}
+
+    # addr -> [(previous instruction, slots between them)]
+    previous = {addr: [] for addr in program_memory}
+    for block in blocks:
+        for before, addr in zip(block.addresses, block.addresses[1:]):
+            previous[addr].append((before, 1))
+        for target, probability, taken in block.successors:
+            if target in by_start and probability > 0:
+                previous[target].append((block.end, 2 if taken else 1))
+
+    hazards = []
+    for addr, instruction in sorted(program_memory.items()):
+        if block_of[addr].frequency == 0:
+            continue
+        sources = {reg for reg in handler_for(instruction).sources(instruction) if reg}
+        if not sources:
+            continue
+        nearest = {}
+        stack = [(before, gap) for before, gap in previous[addr]]
+        while stack:
+            producer, distance = stack.pop()
+            if distance >= HAZARD_GAP:
+                continue
+            word = program_memory[producer]
+            handler = handler_for(word)
+            rd = (word >> 7) & 0x1F if handler.writes_rd else 0
+            if rd in sources and distance < nearest.get(rd, (HAZARD_GAP, None))[0]:
+                nearest[rd] = (distance, producer)
+            stack.extend((before, distance + gap) for before, gap in previous[producer])
+        for register, (distance, producer) in sorted(nearest.items()):
+            hazards.append(Hazard(addr, producer, register, distance))
+    return hazards
+
+
+def analyze(program_memory, loop_trips=DEFAULT_LOOP_TRIPS, forward_taken=DEFAULT_FORWARD_TAKEN):
+    """Estimate cycles, CPI and RAW hazards of a program without simulating it"""
+    blocks = build_cfg(program_memory, loop_trips, forward_taken)
+    estimate_frequencies(blocks)
+    return Analysis(blocks, find_hazards(program_memory, blocks))
+
+
+# -------------------------
+# Source annotation
+# -------------------------
+
+def annotate(analysis, addresses):
+    """Return {line_num: note} for the lines in addresses ({addr: line_num})"""
+    notes = {}
+    for addr, line_num in addresses.items():
+        block = analysis.block_of.get(addr)
+        if block is None:
+            continue
+        if block.frequency == 0:
+            notes[line_num] = f"B{block.index} unreachable"
+            continue
+        parts = [f"B{block.index} x{block.frequency:.3g}"]
+        if addr == block.start:
+            parts.append(f"CPI {block.cpi():.2f}")
+        if addr == block.end and block.taken_probability:
+            parts.append(f"taken {block.taken_probability:.0%}, +{block.freeze_cycles():.2f} freeze")
+        for hazard in analysis.hazards:
+            if hazard.address == addr:
+                producer_line = addresses.get(hazard.producer, "?")
+                parts.append(f"RAW x{hazard.register} on line {producer_line}: {hazard.stalls} slot(s) too close")
+        notes[line_num] = " | ".join(parts)
+    return notes
@@ -0,0 +1,499 @@
+import re
+import threading
+
+from .errors import AssemblyError
+from .isa import (
+    PROG_START, R_TYPE, I_TYPE, S_TYPE, B_TYPE, DIRECTIVE, SUPPORTED_INSTRUCTIONS,
+    REGISTER_PATTERN, IMMEDIATE_PATTERN, HEX_PATTERN,
+)
+
+# ============================================================
+# μRISCV Assembler (validation, encoding, opcode listing)
+# ============================================================
+
+
+def split_source(text):
+    """Split source text into (line_num, line) pairs, skipping blank lines"""
+    lines = []
+    for i, line in enumerate(text.splitlines()):
+        line = line.strip()
+        if line:
+            lines.append((i + 1, line))
+    return lines
+
+
+# -------------------------
+# Validation
+# -------------------------
+
+def validate_instruction(line_num, instruction):
+    """Validate a single instruction line"""
+    instruction = instruction.split('#')[0].strip()
+    if not instruction:
+        return None
+    if ':' in instruction:
+        label_part = instruction.split(':')[0].strip()
+        instruction_part = instruction.split(':')[1].strip() if len(instruction.split(':')) > 1 else ""
+        if not re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', label_part):
+            return f"Line {line_num}: Invalid label name '{label_part}'"
+        if instruction_part:
+            error = validate_instruction(line_num, instruction_part)
+            if error:
+                return error
+        return None
+    if instruction.upper().startswith('SW'):
+        parts = re.split(r'[, \t]+', instruction)
+        parts = [p for p in parts if p]
+        if len(parts) < 3:
+            return f"Line {line_num}: SW requires 2 operands (rs2, offset(rs1))"
+        rs2 = parts[1].rstrip(',')
+        offset_rs1 = ' '.join(parts[2:])
+        if not REGISTER_PATTERN.match(rs2):
+            return f"Line {line_num}: Invalid source register '{rs2}' in SW"
+        match = re.match(r'(-?0x[0-9a-fA-F]+|-?[0-9]+)\((\w+)\)', offset_rs1)
+        if not match:
+            return f"Line {line_num}: Invalid memory operand format '{offset_rs1}' in SW"
+        if not REGISTER_PATTERN.match(match.group(2)):
+            return f"Line {line_num}: Invalid base register '{match.group(2)}' in SW"
+        return None
+    parts = re.split(r'[,\s]+', instruction)
+    parts = [p for p in parts if p]
+    if not parts:
+        return None
+    mnemonic = parts[0].upper()
+    if mnemonic not in SUPPORTED_INSTRUCTIONS:
+        return f"Line {line_num}: Unsupported instruction '{mnemonic}'"
+    if mnemonic in R_TYPE:
+        if len(parts) != 4:
+            return f"Line {line_num}: {mnemonic} requires 3 operands (rd, rs1, rs2)"
+        for reg in parts[1:4]:
+            if not REGISTER_PATTERN.match(reg):
+                return f"Line {line_num}: Invalid register '{reg}' in {mnemonic}"
+    elif mnemonic in I_TYPE:
+        if mnemonic == "LW":
+            if len(parts) != 3:
+                return f"Line {line_num}: LW requires 2 operands (rd, offset(rs1))"
+            if not REGISTER_PATTERN.match(parts[1]):
+                return f"Line {line_num}: Invalid destination register '{parts[1]}' in LW"
+            offset_rs1_part = parts[2]
+            if IMMEDIATE_PATTERN.match(offset_rs1_part) or HEX_PATTERN.match(offset_rs1_part):
+                parts[2] = f"{offset_rs1_part}(x0)"
+                offset_rs1_part = parts[2]
+            match = re.match(r'(-?0x[0-9a-fA-F]+|-?[0-9]+)\((\w+)\)', offset_rs1_part)
+            if not match:
+                return f"Line {line_num}: Invalid memory operand format '{offset_rs1_part}' in LW"
+            if not REGISTER_PATTERN.match(match.group(2)):
+                return f"Line {line_num}: Invalid base register '{match.group(2)}' in LW"
+        else:
+            if len(parts) != 4:
+                return f"Line {line_num}: ORI requires 3 operands (rd, rs1, immediate)"
+            if not REGISTER_PATTERN.match(parts[1]) or not REGISTER_PATTERN.match(parts[2]):
+                return f"Line {line_num}: Invalid register in ORI"
+            if not (IMMEDIATE_PATTERN.match(parts[3]) or HEX_PATTERN.match(parts[3])):
+                return f"Line {line_num}: Invalid immediate '{parts[3]}' in ORI"
+    elif mnemonic in B_TYPE:
+        if len(parts) != 4:
+            return f"Line {line_num}: {mnemonic} requires 3 operands (rs1, rs2, offset/label)"
+        for i in range(1, 3):
+            if not REGISTER_PATTERN.match(parts[i]):
+                return f"Line {line_num}: Invalid register '{parts[i]}' in {mnemonic}"
+        imm_or_label = parts[3]
+        is_immediate = IMMEDIATE_PATTERN.match(imm_or_label) or HEX_PATTERN.match(imm_or_label)
+        is_label = re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', imm_or_label)
+        if not (is_immediate or is_label):
+            return f"Line {line_num}: Invalid offset or label '{imm_or_label}' in {mnemonic}"
+    elif mnemonic in DIRECTIVE:
+        if len(parts) != 2:
+            return f"Line {line_num}: .WORD requires 1 operand"
+        if not (IMMEDIATE_PATTERN.match(parts[1]) or HEX_PATTERN.match(parts[1])):
+            return f"Line {line_num}: Invalid value '{parts[1]}' for .WORD directive"
+    return None
+
+
+def validate_program(lines):
+    """Validate (line_num, text) pairs, returning a list of error messages"""
+    errors = []
+    for line_num, instruction in lines:
+        error = validate_instruction(line_num, instruction)
+        if error:
+            errors.append(error)
+    return errors
+
+
+# -------------------------
+# Assembler / Encoding
+# -------------------------
+
+def collect_labels(lines, start=PROG_START):
+    """First pass: map each label to the address of the instruction it precedes"""
+    labels = {}
+    pc = start
+    for line_num, text in lines:
+        clean = text.split("#")[0].strip()
+        if not clean:
+            continue
+        if ":" in clean:
+            label = clean.split(":")[0].strip()
+            labels[label] = pc
+            inst_after = clean.split(":", 1)[1].strip()
+            if inst_after:
+                pc += 4
+        else:
+            pc += 4
+    return labels
+
+
+def line_addresses(lines, start=PROG_START):
+    """Map each instruction address to the line number it was assembled from"""
+    addresses = {}
+    pc = start
+    for line_num, text in lines:
+        clean = text.split("#")[0].strip()
+        if ":" in clean:
+            clean = clean.split(":", 1)[1].strip()
+        if clean:
+            addresses[pc] = line_num
+            pc += 4
+    return addresses
+
+
+def assemble(lines, start=PROG_START):
+    """Encode (line_num, text) pairs into {address: instruction word}
+
+    Returns (program_memory, labels). Raises AssemblyError on the first
+    line that cannot be encoded.
+    """
+    program_memory = {}
+    labels = collect_labels(lines, start)
+
+    # Second pass: encode instructions
+    pc = start
+    for line_num, text in lines:
+        clean = text.split("#")[0].strip()
+        if not clean:
+            continue
+
+        # Handle labels
+        if ":" in clean:
+            inst = clean.split(":", 1)[1].strip()
+            if not inst:
+                continue
+            clean = inst
+
+        try:
+            hex_opcode = encode_single_instruction(clean, labels, pc)
+        except Exception as e:
+            raise AssemblyError(line_num, str(e)) from e
+
+        # Store encoded instruction as integer
+        program_memory[pc] = int(hex_opcode, 16)
+        pc += 4
+
+    return program_memory, labels
+
+
+def parse_instruction(instruction):
+    """Split an instruction into (mnemonic, operands)"""
+    if instruction.upper().startswith("SW") or instruction.upper().startswith("LW"):
+        parts = re.split(r'[, \t]+', instruction)
+        parts = [p for p in parts if p]
+        mnemonic = parts[0].upper()
+        return mnemonic, [parts[1].rstrip(','), parts[2]]
+    parts = re.split(r'[,\s]+', instruction)
+    parts = [p for p in parts if p]
+    return parts[0].upper(), parts[1:]
+
+
+def encode_single_instruction(instruction, labels, current_pc):
+    """Encode one instruction (no label prefix) as an 8-digit hex string"""
+    mnemonic, operands = parse_instruction(instruction)
+
+    if mnemonic in R_TYPE:
+        return encode_r_type(mnemonic, operands)
+    elif mnemonic in I_TYPE:
+        return encode_i_type(mnemonic, operands)
+    elif mnemonic in S_TYPE:
+        return encode_s_type(mnemonic, operands)
+    elif mnemonic in B_TYPE:
+        # Label resolution for branches
+        if len(operands) >= 3 and operands[2] in labels:
+            offset = labels[operands[2]] - current_pc
+            modified_operands = operands[0:2] + [str(offset)]
+            return encode_b_type(mnemonic, modified_operands)
+        else:
+            return encode_b_type(mnemonic, operands)
+    elif mnemonic == ".WORD":
+        return encode_directive(mnemonic, operands[0])
+    else:
+        return "00000000"
+
+
+def encode_r_type(instruction, operands):
+    opcode = list(R_TYPE[instruction].keys())[0]
+    funct3 = R_TYPE[instruction][opcode]
+    rd = reg_to_bin(operands[0])
+    rs1 = reg_to_bin(operands[1])
+    rs2 = reg_to_bin(operands[2])
+    funct7 = "0000000"
+    binary = funct7 + rs2 + rs1 + funct3 + rd + opcode
+    return binary_to_hex(binary)
+
+
+def encode_i_type(instruction, operands):
+    opcode = list(I_TYPE[instruction].keys())[0]
+    funct3 = I_TYPE[instruction][opcode]
+    if instruction == "LW":
+        rd = reg_to_bin(operands[0])
+        match = re.match(r'(-?0x[0-9a-fA-F]+|-?[0-9]+)\((\w+)\)', operands[1])
+        if not match:
+            raise ValueError(f"Invalid LW operand format: {operands[1]}")
+        imm = match.group(1)
+        rs1 = reg_to_bin(match.group(2))
+        imm_bin = imm_to_bin(imm, 12)
+    else:
+        rd = reg_to_bin(operands[0])
+        rs1 = reg_to_bin(operands[1])
+        imm_bin = imm_to_bin(operands[2], 12)
+    binary = imm_bin + rs1 + funct3 + rd + opcode
+    return binary_to_hex(binary)
+
+
+def encode_s_type(instruction, operands):
+    opcode = list(S_TYPE[instruction].keys())[0]
+    funct3 = S_TYPE[instruction][opcode]
+    rs2 = reg_to_bin(operands[0])
+    match = re.match(r'(-?0x[0-9a-fA-F]+|-?[0-9]+)\((\w+)\)', operands[1])
+    if not match:
+        raise ValueError(f"Invalid SW operand format: {operands[1]}")
+    imm = match.group(1)
+    rs1 = reg_to_bin(match.group(2))
+    imm_bin = imm_to_bin(imm, 12)
+    imm_11_5 = imm_bin[0:7]
+    imm_4_0 = imm_bin[7:12]
+    binary = imm_11_5 + rs2 + rs1 + funct3 + imm_4_0 + opcode
+    return binary_to_hex(binary)
+
+
+def encode_b_type(instruction, operands):
+    opcode = list(B_TYPE[instruction].keys())[0]
+    funct3 = B_TYPE[instruction][opcode]
+    rs1 = reg_to_bin(operands[0])
+    rs2 = reg_to_bin(operands[1])
+    imm_str = operands[2]
+    try:
+        if imm_str.startswith('0x'):
+            imm = int(imm_str, 16)
+        else:
+            imm = int(imm_str)
+    except ValueError:
+        imm = 0
+    imm_bin = imm_to_bin(imm, 13)
+    imm_12 = imm_bin[0]
+    imm_11 = imm_bin[1]
+    imm_10_5 = imm_bin[2:8]
+    imm_4_1 = imm_bin[8:12]
+    binary = imm_12 + imm_10_5 + rs2 + rs1 + funct3 + imm_4_1 + imm_11 + opcode
+    return binary_to_hex(binary)
+
+
+def encode_directive(directive, operand):
+    try:
+        if operand.startswith('0x'):
+            value = int(operand, 16)
+        else:
+            value = int(operand)
+        if value < -2147483648 or value > 4294967295:
+            raise ValueError(f"Value out of 32-bit range: {operand}")
+        if value < 0:
+            value = (1 << 32) + value
+        return format(value & 0xFFFFFFFF, '08x')
+    except ValueError:
+        raise ValueError(f"Invalid value for .WORD directive: {operand}")
+
+
+def reg_to_bin(reg):
+    if not REGISTER_PATTERN.match(reg):
+        raise ValueError(f"Invalid register: {reg}")
+    return format(int(reg[1:]), '05b')
+
+
+def imm_to_bin(imm, bits=12):
+    try:
+        if isinstance(imm, str) and imm.startswith('0x'):
+            imm_val = int(imm, 16)
+        else:
+            imm_val = int(imm)
+        if imm_val < 0:
+            imm_val = (1 << bits) + imm_val
+        return format(imm_val & ((1 << bits) - 1), f'0{bits}b')
+    except ValueError:
+        raise ValueError(f"Invalid immediate value: {imm}")
+
+
+def binary_to_hex(binary_str):
+    padding = (4 - len(binary_str) % 4) % 4
+    binary_str = '0' * padding + binary_str
+    hex_str = ''
+    for i in range(0, len(binary_str), 4):
+        nibble = binary_str[i:i+4]
+        hex_str += format(int(nibble, 2), 'x')
+    return hex_str.zfill(8)
+
+
+# -------------------------
+# Incremental assembly
+# -------------------------
+
+class AssemblyResult:
+    """One pass of IncrementalAssembler.update over a version of the source"""
+
+    def __init__(self, errors, program_memory, labels, revalidated, reencoded):
+        # {line_num: "Line N: message"} for every line that fails to validate or encode
+        self.errors = errors
+        # {address: word}, or None while there are errors
+        self.program_memory = program_memory
+        self.labels = labels
+        # Lines checked / instructions encoded afresh in this pass
+        self.revalidated = revalidated
+        self.reencoded = reencoded
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+class IncrementalAssembler:
+    """Validate and assemble successive versions of a source, redoing only what changed
+
+    Validation is cached per line text, so moving a line or renumbering the
+    editor costs nothing. Encodings are cached per instruction text, and a
+    branch to a label is keyed by its resolved offset, so it is only
+    re-encoded when a label edit actually moves its target. The result is
+    the same as validate_program followed by assemble. update() may be
+    called from a worker thread; calls are serialized.
+    """
+
+    def __init__(self, start=PROG_START):
+        self.start = start
+        self.lock = threading.Lock()
+        # text -> (label or None, instruction or "", branch label operand or None, error or None)
+        self.parsed = {}
+        # (instruction, branch offset or None) -> (word, error)
+        self.encoded = {}
+        self.last_lines = None
+        self.last_result = None
+
+    def parse(self, text):
+        error = validate_instruction(0, text)
+        if error:
+            error = error.split(": ", 1)[1]
+        clean = text.split("#")[0].strip()
+        label = None
+        if ":" in clean:
+            label = clean.split(":")[0].strip()
+            clean = clean.split(":", 1)[1].strip()
+        target = None
+        if clean and not error:
+            mnemonic, operands = parse_instruction(clean)
+            if mnemonic in B_TYPE and len(operands) >= 3 and not IMMEDIATE_PATTERN.match(operands[2]) \
+                    and not HEX_PATTERN.match(operands[2]):
+                target = operands[2]
+        return label, clean, target, error
+
+    def encode(self, instruction, labels, pc):
+        try:
+            return int(encode_single_instruction(instruction, labels, pc), 16), None
+        except Exception as e:
+            return 0, str(e)
+
+    def update(self, lines):
+        """Bring the image up to date with (line_num, text) pairs; returns an AssemblyResult"""
+        with self.lock:
+            if lines == self.last_lines:
+                return self.last_result
+
+            parsed = {}
+            revalidated = 0
+            rows = []
+            for line_num, text in lines:
+                entry = parsed.get(text) or self.parsed.get(text)
+                if entry is None:
+                    entry = self.parse(text)
+                    revalidated += 1
+                parsed[text] = entry
+                rows.append((line_num, entry))
+
+            # First pass over the cached parses: label addresses
+            labels = {}
+            pc = self.start
+            for _, (label, instruction, _, _) in rows:
+                if label is not None:
+                    labels[label] = pc
+                if instruction:
+                    pc += 4
+
+            errors = {}
+            program_memory = {}
+            encoded = {}
+            reencoded = 0
+            pc = self.start
+            for line_num, (_, instruction, target, error) in rows:
+                if error is not None:
+                    errors[line_num] = f"Line {line_num}: {error}"
+                if not instruction:
+                    continue
+                if error is None:
+                    key = (instruction, labels[target] - pc if target in labels else None)
+                    result = encoded.get(key) or self.encoded.get(key)
+                    if result is None:
+                        result = self.encode(instruction, labels, pc)
+                        reencoded += 1
+                    encoded[key] = result
+                    word, encode_error = result
+                    if encode_error is not None:
+                        errors[line_num] = f"Line {line_num}: {encode_error}"
+                    program_memory[pc] = word
+                pc += 4
+
+            # Keep only what the current version uses
+            self.parsed = parsed
+            self.encoded = encoded
+            self.last_lines = list(lines)
+            self.last_result = AssemblyResult(
+                errors, None if errors else program_memory, labels, revalidated, reencoded)
+            return self.last_result
+
+
+# -------------------------
+# Opcode listing
+# -------------------------
+
+def generate_opcodes(instructions):
+    """Generate opcode listing lines for display"""
+    opcodes = []
+    labels = collect_labels(instructions)
+
+    current_pc = PROG_START
+    for line_num, instruction in instructions:
+        clean_instruction = instruction.split('#')[0].strip()
+        if not clean_instruction:
+            continue
+
+        if ':' in clean_instruction:
+            label_part = clean_instruction.split(':')[0].strip()
+            instruction_part = clean_instruction.split(':')[1].strip() if len(clean_instruction.split(':')) > 1 else ""
+
+            # Add label to output
+            opcodes.append(f"0x{current_pc:04x}: [LABEL] {label_part}:")
+            if not instruction_part:
+                continue
+            clean_instruction = instruction_part
+
+        try:
+            hex_opcode = encode_single_instruction(clean_instruction, labels, current_pc)
+            opcodes.append(f"0x{current_pc:04x}: {hex_opcode} // {clean_instruction}")
+        except Exception as e:
+            opcodes.append(f"0x{current_pc:04x}: ERROR - {str(e)} // {clean_instruction}")
+        current_pc += 4
+
+    return opcodes
@@ -0,0 +1,321 @@
+import time
+
+from .engine import RunResult, DEFAULT_MAX_CYCLES
+from .errors import UriscvError
+from .functional import FunctionalSimulator
+from .images import load_image
+from .instructions import OPCODE_R, OPCODE_I, OPCODE_LOAD, OPCODE_STORE, OPCODE_BRANCH, handler_for
+from .isa import DATA_START, PROG_START, PROG_END
+from .memory import PagedMemory
+
+try:
+    import numpy as np
+except ImportError:
+    # Optional: without NumPy every lane runs on the scalar functional model
+    np = None
+
+# ============================================================
+# μRISCV batch mode: one program over many initial memories, in lockstep
+# ============================================================
+
+# Largest lanes x window the vectorized model allocates, in bytes
+MAX_WINDOW_BYTES = 256 << 20
+
+# Scheduling key of a lane that has left the vectorized model; above any real PC
+PARKED = 1 << 40
+
+
+class BatchResult:
+    """Outcome of BatchSimulator.run"""
+
+    def __init__(self, statuses, seconds, vectorized, scalar_lanes):
+        # status -> number of lanes
+        self.statuses = statuses
+        self.seconds = seconds
+        self.vectorized = vectorized
+        # Lanes finished on the scalar model
+        self.scalar_lanes = scalar_lanes
+
+    @property
+    def complete(self):
+        return set(self.statuses) <= {RunResult.COMPLETE}
+
+    def as_dict(self):
+        return {
+            'statuses': dict(self.statuses),
+            'seconds': self.seconds,
+            'vectorized': self.vectorized,
+            'scalar_lanes': self.scalar_lanes,
+        }
+
+
+class LaneView:
+    """Engine-like read-only view of one lane of the vectorized model"""
+
+    def __init__(self, batch, lane):
+        self.batch = batch
+        self.lane = lane
+        self.memory_low = batch.memory_low
+        self.memory_high = batch.memory_high
+
+    @property
+    def pc(self):
+        return int(self.batch.pcs[self.lane])
+
+    @property
+    def registers(self):
+        return [int(value) for value in self.batch.regs[self.lane]]
+
+    @property
+    def cycle_count(self):
+        return int(self.batch.executed[self.lane])
+
+    instructions_retired = cycle_count
+
+    @property
+    def taken_branches(self):
+        return int(self.batch.taken[self.lane])
+
+    def read_word(self, addr):
+        if addr % 4 != 0 or not self.batch.window_start <= addr < self.batch.window_end:
+            return 0
+        return int(self.batch.mem[self.lane, (addr - self.batch.window_start) >> 2])
+
+    def counters(self):
+        # One instruction per cycle, as in FunctionalSimulator
+        return {
+            'cycles': self.cycle_count,
+            'instructions': self.cycle_count,
+            'taken_branches': self.taken_branches,
+            'cpi': 1.0 if self.cycle_count else 0.0,
+        }
+
+
+class BatchSimulator:
+    """The functional model run over many initial data memories at once
+
+    Each lane is one input set ({addr: word}, written before the program
+    is loaded). Registers and a dense window of memory are NumPy arrays
+    with one row per lane. Every step executes the instruction at the
+    lowest PC of the running lanes, for all lanes at that PC, so lanes that
+    take different BLT/BGE outcomes wait for each other and run together
+    again where their paths meet.
+
+    A lane that accesses memory outside the window, or stores into the
+    program, is handed over to FunctionalSimulator at that instruction and
+    finished there; without NumPy all lanes run that way. Lanes stop when
+    PC leaves the program or after max_instructions instructions; loops
+    are not detected, so a lane stuck in a loop ends at the budget.
+    """
+
+    def __init__(self, program_memory, memories, labels=None, entry_point=PROG_START,
+                 max_instructions=DEFAULT_MAX_CYCLES, window=None, vectorize=True):
+        if not program_memory:
+            raise UriscvError("No valid program loaded")
+        self.program_memory = program_memory
+        self.labels = dict(labels or {})
+        self.memories = [dict(memory) for memory in memories]
+        self.entry_point = entry_point
+        self.max_instructions = max_instructions
+        self.vectorized = vectorize and np is not None
+        # lane -> FunctionalSimulator that ran it
+        self.scalar_lanes = {}
+        self.statuses = [None] * len(self.memories)
+
+        # The program, decoded once for every lane
+        self.template = self.scalar_engine({})
+        self.code_start, self.code_end = self.template.code_start, self.template.code_end
+
+        # Window shown in dumps, as for a single engine
+        self.memory_low = self.template.memory_low
+        self.memory_high = self.template.memory_high
+        if self.vectorized:
+            self.allocate(window)
+
+    @property
+    def lanes(self):
+        return len(self.memories)
+
+    def scalar_engine(self, memory):
+        """A FunctionalSimulator with memory written and the program loaded, at the entry point"""
+        engine = FunctionalSimulator()
+        engine.detect_loops = False
+        for addr, value in memory.items():
+            engine.write_word(addr, value)
+        engine.load_program(self.program_memory, self.labels)
+        engine.entry_point = engine.pc = self.entry_point
+        return engine
+
+    def allocate(self, window):
+        """Registers, PCs, counters and the memory window of every lane"""
+        addresses = [addr for memory in self.memories for addr in memory]
+        start = min([DATA_START, self.code_start] + addresses)
+        end = max([PROG_END + 1, self.code_end] + [addr + 4 for addr in addresses])
+        if window is not None:
+            start, end = min(start, window[0]), max(end, window[1])
+        self.window_start = start & ~3
+        self.window_end = (end + 3) & ~3
+        words = (self.window_end - self.window_start) >> 2
+        if self.lanes * words * 4 > MAX_WINDOW_BYTES:
+            raise UriscvError(
+                f"{self.lanes} lanes of a {words * 4}-byte memory window do not fit in "
+                f"{MAX_WINDOW_BYTES >> 20} MiB; use fewer lanes or the scalar model"
+            )
+
+        self.regs = np.zeros((self.lanes, 32), dtype=np.uint32)
+        self.pcs = np.full(self.lanes, self.entry_point, dtype=np.int64)
+        # PC of each running lane, PARKED for the others; its minimum is the next PC to execute
+        self.schedule = self.pcs.copy()
+        self.executed = np.zeros(self.lanes, dtype=np.int64)
+        self.taken = np.zeros(self.lanes, dtype=np.int64)
+        self.mem = np.zeros((self.lanes, words), dtype=np.uint32)
+        for lane, memory in enumerate(self.memories):
+            for addr, value in memory.items():
+                if addr % 4 == 0 and 0 <= addr <= 0xFFFFFFFC:
+                    self.mem[lane, (addr - self.window_start) >> 2] = value & 0xFFFFFFFF
+        for addr, value in self.program_memory.items():
+            self.mem[:, (addr - self.window_start) >> 2] = value
+
+    # -------------------------
+    # Execution
+    # -------------------------
+
+    def run(self):
+        """Run every lane to completion or the budget; returns a BatchResult"""
+        start = time.perf_counter()
+        if self.vectorized:
+            self.run_vectorized()
+        for lane in range(self.lanes):
+            if self.statuses[lane] is None:
+                self.run_scalar(lane)
+        statuses = {}
+        for status in self.statuses:
+            statuses[status] = statuses.get(status, 0) + 1
+        return BatchResult(statuses, time.perf_counter() - start, self.vectorized, len(self.scalar_lanes))
+
+    def run_scalar(self, lane, from_vector=False):
+        """Run lane on FunctionalSimulator, from its initial state or where the vectorized model left it"""
+        engine = self.scalar_engine(self.memories[lane])
+        if from_vector:
+            self.hand_over(lane, engine)
+        result = engine.run(max_cycles=self.max_instructions)
+        self.scalar_lanes[lane] = engine
+        self.statuses[lane] = result.status
+
+    def hand_over(self, lane, engine):
+        """Copy a lane's registers, PC, counters and memory window into engine"""
+        engine.registers[:] = [int(value) for value in self.regs[lane]]
+        engine.pc = int(self.pcs[lane])
+        engine.cycle_count = engine.instructions_retired = int(self.executed[lane])
+        engine.taken_branches = int(self.taken[lane])
+        for index in np.flatnonzero(self.mem[lane] != self.initial_window(lane)):
+            engine.write_word(self.window_start + 4 * int(index), int(self.mem[lane, index]))
+
+    def initial_window(self, lane):
+        """A lane's window as it was before running"""
+        window = np.zeros(self.mem.shape[1], dtype=np.uint32)
+        for addr, value in self.memories[lane].items():
+            if addr % 4 == 0 and 0 <= addr <= 0xFFFFFFFC:
+                window[(addr - self.window_start) >> 2] = value & 0xFFFFFFFF
+        for addr, value in self.program_memory.items():
+            window[(addr - self.window_start) >> 2] = value
+        return window
+
+    def run_vectorized(self):
+        schedule = self.schedule
+        self.finish_lanes(np.arange(self.lanes))
+        while True:
+            pc = int(schedule.min())
+            if pc >= PARKED:
+                break
+            lanes = np.flatnonzero(schedule == pc)
+            escaped = self.execute(pc, lanes)
+            if escaped is not None:
+                schedule[escaped] = PARKED
+                for lane in escaped:
+                    self.run_scalar(int(lane), from_vector=True)
+                lanes = np.setdiff1d(lanes, escaped, assume_unique=True)
+            self.finish_lanes(lanes)
+
+    def finish_lanes(self, lanes):
+        """Park those of lanes that left the program or used up their budget"""
+        pcs = self.pcs[lanes]
+        outside = (pcs < self.code_start) | (pcs >= self.code_end) | ((pcs & 3) != 0)
+        stopped = outside | (self.executed[lanes] >= self.max_instructions)
+        if not stopped.any():
+            return
+        for lane, left in zip(lanes[stopped], outside[stopped]):
+            self.statuses[lane] = RunResult.COMPLETE if left else RunResult.CYCLE_LIMIT
+        self.schedule[lanes[stopped]] = PARKED
+
+    def execute(self, pc, lanes):
+        """Execute the instruction at pc in the given lanes; returns lanes to hand over, or None"""
+        regs = self.regs
+        instruction, opcode, rd, funct3, rs1, rs2, imm = self.template.fetch_decoded(pc)
+        next_pcs = pc + 4
+        escaped = None
+
+        if opcode == OPCODE_R and funct3 == 0b111:  # AND
+            if rd:
+                regs[lanes, rd] = regs[lanes, rs1] & regs[lanes, rs2]
+
+        elif opcode == OPCODE_R and funct3 == 0b110:  # OR
+            if rd:
+                regs[lanes, rd] = regs[lanes, rs1] | regs[lanes, rs2]
+
+        elif opcode == OPCODE_I and funct3 == 0b110:  # ORI (zero-extended immediate)
+            if rd:
+                regs[lanes, rd] = regs[lanes, rs1] | np.uint32(imm & 0xFFF)
+
+        elif opcode in (OPCODE_LOAD, OPCODE_STORE) and funct3 == 0b010:  # LW / SW
+            addresses = (regs[lanes, rs1].astype(np.int64) + imm) & 0xFFFFFFFF
+            aligned = (addresses & 3) == 0
+            inside = (addresses >= self.window_start) & (addresses < self.window_end)
+            if opcode == OPCODE_STORE:
+                inside &= (addresses < self.code_start) | (addresses >= self.code_end)
+            stays = ~aligned | inside
+            if not stays.all():
+                escaped = lanes[~stays]
+                lanes, addresses, aligned = lanes[stays], addresses[stays], aligned[stays]
+            # Unaligned accesses read 0 and write nothing, as in the scalar model
+            words = np.where(aligned, addresses - self.window_start, 0) >> 2
+            if opcode == OPCODE_LOAD:
+                if rd:
+                    regs[lanes, rd] = np.where(aligned, self.mem[lanes, words], 0)
+            else:
+                self.mem[lanes[aligned], words[aligned]] = regs[lanes[aligned], rs2]
+
+        elif opcode == OPCODE_BRANCH and funct3 in (0b100, 0b101):
+            a = regs[lanes, rs1].view(np.int32)
+            b = regs[lanes, rs2].view(np.int32)
+            taken = a < b if funct3 == 0b100 else a >= b  # BLT / BGE
+            self.taken[lanes] += taken
+            next_pcs = np.where(taken, (pc + imm) & 0xFFFFFFFF, pc + 4)
+
+        elif rd and handler_for(instruction).writes_rd:
+            # An encoding outside the instruction table computes 0 into rd
+            regs[lanes, rd] = 0
+
+        self.pcs[lanes] = next_pcs
+        self.schedule[lanes] = next_pcs
+        self.executed[lanes] += 1
+        return escaped
+
+    # -------------------------
+    # Results
+    # -------------------------
+
+    def lane(self, lane):
+        """The final state of one lane: its FunctionalSimulator, or a LaneView with the same attributes"""
+        engine = self.scalar_lanes.get(lane)
+        return engine if engine is not None else LaneView(self, lane)
+
+    def status(self, lane):
+        return self.statuses[lane]
+
+
+def read_input(path, base=None, fmt=None):
+    """A memory image (raw, Intel HEX or ELF32) as the {addr: word} of one lane"""
+    engine = FunctionalSimulator()
+    load_image(engine, path, base=base, fmt=fmt)
+    return {addr: word for addr, word, _ in engine.memory.diff_words(PagedMemory())}
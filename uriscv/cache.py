@@ -0,0 +1,159 @@
+from collections import OrderedDict
+
+from .errors import UriscvError
+
+# ============================================================
+# μRISCV L1 data cache timing model (used by the MEM stage)
+# ============================================================
+
+LRU = "lru"
+FIFO = "fifo"
+WRITE_BACK = "write-back"
+WRITE_THROUGH = "write-through"
+
+DEFAULT_SIZE = 1024
+DEFAULT_LINE_SIZE = 16
+DEFAULT_WAYS = 2
+DEFAULT_MISS_PENALTY = 10
+
+
+def is_power_of_two(value):
+    return value > 0 and value & (value - 1) == 0
+
+
+class DataCache:
+    """Set-associative cache of line tags; the data itself stays in PagedMemory
+
+    access() returns the stall cycles a LW/SW costs on top of its single MEM
+    cycle. Write-back caches allocate on write misses and pay for dirty
+    evictions; write-through caches do not allocate on write misses and
+    assume a write buffer, so stores never stall.
+    """
+
+    def __init__(self, size=DEFAULT_SIZE, line_size=DEFAULT_LINE_SIZE, ways=DEFAULT_WAYS,
+                 replacement=LRU, write_policy=WRITE_BACK, miss_penalty=DEFAULT_MISS_PENALTY):
+        if not (is_power_of_two(size) and is_power_of_two(line_size) and is_power_of_two(ways)):
+            raise UriscvError("Cache size, line size and associativity must be powers of two")
+        if line_size < 4 or size < line_size * ways:
+            raise UriscvError(f"A {size}-byte cache cannot hold {ways} way(s) of {line_size}-byte lines")
+        if replacement not in (LRU, FIFO):
+            raise UriscvError(f"Unknown replacement policy '{replacement}' (choose {LRU} or {FIFO})")
+        if write_policy not in (WRITE_BACK, WRITE_THROUGH):
+            raise UriscvError(f"Unknown write policy '{write_policy}' (choose {WRITE_BACK} or {WRITE_THROUGH})")
+        if miss_penalty < 0:
+            raise UriscvError("Miss penalty cannot be negative")
+
+        self.size = size
+        self.line_size = line_size
+        self.ways = ways
+        self.replacement = replacement
+        self.write_policy = write_policy
+        self.miss_penalty = miss_penalty
+
+        self.set_count = size // (line_size * ways)
+        self.offset_bits = line_size.bit_length() - 1
+        self.reset()
+
+    def reset(self):
+        """Invalidate every line and zero the counters"""
+        # One OrderedDict per set: tag -> dirty, oldest (FIFO) or least recently used (LRU) first
+        self.sets = [OrderedDict() for _ in range(self.set_count)]
+        self.hits = 0
+        self.read_misses = 0
+        self.write_misses = 0
+        self.evictions = 0
+        self.writebacks = 0
+        self.stall_cycles = 0
+
+    def empty_copy(self):
+        """A cold cache with the same geometry and policies"""
+        return DataCache(self.size, self.line_size, self.ways, self.replacement, self.write_policy, self.miss_penalty)
+
+    def copy(self):
+        """An independent cache with the same contents and counters"""
+        other = self.empty_copy()
+        other.sets = [OrderedDict(lines) for lines in self.sets]
+        other.hits = self.hits
+        other.read_misses = self.read_misses
+        other.write_misses = self.write_misses
+        other.evictions = self.evictions
+        other.writebacks = self.writebacks
+        other.stall_cycles = self.stall_cycles
+        return other
+
+    def state(self):
+        """Geometry, contents and counters as plain data (for checkpoints)"""
+        return {
+            'size': self.size, 'line_size': self.line_size, 'ways': self.ways,
+            'replacement': self.replacement, 'write_policy': self.write_policy,
+            'miss_penalty': self.miss_penalty,
+            'sets': [[[tag, dirty] for tag, dirty in lines.items()] for lines in self.sets],
+            'counters': [self.hits, self.read_misses, self.write_misses, self.evictions, self.writebacks, self.stall_cycles],
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild a cache saved by state()"""
+        cache = cls(state['size'], state['line_size'], state['ways'],
+                    state['replacement'], state['write_policy'], state['miss_penalty'])
+        cache.sets = [OrderedDict((tag, dirty) for tag, dirty in lines) for lines in state['sets']]
+        (cache.hits, cache.read_misses, cache.write_misses,
+         cache.evictions, cache.writebacks, cache.stall_cycles) = state['counters']
+        return cache
+
+    def access(self, addr, write):
+        """Look up the line holding addr; return the extra cycles the access stalls for"""
+        line = addr >> self.offset_bits
+        lines = self.sets[line % self.set_count]
+        tag = line // self.set_count
+
+        if tag in lines:
+            self.hits += 1
+            if self.replacement == LRU:
+                lines.move_to_end(tag)
+            if write and self.write_policy == WRITE_BACK:
+                lines[tag] = True
+            return 0
+
+        if write:
+            self.write_misses += 1
+            if self.write_policy == WRITE_THROUGH:
+                # No-write-allocate: the store goes straight to memory
+                return 0
+        else:
+            self.read_misses += 1
+
+        stall = self.miss_penalty
+        if len(lines) >= self.ways:
+            _, dirty = lines.popitem(last=False)
+            self.evictions += 1
+            if dirty:
+                # The victim has to be written back before the refill
+                self.writebacks += 1
+                stall += self.miss_penalty
+        lines[tag] = write and self.write_policy == WRITE_BACK
+        self.stall_cycles += stall
+        return stall
+
+    def misses(self):
+        return self.read_misses + self.write_misses
+
+    def stats(self):
+        """Counters as a flat dict"""
+        accesses = self.hits + self.misses()
+        return {
+            'dcache_hits': self.hits,
+            'dcache_misses': self.misses(),
+            'dcache_read_misses': self.read_misses,
+            'dcache_write_misses': self.write_misses,
+            'dcache_evictions': self.evictions,
+            'dcache_writebacks': self.writebacks,
+            'dcache_hit_rate': round(self.hits / accesses, 4) if accesses else 0.0,
+            'dcache_stall_cycles': self.stall_cycles,
+        }
+
+    def describe(self):
+        return (
+            f"{self.size} B, {self.line_size} B lines, {self.ways}-way, {self.replacement.upper()}, "
+            f"{self.write_policy}, {self.miss_penalty}-cycle miss penalty"
+        )
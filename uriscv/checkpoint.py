@@ -0,0 +1,121 @@
+import json
+import struct
+import zlib
+
+from .cache import DataCache
+from .errors import UriscvError
+from .memory import PagedMemory, PAGE_SIZE, ZERO_PAGE
+
+# ============================================================
+# μRISCV checkpoints: save/restore a whole simulation to a file
+# ============================================================
+
+# File layout (little-endian):
+#   header   magic, format version, flags, length of the JSON state
+#   state    UTF-8 JSON: registers, latches, counters, code range, cache, page list
+#   pages    raw 4 KiB memory pages, in the order of the page list (zero pages omitted)
+#   history  zlib-compressed JSON pipeline_history (only with FLAG_HISTORY)
+MAGIC = b"URVCKPT\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHHI")
+
+FLAG_HISTORY = 0x1
+
+
+def save_checkpoint(engine, path, history=False):
+    """Write the engine's complete state to path; pipeline_history is included on request"""
+    snap = engine.snapshot()
+    memory = snap['memory']
+    pages = sorted(number for number, page in memory.pages.items() if page != ZERO_PAGE)
+    state = {
+        'engine': type(engine).__name__,
+        'registers': snap['registers'],
+        'pipeline_state': snap['pipeline_state'],
+        'cycle_count': snap['cycle_count'],
+        'instructions_retired': snap['instructions_retired'],
+        'taken_branches': snap['taken_branches'],
+        'dirty_addresses': sorted(snap['dirty_addresses']),
+        'code_range': list(snap['code_range']),
+        'entry_point': snap['entry_point'],
+        'stall_remaining': snap['stall_remaining'],
+        'data_cache': snap['data_cache'].state() if snap['data_cache'] is not None else None,
+        'labels': engine.labels,
+        'pages': pages,
+    }
+    if 'issue' in snap:
+        # Dual-issue pipelines: issue counters and why the group in IF/ID is single
+        state['issue'] = list(snap['issue'])
+    encoded = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    flags = FLAG_HISTORY if history else 0
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, len(encoded)))
+        f.write(encoded)
+        for number in pages:
+            f.write(memory.pages[number])
+        if history:
+            f.write(zlib.compress(json.dumps(engine.pipeline_history, separators=(",", ":")).encode("utf-8")))
+
+
+def load_checkpoint(engine, path):
+    """Restore a checkpoint written by save_checkpoint into engine
+
+    The engine must be of the kind that saved it. The data cache, if one was
+    saved, comes back warm; run budgets are left alone and loop detection
+    starts afresh. Returns the decoded state header.
+    """
+    with open(path, "rb") as f:
+        data = memoryview(f.read())
+    if len(data) < HEADER.size:
+        raise UriscvError(f"{path} is not a μRISCV checkpoint")
+    magic, version, flags, length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise UriscvError(f"{path} is not a μRISCV checkpoint")
+    if version != VERSION:
+        raise UriscvError(f"{path} is checkpoint version {version}; this simulator reads version {VERSION}")
+
+    offset = HEADER.size
+    try:
+        state = json.loads(bytes(data[offset:offset + length]).decode("utf-8"))
+    except ValueError:
+        raise UriscvError(f"{path}: corrupt checkpoint state") from None
+    offset += length
+    if state['engine'] != type(engine).__name__:
+        raise UriscvError(f"{path} was saved by a {state['engine']}, not a {type(engine).__name__}")
+
+    memory = PagedMemory()
+    for number in state['pages']:
+        page = data[offset:offset + PAGE_SIZE]
+        if len(page) != PAGE_SIZE:
+            raise UriscvError(f"{path} is truncated")
+        memory.pages[number] = bytearray(page)
+        memory.owned.add(number)
+        offset += PAGE_SIZE
+    # The incremental digest is rebuilt on first use
+    memory._digest = None
+
+    snap = {
+        'registers': state['registers'],
+        'pipeline_state': state['pipeline_state'],
+        'memory': memory,
+        'cycle_count': state['cycle_count'],
+        'instructions_retired': state['instructions_retired'],
+        'taken_branches': state['taken_branches'],
+        'dirty_addresses': state['dirty_addresses'],
+        'code_range': tuple(state['code_range']),
+        'entry_point': state['entry_point'],
+        'stall_remaining': state['stall_remaining'],
+        'data_cache': DataCache.from_state(state['data_cache']) if state['data_cache'] is not None else None,
+    }
+    if 'issue' in state:
+        snap['issue'] = tuple(state['issue'])
+    engine.restore(snap)
+    engine.labels = state['labels']
+
+    engine.pipeline_history.clear()
+    if flags & FLAG_HISTORY:
+        try:
+            engine.pipeline_history.extend(json.loads(zlib.decompress(data[offset:])))
+        except (zlib.error, ValueError):
+            raise UriscvError(f"{path}: corrupt pipeline history") from None
+    return state
@@ -0,0 +1,557 @@
+import argparse
+import json
+import os
+import sys
+
+from .cache import DataCache, LRU, FIFO, WRITE_BACK, WRITE_THROUGH, DEFAULT_LINE_SIZE, DEFAULT_WAYS, DEFAULT_MISS_PENALTY
+from .batch import BatchSimulator, read_input
+from .analysis import analyze, annotate, DEFAULT_LOOP_TRIPS, DEFAULT_FORWARD_TAKEN
+from .checkpoint import save_checkpoint, load_checkpoint
+from .assembler import split_source, validate_program, assemble, generate_opcodes, line_addresses
+from .engine import PipelineEngine, RunResult, DEFAULT_MAX_SECONDS
+from .errors import UriscvError
+from .functional import FunctionalSimulator
+from .fuzz import fuzz
+from .geometry import CLASSIC, PRESETS, parse_geometry
+from .images import load_image, dump_image, is_program_image, format_for_path, parse_range, IMAGE_FORMATS
+from .multihart import MultiHartSimulator
+from .profiler import Profiler
+from .memtrace import MemoryTrace
+from .superscalar import DualIssueEngine
+from .statehash import HashStream, bisect_divergence, load_reference
+from .sampling import run_sampled, DEFAULT_PERIOD, DEFAULT_WARMUP, DEFAULT_WINDOW
+
+# ============================================================
+# μRISCV command line: python -m uriscv {assemble,run,analyze,fuzz,serve} ...
+# ============================================================
+
+DUMP_CHOICES = ("regs", "mem", "pc")
+
+# Exit codes
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_STOPPED = 3
+EXIT_DIVERGED = 4
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="uriscv", description="μRISCV assembler and pipeline simulator")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    asm = sub.add_parser("assemble", help="validate and encode a program")
+    asm.add_argument("source", help="assembly source file")
+    asm.add_argument("--format", choices=("text", "json"), default="text")
+
+    run = sub.add_parser("run", help="assemble and run a program headlessly")
+    run.add_argument("source", nargs="?", help="assembly source file, or a .bin/.hex/.elf program image (omit with --restore)")
+    run.add_argument("--mode", choices=("pipelined", "functional", "sampled"), default="pipelined",
+                     help="sampled: functional fast-forward with periodic detailed pipeline windows")
+    run.add_argument("--mem", help="memory image to preload: raw binary, Intel HEX or ELF32")
+    run.add_argument("--mem-base", type=lambda text: int(text, 0), help="load address of a raw --mem image (default: start of data memory)")
+    run.add_argument("--mem-format", choices=IMAGE_FORMATS, help="format of --mem (default: detected)")
+    run.add_argument("--save-mem", help="after the run, write a memory region to this file (.hex files are Intel HEX)")
+    run.add_argument("--save-range", help="region for --save-mem as START-END or START+LENGTH (default: the displayed memory window)")
+    run.add_argument("--cycles", type=int, default=100000, help="cycle budget (default: %(default)s)")
+    run.add_argument("--seconds", type=float, default=DEFAULT_MAX_SECONDS, help="wall-clock budget (default: %(default)s)")
+    run.add_argument("--dump", default="regs", help="comma separated subset of: " + ",".join(DUMP_CHOICES))
+    run.add_argument("--format", choices=("text", "json"), default="text")
+    run.add_argument("--restore", help="continue from a checkpoint file instead of starting a program")
+    run.add_argument("--save-checkpoint", help="write a checkpoint to this file (at --checkpoint-at, or when the run stops)")
+    run.add_argument("--checkpoint-at", type=int, help="cycle after which --save-checkpoint is written")
+    run.add_argument("--checkpoint-history", action="store_true", help="include the per-cycle pipeline history in the checkpoint")
+    run.add_argument("--trace", help="write the per-cycle pipeline snapshots to this file (JSON lines, pipelined mode)")
+    run.add_argument("--verbose", action="store_true", help="print per-stage trace lines")
+    run.add_argument("--profile", help="write a per-PC/per-label profile to this file (.json, .csv, or flat text)")
+    run.add_argument("--mem-trace", help="record every LW/SW and write per-PC strides and word heat to this file (.json, .csv of all accesses, or text)")
+    run.add_argument("--hashes", help="write a hash of the state after every cycle to this file (a golden stream for --golden)")
+    run.add_argument("--golden", help="compare the per-cycle state hashes with this stream; exit status 4 at the first divergent cycle")
+    run.add_argument("--reference", help="with --golden: directory of a reference uriscv package to re-run and bisect against, reporting the differing fields")
+    run.add_argument("--cache-size", type=int, help="model an L1 data cache of this many bytes (pipelined and sampled modes)")
+    run.add_argument("--cache-line", type=int, default=DEFAULT_LINE_SIZE, help="cache line size in bytes (default: %(default)s)")
+    run.add_argument("--cache-ways", type=int, default=DEFAULT_WAYS, help="cache associativity (default: %(default)s)")
+    run.add_argument("--cache-replacement", choices=(LRU, FIFO), default=LRU)
+    run.add_argument("--cache-write", choices=(WRITE_BACK, WRITE_THROUGH), default=WRITE_BACK)
+    run.add_argument("--miss-penalty", type=int, default=DEFAULT_MISS_PENALTY, help="stall cycles per cache miss (default: %(default)s)")
+    run.add_argument("--sample-period", type=int, default=DEFAULT_PERIOD, help="sampled mode: instructions between windows (default: %(default)s)")
+    run.add_argument("--sample-warmup", type=int, default=DEFAULT_WARMUP, help="sampled mode: instructions that warm the latches (default: %(default)s)")
+    run.add_argument("--sample-window", type=int, default=DEFAULT_WINDOW, help="sampled mode: instructions measured per window (default: %(default)s)")
+    run.add_argument("--pipeline", default="classic",
+                     help="pipeline variant: " + ", ".join(PRESETS) + ", or options branch=id|ex,mem=N,merge-wb (default: %(default)s)")
+    run.add_argument("--issue-width", type=int, choices=(1, 2), default=1,
+                     help="pipelined mode: 2 runs the dual-issue in-order pipeline (default: %(default)s)")
+    run.add_argument("--harts", type=int, default=1, help="pipelined mode: harts sharing memory, hart id in a0 (default: %(default)s)")
+    run.add_argument("--parallel", action="store_true", help="run the harts in worker processes (programs must not share written memory)")
+    run.add_argument("--jobs", type=int, help="worker processes for --parallel (default: one per hart, up to the CPU count)")
+
+    an = sub.add_parser("analyze", help="estimate cycles, CPI and RAW hazards without simulating")
+    an.add_argument("source", help="assembly source file")
+    an.add_argument("--loop-trips", type=float, default=DEFAULT_LOOP_TRIPS, help="assumed iterations of every loop (default: %(default)s)")
+    an.add_argument("--forward-taken", type=float, default=DEFAULT_FORWARD_TAKEN, help="assumed probability of a forward branch being taken (default: %(default)s)")
+    an.add_argument("--format", choices=("text", "json"), default="text")
+
+    fz = sub.add_parser("fuzz", help="compare the pipelined engine with the functional model on random programs")
+    fz.add_argument("--count", type=int, default=1000, help="number of programs (default: %(default)s)")
+    fz.add_argument("--seed", type=int, default=0, help="first seed (default: %(default)s)")
+    fz.add_argument("--length", type=int, default=24, help="approximate program length in lines (default: %(default)s)")
+    fz.add_argument("--jobs", type=int, default=1, help="worker processes (default: %(default)s)")
+    fz.add_argument("--no-minimize", action="store_true", help="report mismatches without shrinking them")
+    fz.add_argument("--max-reports", type=int, default=5, help="print at most this many mismatches (default: %(default)s)")
+
+    bt = sub.add_parser("batch", help="run one program over many initial memories in lockstep (functional model)")
+    bt.add_argument("source", help="assembly source file, or a .bin/.hex/.elf program image")
+    bt.add_argument("inputs", nargs="+", help="memory images, one lane each; a directory adds every file in it")
+    bt.add_argument("--mem-base", type=lambda text: int(text, 0), help="load address of raw input images (default: start of data memory)")
+    bt.add_argument("--mem-format", choices=IMAGE_FORMATS, help="format of the inputs (default: detected)")
+    bt.add_argument("--cycles", type=int, default=100000, help="instruction budget per lane (default: %(default)s)")
+    bt.add_argument("--scalar", action="store_true", help="run every lane on the scalar functional model instead of NumPy")
+    bt.add_argument("--dump", default="", help="per lane, comma separated subset of: " + ",".join(DUMP_CHOICES))
+    bt.add_argument("--format", choices=("text", "json"), default="text")
+
+    sv = sub.add_parser("serve", help="share one warm simulator with local tools over a socket (JSON lines)")
+    sv.add_argument("--socket", help="listen on this Unix socket path")
+    sv.add_argument("--port", type=int, default=0, help="listen on this localhost TCP port when --socket is not given (default: any free port)")
+    # Defaults live in uriscv.server, which is only imported by the serve command
+    sv.add_argument("--workers", type=int, help="engine workers (default: 2)")
+    sv.add_argument("--queue", type=int, help="jobs waiting before requests are refused (default: 64)")
+    sv.add_argument("--max-cycles", type=int, help="largest cycle budget a job may ask for (default: 10000000)")
+    return parser
+
+
+def read_program(path):
+    """Read, validate and assemble a source file"""
+    with open(path, encoding="utf-8") as f:
+        lines = split_source(f.read())
+    errors = validate_program(lines)
+    if errors:
+        raise UriscvError("\n".join(errors))
+    program_memory, labels = assemble(lines)
+    return lines, program_memory, labels
+
+
+def load_program_source(engine, path):
+    """Install an assembly file or a program image as engine's program"""
+    if is_program_image(path):
+        load_image(engine, path, program=True)
+    else:
+        lines, program_memory, labels = read_program(path)
+        engine.load_program(program_memory, labels)
+
+
+def build_data_cache(args):
+    if not args.cache_size:
+        return None
+    return DataCache(
+        args.cache_size, args.cache_line, args.cache_ways,
+        args.cache_replacement, args.cache_write, args.miss_penalty,
+    )
+
+
+def prepare_engine(engine, args, data_cache):
+    """Install --restore or the program and --mem image, and the data cache in pipelined mode"""
+    if args.restore:
+        # The checkpoint brings its own program, memory and (warm) data cache
+        load_checkpoint(engine, args.restore)
+        if args.mem:
+            load_image(engine, args.mem, base=args.mem_base, fmt=args.mem_format)
+        if args.mode == "pipelined" and data_cache is not None:
+            engine.data_cache = data_cache
+    else:
+        if args.mem:
+            load_image(engine, args.mem, base=args.mem_base, fmt=args.mem_format)
+        load_program_source(engine, args.source)
+        if args.mode == "pipelined":
+            engine.data_cache = data_cache
+    if args.mode == "pipelined" and args.pipeline != "classic":
+        engine.set_geometry(parse_geometry(args.pipeline))
+
+
+def find_divergence(args, engine_class, cycle):
+    """Re-run on this and the --reference package's engine and bisect to the first differing fields"""
+    if not args.reference:
+        return {"cycle": cycle}
+    reference_package = load_reference(args.reference)
+    reference_class = getattr(reference_package, engine_class.__name__, None)
+    if reference_class is None:
+        raise UriscvError(f"{args.reference} has no {engine_class.__name__}")
+    reference = reference_class()
+    candidate = engine_class()
+    for engine in (reference, candidate):
+        engine.record_history = False
+        prepare_engine(engine, args, build_data_cache(args))
+    divergence = bisect_divergence(reference, candidate, args.cycles)
+    if divergence is None:
+        # The reference agrees with this engine, so the golden stream came from elsewhere
+        return {"cycle": cycle, "reference_agrees": True}
+    return divergence.as_dict()
+
+
+def save_memory(engine, args):
+    if not args.save_mem:
+        return
+    if args.save_range:
+        start, end = parse_range(args.save_range)
+    else:
+        start, end = engine.memory_low, engine.memory_high + 1
+    dump_image(engine, args.save_mem, start, end, format_for_path(args.save_mem))
+
+
+def collect_dump(engine, sections):
+    dump = {}
+    if "pc" in sections:
+        dump["pc"] = engine.pc
+    if "regs" in sections:
+        dump["regs"] = list(engine.registers)
+    if "mem" in sections:
+        dump["mem"] = {
+            f"0x{addr:04x}": engine.read_word(addr)
+            for addr in range(engine.memory_low, engine.memory_high + 1, 4)
+            if engine.read_word(addr)
+        }
+    return dump
+
+
+def print_text_report(report):
+    print(f"status: {report['status']}")
+    if report["mode"] != "functional" and report["pipeline"] != CLASSIC.describe():
+        print(f"pipeline: {report['pipeline']}")
+    if report.get("issue_width", 1) != 1:
+        print(f"issue width: {report['issue_width']}")
+    for name, value in report["counters"].items():
+        if name == "harts":
+            continue
+        print(f"{name}: {value}")
+    for hart in report["counters"].get("harts", ()):
+        print(f"hart {hart['hart']}: " + ", ".join(f"{k}={v}" for k, v in hart.items() if k != "hart"))
+    contention = report.get("contention")
+    if contention:
+        conflicts = contention["conflict_cycles"]
+        print(f"shared words: {contention['shared_words']}, same-cycle conflicts: {'n/a' if conflicts is None else conflicts}")
+        for word in contention["words"]:
+            print(f"  [{word['address']}] loads={word['loads']} stores={word['stores']}"
+                  + ("" if word["conflict_cycles"] is None else f" conflicts={word['conflict_cycles']}"))
+    if report.get("loop_report"):
+        print(report["loop_report"])
+    if report.get("trace"):
+        print(f"trace: {report['trace']}")
+    if report.get("profile"):
+        print(f"profile: {report['profile']}")
+    if report.get("mem_trace"):
+        print(f"memory trace: {report['mem_trace']}")
+    divergence = report.get("divergence")
+    if divergence:
+        print(f"diverges from golden at cycle {divergence['cycle']}")
+        if divergence.get("reference_agrees"):
+            print("  the reference engine matches this run")
+        if divergence.get("ended"):
+            print(f"  the {divergence['ended']} run had already stopped")
+        for field in divergence.get("fields", ()):
+            print(f"  {field['field']:<18} reference 0x{field['reference'] & 0xFFFFFFFF:08x}  candidate 0x{field['candidate'] & 0xFFFFFFFF:08x}")
+        for word in divergence.get("memory", ()):
+            print(f"  MEM[0x{word['address']:08x}]   reference 0x{word['reference']:08x}  candidate 0x{word['candidate']:08x}")
+    dump = report["dump"]
+    if "pc" in dump:
+        pcs = dump["pc"] if isinstance(dump["pc"], list) else [dump["pc"]]
+        print("pc: " + " ".join(f"0x{pc:08x}" for pc in pcs))
+    if "regs" in dump:
+        for i, value in enumerate(dump["regs"]):
+            print(f"x{i:<2} = 0x{value:08x} ({value})")
+    for hart_id, regs in enumerate(dump.get("hart_regs", ())):
+        print(f"hart {hart_id}:")
+        for i, value in enumerate(regs):
+            print(f"  x{i:<2} = 0x{value:08x} ({value})")
+    if "mem" in dump:
+        for addr, value in dump["mem"].items():
+            print(f"[{addr}] = 0x{value:08x}")
+
+
+def cmd_assemble(args):
+    lines, program_memory, labels = read_program(args.source)
+    if args.format == "json":
+        print(json.dumps({
+            "program": {f"0x{addr:04x}": f"0x{word:08x}" for addr, word in sorted(program_memory.items())},
+            "labels": {name: f"0x{addr:04x}" for name, addr in labels.items()},
+        }, indent=2))
+    else:
+        for line in generate_opcodes(lines):
+            print(line)
+    return EXIT_OK
+
+
+def cmd_run(args):
+    sections = [s.strip() for s in args.dump.split(",") if s.strip()]
+    for section in sections:
+        if section not in DUMP_CHOICES:
+            raise UriscvError(f"Unknown --dump section '{section}' (choose from {', '.join(DUMP_CHOICES)})")
+
+    data_cache = build_data_cache(args)
+    geometry = parse_geometry(args.pipeline)
+    if geometry != CLASSIC and args.mode == "functional":
+        raise UriscvError("--pipeline needs --mode pipelined or sampled")
+    if args.issue_width == 2:
+        if args.mode != "pipelined":
+            raise UriscvError("--issue-width 2 needs --mode pipelined")
+        if geometry != CLASSIC:
+            raise UriscvError("--issue-width 2 only supports --pipeline classic")
+
+    if bool(args.source) == bool(args.restore):
+        raise UriscvError("run needs either a source file or --restore")
+    if args.harts < 1:
+        raise UriscvError("--harts must be at least 1")
+    if args.harts > 1 or args.parallel:
+        if args.mode != "pipelined":
+            raise UriscvError("--harts and --parallel need --mode pipelined")
+        if args.issue_width != 1:
+            raise UriscvError("--issue-width 2 is not supported with --harts")
+        if args.restore or args.save_checkpoint:
+            raise UriscvError("Checkpoints are not supported with --harts")
+        if args.hashes or args.golden:
+            raise UriscvError("--hashes and --golden are not supported with --harts")
+        return run_harts(args, sections, data_cache, geometry)
+    if args.checkpoint_at is not None and args.mode == "sampled":
+        raise UriscvError("--checkpoint-at is not supported in sampled mode")
+    if (args.hashes or args.golden) and args.mode == "sampled":
+        raise UriscvError("--hashes and --golden are not supported in sampled mode")
+    if args.reference and not args.golden:
+        raise UriscvError("--reference needs --golden")
+
+    if args.mode != "pipelined":
+        engine_class = FunctionalSimulator
+    elif args.issue_width == 2:
+        engine_class = DualIssueEngine
+    else:
+        engine_class = PipelineEngine
+    engine = engine_class(verbose=args.verbose)
+    engine.record_history = (bool(args.trace) or args.checkpoint_history) and args.mode == "pipelined"
+    prepare_engine(engine, args, data_cache)
+
+    profiler = None
+    if args.profile:
+        if args.mode == "sampled":
+            raise UriscvError("--profile is not supported in sampled mode")
+        profiler = Profiler.for_engine(engine)
+    memory_trace = None
+    if args.mem_trace:
+        if args.mode == "sampled":
+            raise UriscvError("--mem-trace is not supported in sampled mode")
+        memory_trace = MemoryTrace.for_engine(engine)
+    hashes = HashStream.for_engine(engine) if args.hashes or args.golden else None
+    start_cycle = engine.cycle_count
+
+    on_cycle = None
+    if args.save_checkpoint and args.checkpoint_at is not None:
+        def on_cycle(primed):
+            if engine.cycle_count == args.checkpoint_at:
+                save_checkpoint(engine, args.save_checkpoint, history=args.checkpoint_history)
+
+    if args.mode == "sampled":
+        # --cycles bounds the instructions fast-forwarded
+        result = run_sampled(
+            engine, period=args.sample_period, warmup=args.sample_warmup, window=args.sample_window,
+            max_instructions=args.cycles, max_seconds=args.seconds, data_cache=data_cache, geometry=geometry,
+        )
+        counters = {k: v for k, v in result.as_dict().items() if k not in ("status", "seconds")}
+    else:
+        result = engine.run(max_cycles=args.cycles, max_seconds=args.seconds, on_cycle=on_cycle)
+        counters = engine.counters()
+
+    if args.save_checkpoint and (args.checkpoint_at is None or engine.cycle_count < args.checkpoint_at):
+        save_checkpoint(engine, args.save_checkpoint, history=args.checkpoint_history)
+    save_memory(engine, args)
+    if profiler is not None:
+        profiler.write(args.profile, engine.program_memory, engine.labels)
+    if memory_trace is not None:
+        memory_trace.write(args.mem_trace, engine.labels)
+    if args.trace:
+        with open(args.trace, "w", encoding="utf-8") as f:
+            for cycle, snap in enumerate(engine.pipeline_history, start=1):
+                f.write(json.dumps({"cycle": cycle, **snap}) + "\n")
+    if args.hashes:
+        hashes.save(args.hashes)
+    divergence = None
+    if args.golden:
+        index = hashes.first_divergence(HashStream.load(args.golden))
+        if index is not None:
+            divergence = find_divergence(args, engine_class, start_cycle + index)
+
+    report = {
+        "mode": args.mode,
+        "pipeline": geometry.describe(),
+        "issue_width": args.issue_width,
+        "status": result.status,
+        "seconds": round(result.seconds, 6),
+        "counters": counters,
+        "loop_report": engine.loop_report,
+        "trace": args.trace,
+        "profile": args.profile,
+        "mem_trace": args.mem_trace,
+        "divergence": divergence,
+        "dump": collect_dump(engine, sections),
+    }
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        print_text_report(report)
+    if divergence is not None:
+        return EXIT_DIVERGED
+    return EXIT_OK if result.status == RunResult.COMPLETE else EXIT_STOPPED
+
+
+def run_harts(args, sections, data_cache, geometry):
+    """cmd_run for --harts N: lockstep or --parallel, with per-hart counters and contention"""
+    sim = MultiHartSimulator(args.harts, verbose=args.verbose)
+    if args.mem:
+        load_image(sim.harts[0], args.mem, base=args.mem_base, fmt=args.mem_format)
+    load_program_source(sim.harts[0], args.source)
+    sim.share_program()
+    sim.set_data_cache(data_cache)
+    sim.set_geometry(geometry)
+
+    if args.parallel:
+        result = sim.run_parallel(jobs=args.jobs, max_cycles=args.cycles, max_seconds=args.seconds)
+    else:
+        result = sim.run(max_cycles=args.cycles, max_seconds=args.seconds)
+
+    first = sim.harts[0]
+    save_memory(first, args)
+    dump = collect_dump(first, [s for s in sections if s != "regs"])
+    if "pc" in sections:
+        dump["pc"] = [hart.pc for hart in sim.harts]
+    if "regs" in sections:
+        dump["hart_regs"] = [list(hart.registers) for hart in sim.harts]
+    report = {
+        "mode": "parallel" if args.parallel else "lockstep",
+        "pipeline": geometry.describe(),
+        "status": result.status,
+        "seconds": round(result.seconds, 6),
+        "counters": sim.counters(),
+        "contention": sim.contention(),
+        "dump": dump,
+    }
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        print_text_report(report)
+    return EXIT_OK if result.status == RunResult.COMPLETE else EXIT_STOPPED
+
+
+def cmd_analyze(args):
+    lines, program_memory, labels = read_program(args.source)
+    analysis = analyze(program_memory, loop_trips=args.loop_trips, forward_taken=args.forward_taken)
+    notes = annotate(analysis, line_addresses(lines))
+    if args.format == "json":
+        print(json.dumps({**analysis.as_dict(), "notes": notes}, indent=2))
+        return EXIT_OK
+
+    width = max(len(text) for _, text in lines) + 2
+    for line_num, text in lines:
+        note = notes.get(line_num)
+        print(f"{line_num:>4}  {text:<{width}}# {note}" if note else f"{line_num:>4}  {text}")
+    print()
+    print("block  start   end     instr  freq       CPI")
+    for block in analysis.blocks:
+        print(f"B{block.index:<5} 0x{block.start:04x}  0x{block.end:04x}  {len(block.addresses):<6} {block.frequency:<10.4g} {block.cpi():.3f}")
+    print()
+    print(analysis.summary())
+    return EXIT_OK
+
+
+def cmd_fuzz(args):
+    reported = []
+
+    def on_mismatch(mismatch):
+        if len(reported) < args.max_reports:
+            print(mismatch.report())
+            print()
+        reported.append(mismatch)
+
+    mismatches, rate = fuzz(
+        args.count, seed=args.seed, length=args.length, jobs=args.jobs,
+        minimize_cases=not args.no_minimize, on_mismatch=on_mismatch,
+    )
+    print(f"{args.count} programs, {len(mismatches)} mismatch(es), {rate:.0f} programs/s")
+    if mismatches:
+        print("mismatching seeds: " + " ".join(str(m.case.seed) for m in mismatches[:50]))
+    return EXIT_STOPPED if mismatches else EXIT_OK
+
+
+def input_paths(paths):
+    """Files named on the command line, with directories expanded to their files in name order"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(os.path.join(path, name) for name in os.listdir(path) if os.path.isfile(os.path.join(path, name)))
+        else:
+            files.append(path)
+    return files
+
+
+def cmd_batch(args):
+    sections = [s.strip() for s in args.dump.split(",") if s.strip()]
+    for section in sections:
+        if section not in DUMP_CHOICES:
+            raise UriscvError(f"Unknown --dump section '{section}' (choose from {', '.join(DUMP_CHOICES)})")
+
+    template = FunctionalSimulator()
+    load_program_source(template, args.source)
+    paths = input_paths(args.inputs)
+    if not paths:
+        raise UriscvError("no input memories")
+    memories = [read_input(path, base=args.mem_base, fmt=args.mem_format) for path in paths]
+    batch = BatchSimulator(
+        template.program_memory, memories, template.labels, entry_point=template.entry_point,
+        max_instructions=args.cycles, vectorize=not args.scalar,
+    )
+    result = batch.run()
+
+    lanes = []
+    for index, path in enumerate(paths):
+        lane = batch.lane(index)
+        lanes.append({"input": path, "status": batch.status(index), **lane.counters(), **collect_dump(lane, sections)})
+    report = {
+        "mode": "batch",
+        "lanes": len(paths),
+        "seconds": round(result.seconds, 6),
+        "vectorized": result.vectorized,
+        "scalar_lanes": result.scalar_lanes,
+        "statuses": result.statuses,
+        "results": lanes,
+    }
+    if args.format == "json":
+        print(json.dumps(report, indent=2))
+    else:
+        engine = "NumPy lanes" if result.vectorized else "scalar (NumPy not available)" if not args.scalar else "scalar"
+        print(f"{len(paths)} lanes, {engine}, {result.seconds:.3f} s")
+        print(", ".join(f"{status}: {count}" for status, count in result.statuses.items()))
+        for lane in lanes:
+            print(f"{lane['input']}: {lane['status']}, instructions={lane['instructions']}, taken_branches={lane['taken_branches']}")
+            if "pc" in lane:
+                print(f"  pc = 0x{lane['pc']:08x}")
+            if "regs" in lane:
+                print("  " + " ".join(f"x{i}=0x{value:08x}" for i, value in enumerate(lane["regs"]) if value))
+            for addr, value in lane.get("mem", {}).items():
+                print(f"  [{addr}] = 0x{value:08x}")
+    return EXIT_OK if result.complete else EXIT_STOPPED
+
+
+def cmd_serve(args):
+    # asyncio is only worth importing when serving
+    from .server import serve
+
+    def on_ready(address):
+        where = address if isinstance(address, str) else f"{address[0]}:{address[1]}"
+        print(f"serving on {where}", flush=True)
+
+    limits = {"workers": args.workers, "queue_size": args.queue, "max_cycles": args.max_cycles}
+    serve(path=args.socket, port=args.port, on_ready=on_ready,
+          **{name: value for name, value in limits.items() if value is not None})
+    return EXIT_OK
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    handler = {"assemble": cmd_assemble, "run": cmd_run, "analyze": cmd_analyze, "fuzz": cmd_fuzz, "batch": cmd_batch, "serve": cmd_serve}[args.command]
+    try:
+        return handler(args)
+    except (UriscvError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_ERROR
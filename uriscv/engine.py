@@ -0,0 +1,745 @@
+import time
+
+from .errors import SimulationError
+from .geometry import CLASSIC
+from .instructions import handler_for
+from .isa import DATA_START, DATA_END, PROG_START, PROG_END
+from .latches import IfId, IdEx, ExMem, MemWb, WbLatch, LATCH_NAMES
+from .memory import PagedMemory
+
+# ============================================================
+# μRISCV Pipeline Engine (headless, no tkinter)
+# ============================================================
+
+# ===== RUN BUDGETS =====
+DEFAULT_MAX_CYCLES = 1000
+DEFAULT_MAX_SECONDS = 30.0
+
+
+class RunResult:
+    """Outcome of PipelineEngine.run"""
+
+    # Possible values of status
+    COMPLETE = "complete"
+    CYCLE_LIMIT = "cycle_limit"
+    TIME_LIMIT = "time_limit"
+    LOOP = "loop"
+
+    def __init__(self, status, cycles, seconds, loop_report=None):
+        self.status = status
+        self.cycles = cycles
+        self.seconds = seconds
+        self.loop_report = loop_report
+
+    def as_dict(self):
+        return {
+            'status': self.status,
+            'cycles': self.cycles,
+            'seconds': self.seconds,
+            'loop_report': self.loop_report,
+        }
+
+
+class PipelineEngine:
+    # Names of latches() in pipeline_state, snapshots and checkpoints
+    latch_names = LATCH_NAMES
+
+    def __init__(self, verbose=False):
+        # Print per-stage trace lines to stdout
+        self.verbose = verbose
+        # Keep a human-readable snapshot of every cycle in pipeline_history
+        self.record_history = True
+
+        # Architectural registers - Using a list for easier management
+        self.registers = [0] * 32
+
+        # Pipeline registers. Each stage reads the current latches and writes the
+        # next_* ones; pipeline_advance swaps the two sets, so no cycle allocates.
+        self.pc = PROG_START
+        self.if_id, self.id_ex, self.ex_mem, self.mem_wb, self.wb = IfId(), IdEx(), ExMem(), MemWb(), WbLatch()
+        self.next_if_id, self.next_id_ex, self.next_ex_mem, self.next_mem_wb, self.next_wb = (
+            IfId(), IdEx(), ExMem(), MemWb(), WbLatch())
+
+        # Keep history per cycle for the pipeline table representation
+        self.pipeline_history = []
+
+        self.cycle_count = 0
+        self.instructions_retired = 0
+        self.taken_branches = 0
+        self.labels = {}
+
+        # Code lives in memory like data; [code_start, code_end) is the loaded
+        # program and decode_cache holds predecoded words fetched from it
+        self.code_start = 0
+        self.code_end = 0
+        self.decode_cache = {}
+        # Where reset_pipeline starts fetching (an ELF image may move it)
+        self.entry_point = PROG_START
+
+        # Optional cache.DataCache consulted by MEM; misses freeze the pipeline
+        self.data_cache = None
+        self.stall_remaining = 0
+        # Optional callable(addr, is_store) told about every aligned LW/SW in MEM
+        self.data_access_hook = None
+        # Optional profiler.Profiler collecting per-PC counters
+        self.profiler = None
+        # Optional memtrace.MemoryTrace recording every aligned LW/SW
+        self.memory_trace = None
+        # Optional statehash.HashStream hashing the state after every cycle
+        self.state_hashes = None
+        # Stage layout (geometry.PipelineGeometry); see set_geometry
+        self.set_geometry(CLASSIC)
+
+        # LW/SW reach the whole 32-bit space; pages are allocated on first write.
+        # memory_low..memory_high is the window shown in the GUI and in dumps.
+        self.memory_low = DATA_START
+        self.memory_high = PROG_END
+        self.memory = PagedMemory()
+
+        # Run budgets and loop detection
+        self.max_cycles = DEFAULT_MAX_CYCLES
+        self.max_seconds = DEFAULT_MAX_SECONDS
+        self.dirty_addresses = set()
+        # Off for harts sharing memory, whose spin loops progress through other harts' stores
+        self.detect_loops = True
+        self.back_edge_taken = False
+        # Where the last taken back-edge jumped to (PC has moved on by the time it is checked)
+        self.back_edge_target = 0
+        self.seen_state_hashes = {}
+        self.loop_report = None
+        self.loop_period = 0
+
+    def log(self, message):
+        if self.verbose:
+            print(message)
+
+    def set_geometry(self, geometry):
+        """Model a pipeline variant: where branches resolve, MEM latency, combined MEM/WB"""
+        self.geometry = geometry
+        self.branch_in_id = geometry.branch_stage == "ID"
+        self.mem_extra_cycles = geometry.mem_cycles - 1
+        self.merge_mem_wb = geometry.merge_mem_wb
+
+    def map_rows(self):
+        """Rows of the pipeline map (pipeline_history keys), from the stage table"""
+        return self.geometry.table_rows()
+
+    def latches(self):
+        """The current pipeline registers, in LATCH_NAMES order"""
+        return (self.if_id, self.id_ex, self.ex_mem, self.mem_wb, self.wb)
+
+    @property
+    def pipeline_state(self):
+        """PC and the current latches by name (the latches are live, not copies)"""
+        return {'PC': self.pc, **dict(zip(self.latch_names, self.latches()))}
+
+    @pipeline_state.setter
+    def pipeline_state(self, state):
+        self.pc = state['PC']
+        for name, latch in zip(self.latch_names, self.latches()):
+            # A state saved by a narrower pipeline leaves the extra latches empty
+            fields = state.get(name, {})
+            latch.load(fields if isinstance(fields, dict) else fields.as_dict())
+
+    def latch_state(self):
+        """PC and latch contents as plain dicts, for snapshots and checkpoints"""
+        return {'PC': self.pc, **{name: latch.as_dict() for name, latch in zip(self.latch_names, self.latches())}}
+
+    # -------------------------
+    # Program / state management
+    # -------------------------
+
+    def load_program(self, program_memory, labels=None):
+        """Write an assembled program ({address: word}) into memory and make it the code region
+
+        The pipeline is left as it is; call reset_pipeline to start over.
+        """
+        addresses = sorted(program_memory)
+        for addr in addresses:
+            self.memory.write_word(addr, program_memory[addr])
+        self.set_code_region(addresses[0] if addresses else 0, addresses[-1] + 4 if addresses else 0)
+        self.labels = dict(labels or {})
+
+    def set_code_region(self, start, end):
+        """Make [start, end) of memory the program, e.g. after loading a binary image"""
+        self.code_start = start
+        self.code_end = end
+        self.decode_cache.clear()
+
+    @property
+    def program_memory(self):
+        """The code region as {address: word}, read from memory"""
+        return {addr: self.memory.read_word(addr) for addr in range(self.code_start, self.code_end, 4)}
+
+    def has_program(self):
+        return self.code_end > self.code_start
+
+    def in_code(self, pc):
+        """True if pc addresses an instruction of the loaded program"""
+        return self.code_start <= pc < self.code_end and not pc & 3
+
+    def fetch_decoded(self, pc):
+        """Predecoded instruction at pc, through the decode cache"""
+        decoded = self.decode_cache.get(pc)
+        if decoded is None:
+            decoded = self.decode_cache[pc] = self.predecode(self.memory.read_word(pc))
+        return decoded
+
+    def predecode(self, instruction):
+        """What the decode cache keeps for an instruction word"""
+        return instruction
+
+    def reset_pipeline(self):
+        """Empty the pipeline and history, keeping registers and memory"""
+        self.pc = self.entry_point
+        for latch in self.latches():
+            latch.clear()
+        self.pipeline_history.clear()
+        self.cycle_count = 0
+        self.instructions_retired = 0
+        self.taken_branches = 0
+        self.stall_remaining = 0
+        if self.data_cache is not None:
+            self.data_cache.reset()
+        if self.profiler is not None:
+            self.profiler.reset()
+        if self.memory_trace is not None:
+            self.memory_trace.reset()
+        if self.state_hashes is not None:
+            self.state_hashes.reset()
+        self.reset_loop_detection()
+
+    def reset(self):
+        """Reset pipeline, registers and memory to their initial state"""
+        self.entry_point = PROG_START
+        self.reset_pipeline()
+
+        # Reset all registers to 0
+        for i in range(32):
+            self.registers[i] = 0
+
+        # Reset memory (the program goes with it)
+        self.memory.clear()
+        self.dirty_addresses.clear()
+        self.code_start = self.code_end = 0
+        self.decode_cache.clear()
+
+    # -------------------------
+    # Memory
+    # -------------------------
+
+    def read_word(self, addr):
+        """Read 4 bytes as a word (little-endian)"""
+        if addr % 4 != 0:
+            return 0
+        return self.memory.read_word(addr)
+
+    def write_word(self, addr, value):
+        """Write 4 bytes as a word (little-endian)"""
+        # Any word-aligned address in the 32-bit space is writable
+        if addr < 0 or addr > 0xFFFFFFFC or addr % 4 != 0:
+            return False
+
+        self.memory.write_word(addr, value)
+        self.dirty_addresses.add(addr)
+        # A store into the program invalidates that word's predecoded entry
+        if self.code_start <= addr < self.code_end:
+            self.decode_cache.pop(addr, None)
+        return True
+
+    def write_bytes(self, addr, data):
+        """Copy a bytes-like block (e.g. a slice of an mmapped image) into memory at addr"""
+        if addr < 0 or addr + len(data) > 0x100000000:
+            return False
+        self.memory.write_bytes(addr, data)
+        # Unlike write_word this does not mark words dirty: images are initial state
+        if addr < self.code_end and addr + len(data) > self.code_start:
+            self.decode_cache.clear()
+        return True
+
+    # -------------------------
+    # Snapshots
+    # -------------------------
+
+    def snapshot(self):
+        """Capture the architectural and pipeline state; memory pages are shared copy-on-write"""
+        return {
+            'registers': list(self.registers),
+            'pipeline_state': self.latch_state(),
+            'memory': self.memory.snapshot(),
+            'cycle_count': self.cycle_count,
+            'instructions_retired': self.instructions_retired,
+            'taken_branches': self.taken_branches,
+            'dirty_addresses': set(self.dirty_addresses),
+            'code_range': (self.code_start, self.code_end),
+            'entry_point': self.entry_point,
+            'stall_remaining': self.stall_remaining,
+            'data_cache': self.data_cache.copy() if self.data_cache is not None else None,
+        }
+
+    def restore(self, snap):
+        """Return to a state captured by snapshot(); the snapshot stays reusable"""
+        self.registers[:] = snap['registers']
+        self.pipeline_state = snap['pipeline_state']
+        self.memory = snap['memory'].snapshot()
+        self.code_start, self.code_end = snap['code_range']
+        self.entry_point = snap['entry_point']
+        self.decode_cache = {}
+        self.cycle_count = snap['cycle_count']
+        self.instructions_retired = snap['instructions_retired']
+        self.taken_branches = snap['taken_branches']
+        self.dirty_addresses = set(snap['dirty_addresses'])
+        self.stall_remaining = snap['stall_remaining']
+        self.data_cache = snap['data_cache'].copy() if snap['data_cache'] is not None else None
+        self.back_edge_taken = False
+        self.seen_state_hashes.clear()
+        self.loop_report = None
+        self.loop_period = 0
+
+    def fork(self, engine_class=None):
+        """Return an independent engine continuing from the current state
+
+        engine_class switches the model (e.g. to a dual-issue pipeline).
+        """
+        other = (engine_class or self.__class__)(self.verbose)
+        other.record_history = self.record_history
+        other.labels = self.labels
+        other.max_cycles = self.max_cycles
+        other.max_seconds = self.max_seconds
+        other.set_geometry(self.geometry)
+        other.restore(self.snapshot())
+        return other
+
+    # -------------------------
+    # Pipeline: core functions
+    # -------------------------
+
+    def step(self):
+        """Execute one pipeline cycle
+
+        Returns True if this cycle only primed the pipeline (first fetch),
+        False for a regular cycle.
+        """
+        if not self.has_program():
+            raise SimulationError("No valid program loaded")
+
+        # For the very first step after loading program, prime the pipeline;
+        # the instruction fetched here is decoded by the next cycle's ID
+        if self.cycle_count == 0 and not self.if_id.valid:
+            self.log("Priming pipeline - first cycle")
+            self.instruction_fetch(self.if_id)
+            self.cycle_count += 1
+            self.record_pipeline_snapshot()
+            if self.state_hashes is not None:
+                self.state_hashes.record(self)
+            return True
+
+        # A data cache miss freezes every stage until the refill completes
+        if self.stall_remaining:
+            self.skip_idle(1)
+            return False
+
+        self.cycle_count += 1
+        if self.verbose:
+            self.log(f"\n=== Cycle {self.cycle_count} ===")
+
+        # Record pipeline snapshot before advancement
+        self.record_pipeline_snapshot()
+
+        # Pipeline stages in reverse order
+        # WB stage - write results to register file; an instruction retires
+        # in the single cycle it spends in WB
+        if self.wb.valid:
+            self.retire(self.wb)
+
+        # MEM stage - handle memory operations (fills next_wb)
+        self.memory_access(self.ex_mem, self.next_wb)
+        # A combined MEM/WB stage writes the register file on its way out
+        if self.merge_mem_wb and self.next_wb.valid:
+            self.retire(self.next_wb)
+            self.next_wb.clear()
+
+        # EX stage - execute instruction (fills next_ex_mem)
+        branch_taken = self.execute(self.id_ex, self.next_ex_mem)
+
+        # ID stage - decode and read registers (fills next_id_ex)
+        if self.if_id.valid:
+            self.instruction_decode(self.if_id, self.next_id_ex)
+            if self.branch_in_id:
+                self.resolve_branch(self.next_id_ex)
+        else:
+            self.next_id_ex.clear()
+
+        # Advance pipeline with freeze handling
+        self.pipeline_advance(branch_taken)
+        if self.state_hashes is not None:
+            self.state_hashes.record(self)
+
+        # Loop detection at back-edges
+        if self.back_edge_taken:
+            self.back_edge_taken = False
+            self.check_loop_progress()
+
+        return False
+
+    def skip_idle(self, limit):
+        """Advance through up to limit frozen (memory stall) cycles at once; returns how many
+
+        Nothing moves while the pipeline is frozen, so every one of these
+        cycles has the same history entry and state; they are built once.
+        """
+        count = min(self.stall_remaining, limit)
+        if count <= 0:
+            return 0
+        if self.verbose:
+            for cycle in range(self.cycle_count + 1, self.cycle_count + count + 1):
+                self.log(f"\n=== Cycle {cycle} (memory stall) ===")
+        self.cycle_count += count
+        self.stall_remaining -= count
+        if self.record_history:
+            self.record_pipeline_snapshot()
+            # The frozen cycles share one (read-only) history entry
+            self.pipeline_history.extend([self.pipeline_history[-1]] * (count - 1))
+        if self.state_hashes is not None:
+            self.state_hashes.record_frozen(self, count)
+        return count
+
+    def run(self, max_cycles=None, max_seconds=None, on_cycle=None, batch_idle=False):
+        """Step until the program completes or a budget is exhausted
+
+        on_cycle, if given, is called after every cycle with the value
+        returned by step(). Frozen cycles are skipped in bulk when there is
+        no on_cycle, or when batch_idle says it may be called once for
+        several of them. Returns a RunResult.
+        """
+        if max_cycles is not None:
+            self.max_cycles = max_cycles
+        if max_seconds is not None:
+            self.max_seconds = max_seconds
+
+        start = time.perf_counter()
+        deadline = start + self.max_seconds
+        status = RunResult.COMPLETE
+        while not self.is_program_complete():
+            if self.cycle_count >= self.max_cycles:
+                status = RunResult.CYCLE_LIMIT
+                break
+            if self.stall_remaining and (batch_idle or on_cycle is None) and self.has_program():
+                self.skip_idle(self.max_cycles - self.cycle_count)
+                primed = False
+            else:
+                primed = self.step()
+            if on_cycle is not None:
+                on_cycle(primed)
+            if self.loop_report:
+                status = RunResult.LOOP
+                break
+            if time.perf_counter() > deadline:
+                status = RunResult.TIME_LIMIT
+                break
+
+        return RunResult(status, self.cycle_count, time.perf_counter() - start, self.loop_report)
+
+    def counters(self):
+        """Return cycle and instruction counters as a dict"""
+        cpi = self.cycle_count / self.instructions_retired if self.instructions_retired else 0.0
+        return {
+            'cycles': self.cycle_count,
+            'instructions': self.instructions_retired,
+            'taken_branches': self.taken_branches,
+            'cpi': round(cpi, 4),
+            **(self.data_cache.stats() if self.data_cache is not None else {}),
+        }
+
+    def record_pipeline_snapshot(self):
+        """Store human-readable snapshot of pipeline stages"""
+        if not self.record_history:
+            return
+
+        def fmt(v):
+            if isinstance(v, int):
+                return f"0x{v:08x}" if v != 0 else ""
+            return str(v)
+
+        if_id, id_ex, ex_mem, mem_wb = self.if_id, self.id_ex, self.ex_mem, self.mem_wb
+
+        # Compute memory at EX/MEM ALUOUTPUT if valid
+        mem_at_addr = ""
+        ex_alu = ex_mem.ALUOUTPUT
+        if ex_alu and (DATA_START <= ex_alu <= DATA_END - 3) and ex_alu % 4 == 0:
+            mem_at_addr = f"0x{self.read_word(ex_alu):08x}"
+
+        # Compute writeback register name/value if available (a combined
+        # MEM/WB stage writes back the instruction in MEM)
+        wb_rd_str = ""
+        memwb_ir = ex_mem.IR if self.merge_mem_wb else mem_wb.IR
+        if memwb_ir:
+            rd = (memwb_ir >> 7) & 0x1F
+            if rd != 0:
+                wb_rd_str = f"x{rd}=0x{self.registers[rd]:08x}"
+            else:
+                wb_rd_str = "x0=0x00000000"
+
+        snap = {
+            'IF/ID.IR': fmt(if_id.IR),
+            'IF/ID.NPC': fmt(if_id.NPC),
+            'PC': fmt(self.pc),
+            'ID/EX.A': fmt(id_ex.A),
+            'ID/EX.B': fmt(id_ex.B),
+            'ID/EX.IMM': str(id_ex.IMM) if id_ex.IMM != 0 else "",
+            'ID/EX.IR': fmt(id_ex.IR),
+            'ID/EX.NPC': fmt(id_ex.NPC),
+            'EX/MEM.ALUOUTPUT': fmt(ex_alu),
+            'EX/MEM.IR': fmt(ex_mem.IR),
+            'EX/MEM.B': fmt(ex_mem.B),
+            'EX/MEM.COND': str(ex_mem.cond) if ex_mem.cond else "",
+            'MEM/WB.LMD': fmt(mem_wb.LMD),
+            'MEM/WB.IR': fmt(mem_wb.IR),
+            'MEM/WB.ALUOUTPUT': fmt(mem_wb.ALUOUTPUT),
+            'MEM[EX/MEM.ALUOUTPUT]': mem_at_addr,
+            'WB': wb_rd_str
+        }
+
+        self.pipeline_history.append(snap)
+
+    def reset_loop_detection(self):
+        """Forget all state hashes recorded for loop detection"""
+        self.dirty_addresses.clear()
+        self.back_edge_taken = False
+        self.seen_state_hashes.clear()
+        self.loop_report = None
+        self.loop_period = 0
+
+    def architectural_state_hash(self):
+        """Hash PC, registers, pipeline latches and the contents of memory"""
+        latches = tuple(latch.values() for latch in self.latches())
+        # The memory digest is maintained incrementally by every store
+        return hash((self.pc, tuple(self.registers), latches, self.memory.digest()))
+
+    def check_loop_progress(self):
+        """Called at a taken back-edge; stop the run if the exact state was seen before"""
+        if not self.detect_loops:
+            return False
+        state_hash = self.architectural_state_hash()
+        first_cycle = self.seen_state_hashes.get(state_hash)
+        if first_cycle is None:
+            self.seen_state_hashes[state_hash] = self.cycle_count
+            return False
+
+        self.loop_period = self.cycle_count - first_cycle
+        self.loop_report = (
+            f"Non-progressing loop detected at cycle {self.cycle_count}\n"
+            f"State repeats cycle {first_cycle} (period {self.loop_period} cycles)\n"
+            f"Back-edge target PC: 0x{self.back_edge_target:04x}\n"
+            f"Memory words written: {len(self.dirty_addresses)}"
+        )
+        self.log(self.loop_report)
+        return True
+
+    def is_program_complete(self):
+        """Check if program execution is complete"""
+        pipeline_empty = not (
+            self.if_id.valid or self.id_ex.valid or self.ex_mem.valid or
+            self.mem_wb.valid or self.wb.valid
+        )
+        return pipeline_empty and not self.in_code(self.pc) and not self.stall_remaining
+
+    def memory_access(self, ex, wb):
+        """MEM stage: Handle the memory operation in EX/MEM latch ex, filling next cycle's WB latch wb"""
+        if not ex.valid:
+            wb.clear()
+            return
+
+        instruction = ex.IR
+        addr = ex.ALUOUTPUT
+        handler = ex.handler
+        lmd = handler.memory(self, addr, ex.B)
+        wb.valid = True
+        wb.IR = instruction
+        # SW and branches have no destination
+        wb.RD = (instruction >> 7) & 0x1F if handler.writes_rd else 0
+        wb.VALUE = handler.writeback_value(lmd, addr)
+
+        # Unaligned accesses never reach memory, so they cannot miss or take extra MEM cycles
+        if (handler.is_load or handler.is_store) and addr % 4 == 0:
+            stall = self.mem_extra_cycles
+            if self.data_cache is not None:
+                miss = self.data_cache.access(addr, handler.is_store)
+                if miss:
+                    if self.verbose:
+                        self.log(f"  D-cache miss at 0x{addr:08x}: stalling {miss} cycle(s)")
+                stall += miss
+            if stall:
+                self.stall_remaining = stall
+                if self.profiler is not None:
+                    self.profiler.on_stall(ex.PC, stall)
+            if self.data_access_hook is not None:
+                self.data_access_hook(addr, handler.is_store)
+            if self.memory_trace is not None:
+                self.memory_trace.record(self.cycle_count, ex.PC, addr, handler.is_store, ex.B if handler.is_store else lmd)
+
+    def retire(self, wb):
+        """The instruction in wb leaves the pipeline: count it and write its result"""
+        self.instructions_retired += 1
+        if self.profiler is not None:
+            self.profiler.on_retire()
+        self.write_back(wb)
+
+    def write_back(self, wb):
+        """WB stage: Write results to register file"""
+        instruction = wb.IR
+        rd = wb.RD
+        value = wb.VALUE
+
+        if self.verbose:
+            self.log(f"WB Stage: Instruction {instruction:08x}, rd=x{rd}, value=0x{value:08x}")
+
+        # Only write to non-zero registers
+        if rd != 0:
+            self.registers[rd] = value & 0xFFFFFFFF
+            if self.verbose:
+                self.log(f"  Writing: x{rd} = 0x{value:08x}")
+
+        # Ensure x0 is always zero
+        self.registers[0] = 0
+
+    def pipeline_advance(self, branch_taken=False):
+        """Advance pipeline registers with pipeline-freeze policy for branches
+
+        next_wb, next_ex_mem and next_id_ex were filled by MEM, EX and ID;
+        MEM/WB and IF/ID are filled here, then the latch sets swap.
+        """
+        if self.verbose:
+            self.log(f"Pipeline Advance: branch_taken={branch_taken}")
+
+        # MEM_WB <- EX_MEM (the load data has already gone on to WB)
+        ex, mem_wb = self.ex_mem, self.next_mem_wb
+        if self.merge_mem_wb:
+            # The combined stage has already retired it
+            mem_wb.clear()
+        else:
+            mem_wb.valid = ex.valid
+            mem_wb.LMD = 0
+            mem_wb.IR = ex.IR
+            mem_wb.ALUOUTPUT = ex.ALUOUTPUT
+
+        # Handle control hazards (pipeline freeze): insert a bubble into ID_EX
+        # and fetch the branch target
+        if branch_taken:
+            self.next_id_ex.clear()
+        self.instruction_fetch(self.next_if_id)
+
+        self.if_id, self.next_if_id = self.next_if_id, self.if_id
+        self.id_ex, self.next_id_ex = self.next_id_ex, self.id_ex
+        self.ex_mem, self.next_ex_mem = self.next_ex_mem, self.ex_mem
+        self.mem_wb, self.next_mem_wb = self.next_mem_wb, self.mem_wb
+        self.wb, self.next_wb = self.next_wb, self.wb
+
+    def instruction_decode(self, if_id, out):
+        """ID stage: Decode the instruction in IF/ID latch if_id into the ID/EX latch out"""
+        instruction = if_id.IR
+        if not if_id.valid:
+            out.clear()
+            return
+
+        rs1 = (instruction >> 15) & 0x1F
+        rs2 = (instruction >> 20) & 0x1F
+        # The handler is selected once here and travels with the instruction to MEM
+        handler = handler_for(instruction)
+        imm_value = handler.immediate(instruction)
+
+        out.valid = True
+        out.handler = handler
+        out.A = self.registers[rs1]
+        out.B = self.registers[rs2]
+        out.IMM = imm_value
+        out.IR = instruction
+        out.NPC = if_id.NPC
+        if self.verbose:
+            self.log(f"ID Stage: Set IMM = {imm_value} (0x{imm_value & 0xFFFFFFFF:08x}) for instruction 0x{instruction:08x}")
+
+    def resolve_branch(self, id_ex):
+        """ID stage of a geometry that resolves branches in ID: a taken branch redirects this cycle's fetch"""
+        handler = id_ex.handler
+        if not handler.is_branch:
+            return
+        _, taken = handler.execute(self, id_ex.A, id_ex.B, id_ex.IMM)
+        if taken:
+            self.taken_branches += 1
+            pc = (id_ex.NPC - 4) & 0xFFFFFFFF
+            branch_target = (pc + id_ex.IMM) & 0xFFFFFFFF
+            if self.verbose:
+                self.log(f"  Branch taken in ID! Target: 0x{branch_target:08x}")
+            self.pc = branch_target
+            if branch_target <= pc:
+                self.back_edge_taken = True
+                self.back_edge_target = branch_target
+
+    def instruction_fetch(self, out):
+        """IF stage: Fetch the instruction at PC from the code region into the IF/ID latch out"""
+        pc = self.pc
+
+        if self.verbose:
+            self.log(f"IF Stage: PC = 0x{pc:04x}")
+
+        if self.in_code(pc):
+            instruction = self.fetch_decoded(pc)
+            # An all-zero word is not an instruction and travels as a bubble
+            out.valid = instruction != 0
+            out.IR = instruction
+            out.NPC = (pc + 4) & 0xFFFFFFFF
+            out.PC = pc
+            self.pc = (pc + 4) & 0xFFFFFFFF
+            if self.verbose:
+                self.log(f"  Fetched instruction: 0x{instruction:08x} from 0x{pc:04x}")
+            if self.profiler is not None:
+                self.profiler.on_fetch(pc)
+        else:
+            out.clear()
+            self.log("  No instruction at this PC")
+
+    def execute(self, idex, out):
+        """EX stage: Execute the instruction in ID/EX latch idex into EX/MEM latch out; returns True for a taken branch"""
+        if not idex.valid:
+            out.clear()
+            return False
+
+        instruction = idex.IR
+        handler = idex.handler
+        rs1_val = idex.A
+        rs2_val = idex.B
+        imm_val = idex.IMM
+        npc_val = idex.NPC
+
+        if self.verbose:
+            self.log(f"EX Stage: Instruction {instruction:08x}, {handler.name}")
+        if self.verbose:
+            self.log(f"  rs1_val=0x{rs1_val:08x}, rs2_val=0x{rs2_val:08x}, imm_val={imm_val}")
+
+        result, branch_taken = handler.execute(self, rs1_val, rs2_val, imm_val)
+        out.valid = True
+        out.ALUOUTPUT = result & 0xFFFFFFFF
+        out.cond = 1 if branch_taken else 0
+        out.IR = instruction
+        out.handler = handler
+        out.B = rs2_val
+        out.PC = (npc_val - 4) & 0xFFFFFFFF
+        # A branch resolved in ID has already redirected the fetch
+        if self.branch_in_id:
+            branch_taken = False
+        if self.profiler is not None:
+            self.profiler.on_execute(npc_val - 4, handler, branch_taken)
+
+        if branch_taken:
+            self.taken_branches += 1
+            # IMM is already a byte offset relative to the branch itself
+            branch_target = (npc_val - 4 + imm_val) & 0xFFFFFFFF
+            if self.verbose:
+                self.log(f"  Branch taken! Target: 0x{branch_target:08x}")
+            self.pc = branch_target
+            # A taken branch to an address at or before itself closes a loop
+            if branch_target <= npc_val - 4:
+                self.back_edge_taken = True
+                self.back_edge_target = branch_target
+
+        return branch_taken
@@ -0,0 +1,15 @@
+class UriscvError(Exception):
+    """Base class for all μRISCV assembler and simulator errors"""
+
+
+class AssemblyError(UriscvError):
+    """A source line could not be validated or encoded"""
+
+    def __init__(self, line_num, message):
+        super().__init__(f"Line {line_num}: {message}")
+        self.line_num = line_num
+        self.message = message
+
+
+class SimulationError(UriscvError):
+    """The engine was asked to do something it cannot do in its current state"""
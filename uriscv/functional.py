@@ -0,0 +1,107 @@
+from .engine import PipelineEngine
+from .instructions import (
+    OPCODE_R, OPCODE_I, OPCODE_LOAD, OPCODE_STORE, OPCODE_BRANCH, handler_for, to_signed,
+)
+
+# ============================================================
+# μRISCV Functional Simulator (one instruction per step, no pipeline)
+# ============================================================
+
+
+class FunctionalSimulator(PipelineEngine):
+    """Architectural reference model of the μRISCV subset
+
+    Shares memory, registers, budgets and loop detection with
+    PipelineEngine, but step() executes one whole instruction, so
+    cycle_count equals the number of instructions executed.
+    """
+
+    def __init__(self, verbose=False):
+        super().__init__(verbose)
+        # There is no pipeline to snapshot
+        self.record_history = False
+
+    def step(self):
+        """Execute the instruction at PC. Always returns False."""
+        pc = self.pc
+        instruction, opcode, rd, funct3, rs1, rs2, imm = self.fetch_decoded(pc)
+        next_pc = (pc + 4) & 0xFFFFFFFF
+        regs = self.registers
+
+        if opcode == OPCODE_R and funct3 == 0b111:  # AND
+            self.write_register(rd, regs[rs1] & regs[rs2])
+
+        elif opcode == OPCODE_R and funct3 == 0b110:  # OR
+            self.write_register(rd, regs[rs1] | regs[rs2])
+
+        elif opcode == OPCODE_I and funct3 == 0b110:  # ORI (immediate is zero-extended, as in the pipeline)
+            self.write_register(rd, regs[rs1] | (imm & 0xFFF))
+
+        elif opcode == OPCODE_LOAD and funct3 == 0b010:  # LW
+            address = (regs[rs1] + imm) & 0xFFFFFFFF
+            value = self.read_word(address)
+            self.write_register(rd, value)
+            if self.memory_trace is not None and not address & 3:
+                self.memory_trace.record(self.cycle_count + 1, pc, address, False, value)
+
+        elif opcode == OPCODE_STORE and funct3 == 0b010:  # SW
+            address = (regs[rs1] + imm) & 0xFFFFFFFF
+            self.write_word(address, regs[rs2])
+            if self.memory_trace is not None and not address & 3:
+                self.memory_trace.record(self.cycle_count + 1, pc, address, True, regs[rs2])
+
+        elif opcode == OPCODE_BRANCH:
+            if funct3 == 0b100:  # BLT
+                taken = to_signed(regs[rs1]) < to_signed(regs[rs2])
+            elif funct3 == 0b101:  # BGE
+                taken = to_signed(regs[rs1]) >= to_signed(regs[rs2])
+            else:
+                taken = False
+            if taken:
+                self.taken_branches += 1
+                next_pc = (pc + imm) & 0xFFFFFFFF
+                if next_pc <= pc:
+                    self.back_edge_taken = True
+                    self.back_edge_target = next_pc
+
+        elif handler_for(instruction).writes_rd:
+            # An encoding outside the instruction table computes 0 into rd, as in the pipeline
+            self.write_register(rd, 0)
+
+        if self.verbose:
+            self.log(f"0x{pc:04x}: 0x{instruction:08x}")
+        if self.profiler is not None:
+            self.profiler.on_fetch(pc)
+            # There are no freeze bubbles without a pipeline
+            self.profiler.on_execute(pc, handler_for(instruction), False)
+            self.profiler.on_retire()
+        self.pc = next_pc
+        self.cycle_count += 1
+        self.instructions_retired += 1
+        if self.state_hashes is not None:
+            self.state_hashes.record(self)
+
+        if self.back_edge_taken:
+            self.back_edge_taken = False
+            self.check_loop_progress()
+        return False
+
+    def predecode(self, instruction):
+        """Split a word into (word, opcode, rd, funct3, rs1, rs2, immediate) once per fetch address"""
+        return (
+            instruction,
+            instruction & 0x7F,
+            (instruction >> 7) & 0x1F,
+            (instruction >> 12) & 0x7,
+            (instruction >> 15) & 0x1F,
+            (instruction >> 20) & 0x1F,
+            handler_for(instruction).immediate(instruction),
+        )
+
+    def write_register(self, rd, value):
+        if rd != 0:
+            self.registers[rd] = value & 0xFFFFFFFF
+
+    def is_program_complete(self):
+        """Execution ends when PC leaves the loaded program"""
+        return not self.in_code(self.pc)
@@ -0,0 +1,449 @@
+import random
+import time
+
+from .analysis import HAZARD_GAP
+from .assembler import assemble, parse_instruction
+from .engine import PipelineEngine, RunResult
+from .errors import UriscvError
+from .functional import FunctionalSimulator
+from .instructions import INSTRUCTIONS, OPCODE_R, OPCODE_I, OPCODE_LOAD, OPCODE_STORE
+from .isa import DATA_START, DATA_END, PROG_START, PROG_END
+from .memory import PagedMemory
+
+# ============================================================
+# μRISCV differential fuzzer: pipelined engine vs functional model
+# ============================================================
+
+# Generated instructions are (mnemonic, rd, rs1, rs2, imm) tuples with register
+# numbers; a branch's imm is its target label
+NOP = ("ORI", 0, 0, 0, 0)
+NOP_TEXT = "ori x0, x0, 0"
+
+# (opcode, funct3) of every mnemonic, from the handler table
+ENCODINGS = {handler.name: key for key, handler in INSTRUCTIONS.items()}
+
+# Budgets per run, scaled by program length
+CYCLES_PER_LINE = 40
+
+
+class FuzzCase:
+    """One generated program plus its initial data memory ({addr: word})
+
+    program is (program_memory, labels) as assemble() would return them for
+    lines; the generator encodes it directly, and compare() only assembles
+    the lines of cases built without it (e.g. while minimizing).
+    """
+
+    def __init__(self, seed, lines, memory, program=None):
+        self.seed = seed
+        self.lines = lines
+        self.memory = memory
+        self.program = program
+
+    def source(self):
+        return "\n".join(self.lines) + "\n"
+
+
+class Mismatch:
+    """A case on which the pipelined engine and functional model disagree"""
+
+    def __init__(self, case, differences, minimized=None):
+        self.case = case
+        self.differences = differences
+        self.minimized = minimized
+
+    def report(self):
+        case = self.minimized or self.case
+        differences = compare(case) if self.minimized else self.differences
+        text = [f"=== mismatch (seed {self.case.seed}) ==="]
+        text += [f"  {d}" for d in differences]
+        text.append("--- reproducer ---")
+        text.append(case.source().rstrip("\n"))
+        if case.memory:
+            text.append("--- initial memory ---")
+            text += [f"[0x{addr:04x}] = 0x{value:08x}" for addr, value in sorted(case.memory.items())]
+        return "\n".join(text)
+
+
+# -------------------------
+# Program generation
+# -------------------------
+
+class ProgramGenerator:
+    """Random μRISCV programs that respect HAZARD_GAP and always terminate
+
+    Loops are bounded by pointer chasing: the loop register walks a chain
+    of words in data memory that ends in 0, since the ISA has no adder.
+    """
+
+    def __init__(self, rng, length=24, registers=7, max_loop_trips=5, words=3):
+        self.rng = rng
+        self.length = length
+        self.registers = list(range(1, registers + 1))
+        self.max_loop_trips = max_loop_trips
+        self.words = words
+
+    def generate(self, seed):
+        self.lines = []
+        # Per line: an instruction tuple, a .word value or a label name
+        self.code = []
+        self.recent = [None] * (HAZARD_GAP - 1)
+        self.memory = {}
+        self.label_count = 0
+        self.pending_labels = []
+
+        # Reserve a few data words for loop chains so random stores avoid them
+        data_words = list(range(DATA_START, DATA_END + 1, 4))
+        self.rng.shuffle(data_words)
+        self.chain_words = data_words[:8]
+        self.free_words = data_words[8:]
+        for addr in self.free_words:
+            if self.rng.random() < 0.5:
+                self.memory[addr] = self.rng.getrandbits(32)
+
+        while len(self.lines) < self.length:
+            roll = self.rng.random()
+            if roll < 0.08 and self.chain_words:
+                self.emit_loop()
+            elif roll < 0.16:
+                self.emit_forward_branch()
+            else:
+                self.emit(self.random_simple())
+            self.flush_labels(probability=0.3)
+        self.flush_labels(probability=1.0)
+
+        # Data words embedded in the code: usually jumped over, sometimes executed
+        if self.words:
+            fall_through = self.rng.random() < 0.3
+            if not fall_through:
+                self.emit(("BGE", 0, 0, 0, "done"))
+            for _ in range(self.rng.randint(1, self.words)):
+                word = self.unknown_word() if fall_through else self.rng.getrandbits(32)
+                self.lines.append(f".word 0x{word:08x}")
+                self.code.append(word)
+            self.add_label("done")
+
+        return FuzzCase(seed, self.lines, self.memory, program=encode_program(self.code))
+
+    def unknown_word(self):
+        """A random word outside the instruction table, so executing it only writes 0 to rd
+
+        Real instructions could break the HAZARD_GAP spacing or branch away.
+        """
+        while True:
+            word = self.rng.getrandbits(32)
+            if (word & 0x7F, (word >> 12) & 0x7) not in INSTRUCTIONS:
+                return word
+
+    def new_label(self, prefix):
+        self.label_count += 1
+        return f"{prefix}{self.label_count}"
+
+    def emit(self, instruction):
+        """Append an instruction, padding with NOPs until its sources are ready"""
+        dest, sources = instruction_usage(instruction)
+        while any(src in self.recent for src in sources):
+            self.append(NOP, None)
+        self.append(instruction, dest)
+
+    def append(self, instruction, dest):
+        self.lines.append(instruction_text(instruction))
+        self.code.append(instruction)
+        self.recent = self.recent[1:] + [dest]
+
+    def add_label(self, label):
+        self.lines.append(f"{label}:")
+        self.code.append(label)
+
+    def flush_labels(self, probability):
+        if self.pending_labels and self.rng.random() < probability:
+            for label in self.pending_labels:
+                self.add_label(label)
+            self.pending_labels = []
+
+    def random_simple(self, avoid=None):
+        rng = self.rng
+        regs = [r for r in self.registers if r != avoid]
+        kind = rng.choice(("AND", "OR", "ORI", "ORI", "LW", "SW"))
+        rd = rng.choice(regs)
+        rs1 = rng.choice(self.registers + [0])
+        rs2 = rng.choice(self.registers + [0])
+        if kind in ("AND", "OR"):
+            return (kind, rd, rs1, rs2, 0)
+        if kind == "ORI":
+            return ("ORI", rd, rs1, 0, rng.randint(-2048, 2047))
+        if kind == "LW":
+            if rng.random() < 0.7:
+                return ("LW", rd, 0, 0, rng.randrange(DATA_START, PROG_END - 2, 4))
+            return ("LW", rd, rs1, 0, rng.randrange(-64, 64, 4))
+        return ("SW", 0, 0, rs2, rng.choice(self.free_words))
+
+    def emit_forward_branch(self):
+        label = self.new_label("skip")
+        mnemonic = self.rng.choice(("BLT", "BGE"))
+        rs1 = self.rng.choice(self.registers + [0])
+        rs2 = self.rng.choice(self.registers + [0])
+        self.emit((mnemonic, 0, rs1, rs2, label))
+        self.pending_labels.append(label)
+
+    def emit_loop(self):
+        """Emit a loop whose trip count is the length of a pointer chain"""
+        trips = self.rng.randint(1, min(self.max_loop_trips, len(self.chain_words)))
+        chain = [self.chain_words.pop() for _ in range(trips)]
+        for addr, nxt in zip(chain, chain[1:] + [0]):
+            self.memory[addr] = nxt
+        ptr = self.rng.choice(self.registers)
+        label = self.new_label("loop")
+
+        # Labels may not share a line with pending forward-branch labels
+        self.flush_labels(probability=1.0)
+        self.emit(("ORI", ptr, 0, 0, chain[0]))
+        while any(r is not None for r in self.recent):
+            self.append(NOP, None)
+        self.add_label(label)
+        for _ in range(self.rng.randint(1, 3)):
+            self.emit(self.random_simple(avoid=ptr))
+        self.emit(("LW", ptr, ptr, 0, 0))
+        self.emit(("BLT", 0, 0, ptr, label))
+
+
+def instruction_text(instruction):
+    """Assembly source of an instruction tuple"""
+    mnemonic, rd, rs1, rs2, imm = instruction
+    if mnemonic in ("AND", "OR"):
+        return f"{mnemonic.lower()} x{rd}, x{rs1}, x{rs2}"
+    if mnemonic == "ORI":
+        return f"ori x{rd}, x{rs1}, {imm}"
+    if mnemonic == "LW":
+        return f"lw x{rd}, {imm}(x{rs1})"
+    if mnemonic == "SW":
+        return f"sw x{rs2}, {imm}(x{rs1})"
+    return f"{mnemonic.lower()} x{rs1}, x{rs2}, {imm}"
+
+
+def instruction_usage(instruction):
+    """Return (destination, [sources]) register numbers of an instruction tuple, leaving out x0"""
+    mnemonic, rd, rs1, rs2, _ = instruction
+    if mnemonic in ("AND", "OR"):
+        dest, sources = rd, (rs1, rs2)
+    elif mnemonic in ("ORI", "LW"):
+        dest, sources = rd, (rs1,)
+    else:
+        dest, sources = None, (rs1, rs2)
+    return dest or None, [s for s in sources if s]
+
+
+def encode(instruction, pc, labels):
+    """Machine word of an instruction tuple at pc, matching the assembler's encoding"""
+    mnemonic, rd, rs1, rs2, imm = instruction
+    opcode, funct3 = ENCODINGS[mnemonic]
+    word = rs1 << 15 | funct3 << 12 | opcode
+    if opcode == OPCODE_R:
+        return word | rs2 << 20 | rd << 7
+    if opcode in (OPCODE_I, OPCODE_LOAD):
+        return word | (imm & 0xFFF) << 20 | rd << 7
+    if opcode == OPCODE_STORE:
+        return word | (imm >> 5 & 0x7F) << 25 | rs2 << 20 | (imm & 0x1F) << 7
+    offset = (labels[imm] - pc) & 0x1FFF
+    return (word | (offset >> 12) << 31 | (offset >> 5 & 0x3F) << 25 | rs2 << 20
+            | (offset >> 1 & 0xF) << 8 | (offset >> 11 & 1) << 7)
+
+
+def encode_program(code, start=PROG_START):
+    """(program_memory, labels) of generated code: instruction tuples, .word values and label names"""
+    labels = {}
+    pc = start
+    for item in code:
+        if isinstance(item, str):
+            labels[item] = pc
+        else:
+            pc += 4
+    program_memory = {}
+    pc = start
+    for item in code:
+        if isinstance(item, str):
+            continue
+        program_memory[pc] = item if isinstance(item, int) else encode(item, pc, labels)
+        pc += 4
+    return program_memory, labels
+
+
+def register_usage(instruction):
+    """Return (destination, [sources]) register names of one instruction"""
+    clean = instruction.split("#")[0].strip()
+    if not clean or clean.endswith(":") or clean.upper().startswith(".WORD"):
+        return None, []
+    mnemonic, operands = parse_instruction(clean)
+    if mnemonic in ("AND", "OR"):
+        dest, sources = operands[0], operands[1:3]
+    elif mnemonic == "ORI":
+        dest, sources = operands[0], [operands[1]]
+    elif mnemonic == "LW":
+        dest, sources = operands[0], [operands[1].split("(")[1].rstrip(")")]
+    elif mnemonic == "SW":
+        dest, sources = None, [operands[0], operands[1].split("(")[1].rstrip(")")]
+    elif mnemonic in ("BLT", "BGE"):
+        dest, sources = None, operands[0:2]
+    else:
+        return None, []
+    if dest == "x0":
+        dest = None
+    return dest, [s for s in sources if s != "x0"]
+
+
+def has_data_hazard(lines):
+    """True if some instruction reads a register written fewer than HAZARD_GAP slots before"""
+    recent = [None] * (HAZARD_GAP - 1)
+    for line in lines:
+        clean = line.split("#")[0].strip()
+        if not clean or clean.endswith(":"):
+            continue
+        dest, sources = register_usage(clean)
+        if any(src in recent for src in sources):
+            return True
+        recent = recent[1:] + [dest]
+    return False
+
+
+# -------------------------
+# Differential execution
+# -------------------------
+
+def memory_image(program_memory, memory):
+    """PagedMemory holding the initial data and the program, shared copy-on-write by both models"""
+    image = PagedMemory()
+    for addr, value in memory.items():
+        image.write_word(addr, value)
+    for addr, word in program_memory.items():
+        image.write_word(addr, word)
+    return image
+
+
+def run_model(engine_class, image, program_memory, labels, max_cycles):
+    engine = engine_class()
+    engine.record_history = False
+    engine.memory = image.snapshot()
+    addresses = sorted(program_memory)
+    engine.set_code_region(addresses[0], addresses[-1] + 4)
+    engine.labels = labels
+    result = engine.run(max_cycles=max_cycles)
+    return engine, result
+
+
+def compare(case):
+    """Run a case on both models and return a list of differences (empty if they agree)"""
+    if case.program is not None:
+        program_memory, labels = case.program
+    else:
+        try:
+            program_memory, labels = assemble(list(enumerate(case.lines, start=1)))
+        except UriscvError as e:
+            return [f"assembly failed: {e}"]
+    if not program_memory:
+        return []
+
+    max_cycles = CYCLES_PER_LINE * max(1, len(case.lines)) * 8
+    image = memory_image(program_memory, case.memory)
+    pipe, pipe_result = run_model(PipelineEngine, image, program_memory, labels, max_cycles)
+    func, func_result = run_model(FunctionalSimulator, image, program_memory, labels, max_cycles)
+
+    differences = []
+    if pipe_result.status != func_result.status:
+        differences.append(f"status: pipelined={pipe_result.status} functional={func_result.status}")
+    if pipe_result.status != RunResult.COMPLETE or func_result.status != RunResult.COMPLETE:
+        return differences
+    if pipe.instructions_retired != func.instructions_retired:
+        differences.append(f"instructions: pipelined={pipe.instructions_retired} functional={func.instructions_retired}")
+    for i in range(1, 32):
+        if pipe.registers[i] != func.registers[i]:
+            differences.append(f"x{i}: pipelined=0x{pipe.registers[i]:08x} functional=0x{func.registers[i]:08x}")
+    for addr, mine, theirs in pipe.memory.diff_words(func.memory):
+        differences.append(f"mem[0x{addr:08x}]: pipelined=0x{mine:08x} functional=0x{theirs:08x}")
+    return differences
+
+
+def minimize(case):
+    """Shrink a mismatching case while it keeps mismatching and stays hazard-free"""
+    def still_fails(lines, memory):
+        return not has_data_hazard(lines) and bool(compare(FuzzCase(case.seed, lines, memory)))
+
+    lines = list(case.lines)
+    memory = dict(case.memory)
+    changed = True
+    while changed:
+        changed = False
+        # Replace instructions by NOPs (keeps every address and label offset)
+        for i, line in enumerate(lines):
+            if line == NOP_TEXT or line.endswith(":"):
+                continue
+            candidate = lines[:i] + [NOP_TEXT] + lines[i + 1:]
+            if still_fails(candidate, memory):
+                lines = candidate
+                changed = True
+        # Drop lines (NOPs, data words) outright; labels go in the final cleanup
+        i = 0
+        while i < len(lines):
+            if lines[i].endswith(":"):
+                i += 1
+                continue
+            candidate = lines[:i] + lines[i + 1:]
+            if still_fails(candidate, memory):
+                lines = candidate
+                changed = True
+            else:
+                i += 1
+        # Clear initial memory words
+        for addr in list(memory):
+            candidate = {a: v for a, v in memory.items() if a != addr}
+            if still_fails(lines, candidate):
+                memory = candidate
+                changed = True
+
+    # Remove labels nothing branches to any more
+    used = {line.replace(",", " ").split()[-1] for line in lines if line.split()[0].upper() in ("BLT", "BGE")}
+    cleaned = [line for line in lines if not line.endswith(":") or line[:-1] in used]
+    if still_fails(cleaned, memory):
+        lines = cleaned
+    return FuzzCase(case.seed, lines, memory)
+
+
+def check_seed(seed, length=24):
+    """Generate and compare one case; returns a Mismatch or None"""
+    case = ProgramGenerator(random.Random(seed), length=length).generate(seed)
+    differences = compare(case)
+    if not differences:
+        return None
+    return Mismatch(case, differences)
+
+
+def _check_seed_job(job):
+    seed, length = job
+    return check_seed(seed, length)
+
+
+def fuzz(count, seed=0, length=24, jobs=1, minimize_cases=True, on_mismatch=None):
+    """Fuzz `count` programs with seeds seed..seed+count-1
+
+    Returns (mismatches, programs_per_second). With jobs > 1 the cases are
+    spread over a process pool.
+    """
+    start = time.perf_counter()
+    work = [(s, length) for s in range(seed, seed + count)]
+    mismatches = []
+
+    if jobs > 1:
+        import multiprocessing
+        with multiprocessing.Pool(jobs) as pool:
+            results = pool.imap_unordered(_check_seed_job, work, chunksize=64)
+            mismatches = [m for m in results if m is not None]
+    else:
+        mismatches = [m for m in map(_check_seed_job, work) if m is not None]
+
+    elapsed = time.perf_counter() - start
+    mismatches.sort(key=lambda m: m.case.seed)
+    for mismatch in mismatches:
+        if minimize_cases:
+            mismatch.minimized = minimize(mismatch.case)
+        if on_mismatch is not None:
+            on_mismatch(mismatch)
+    return mismatches, count / elapsed if elapsed else 0.0
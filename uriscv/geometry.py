@@ -0,0 +1,136 @@
+from .errors import UriscvError
+
+# ============================================================
+# μRISCV pipeline geometry: stage description table of a pipeline variant
+# ============================================================
+
+# Stage description table of the classic pipeline: stage, latch it fills,
+# latch fields shown in the pipeline map (in map order), other map rows
+CLASSIC_STAGES = (
+    ("IF", "IF/ID", ("IR", "NPC"), ("PC",)),
+    ("ID", "ID/EX", ("A", "B", "IMM", "IR", "NPC"), ()),
+    ("EX", "EX/MEM", ("ALUOUTPUT", "IR", "B", "COND"), ()),
+    ("MEM", "MEM/WB", ("LMD", "IR", "ALUOUTPUT"), ("MEM[EX/MEM.ALUOUTPUT]",)),
+    ("WB", None, (), ("WB",)),
+)
+
+# Stages that may resolve branches
+BRANCH_STAGES = ("ID", "EX")
+
+
+class Stage:
+    """One row of a geometry's stage table"""
+
+    def __init__(self, name, latch, fields, extra_rows=(), cycles=1, resolves_branches=False):
+        self.name = name
+        # Pipeline register the stage fills (None for the last stage)
+        self.latch = latch
+        self.fields = fields
+        self.extra_rows = extra_rows
+        # Cycles a LW/SW spends in the stage
+        self.cycles = cycles
+        self.resolves_branches = resolves_branches
+
+    def rows(self):
+        """Pipeline map rows (pipeline_history keys) describing this stage"""
+        return [f"{self.latch}.{field}" for field in self.fields] + list(self.extra_rows)
+
+
+class PipelineGeometry:
+    """A variant of the 5-stage pipeline, described as a stage table
+
+    branch_stage is where BLT/BGE are resolved: in EX a taken branch costs
+    one freeze bubble; in ID it redirects the fetch of the same cycle, so it
+    costs none. mem_cycles is how long a LW/SW occupies MEM; the extra
+    cycles freeze the pipeline like a cache miss. merge_mem_wb combines MEM
+    and WB into one stage that writes the register file itself.
+    """
+
+    def __init__(self, branch_stage="EX", mem_cycles=1, merge_mem_wb=False):
+        if branch_stage not in BRANCH_STAGES:
+            raise UriscvError(f"branches are resolved in {' or '.join(BRANCH_STAGES)}, not '{branch_stage}'")
+        if mem_cycles < 1:
+            raise UriscvError("MEM takes at least one cycle")
+        self.branch_stage = branch_stage
+        self.mem_cycles = mem_cycles
+        self.merge_mem_wb = merge_mem_wb
+
+        self.stages = []
+        for name, latch, fields, extra_rows in CLASSIC_STAGES:
+            if merge_mem_wb and name == "WB":
+                # The combined stage keeps MEM's memory row and WB's register row
+                merged = self.stages.pop()
+                self.stages.append(Stage("MEM/WB", None, (), merged.extra_rows + extra_rows, merged.cycles))
+                continue
+            self.stages.append(Stage(
+                name, latch, fields, extra_rows,
+                cycles=mem_cycles if name == "MEM" else 1,
+                resolves_branches=name == branch_stage,
+            ))
+
+    @property
+    def name(self):
+        """Preset name, or the spec that parse_geometry accepts"""
+        for preset, geometry in PRESETS.items():
+            if geometry == self:
+                return preset
+        parts = []
+        if self.branch_stage != "EX":
+            parts.append(f"branch={self.branch_stage.lower()}")
+        if self.mem_cycles != 1:
+            parts.append(f"mem={self.mem_cycles}")
+        if self.merge_mem_wb:
+            parts.append("merge-wb")
+        return ",".join(parts)
+
+    def __eq__(self, other):
+        return isinstance(other, PipelineGeometry) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def key(self):
+        return (self.branch_stage, self.mem_cycles, self.merge_mem_wb)
+
+    def table_rows(self):
+        """The pipeline map rows, stage by stage"""
+        return [row for stage in self.stages for row in stage.rows()]
+
+    def describe(self):
+        """Stages in order, e.g. 'IF ID EX* MEM(2) WB' (* resolves branches)"""
+        return " ".join(
+            stage.name + ("*" if stage.resolves_branches else "") + (f"({stage.cycles})" if stage.cycles > 1 else "")
+            for stage in self.stages
+        )
+
+
+CLASSIC = PipelineGeometry()
+
+PRESETS = {
+    "classic": CLASSIC,
+    "mem2": PipelineGeometry(mem_cycles=2),
+    "branch-id": PipelineGeometry(branch_stage="ID"),
+    "merge-wb": PipelineGeometry(merge_mem_wb=True),
+}
+
+
+def parse_geometry(text):
+    """A preset name, or comma separated options: branch=id|ex, mem=N, merge-wb"""
+    text = text.strip().lower()
+    if text in PRESETS:
+        return PRESETS[text]
+    options = {}
+    for part in text.split(","):
+        key, _, value = part.strip().partition("=")
+        if key == "branch" and value:
+            options["branch_stage"] = value.upper()
+        elif key == "mem" and value.isdigit():
+            options["mem_cycles"] = int(value)
+        elif key == "merge-wb" and not value:
+            options["merge_mem_wb"] = True
+        else:
+            raise UriscvError(
+                f"Unknown pipeline option '{part.strip()}' (use {', '.join(PRESETS)}, "
+                "or a list of branch=id|ex, mem=N, merge-wb)"
+            )
+    return PipelineGeometry(**options)
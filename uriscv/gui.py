@@ -0,0 +1,1130 @@
+import tkinter as tk
+from tkinter import ttk, scrolledtext, messagebox, filedialog, Button
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .analysis import analyze, annotate
+from .checkpoint import save_checkpoint, load_checkpoint
+from .profiler import Profiler
+from .memtrace import MemoryTrace
+from .assembler import IncrementalAssembler, generate_opcodes, line_addresses
+from .engine import PipelineEngine, RunResult
+from .errors import UriscvError
+from .geometry import CLASSIC, PRESETS
+from .images import load_image, dump_image, format_for_path
+from .superscalar import DualIssueEngine, lane_row
+
+# ============================================================
+# μRISCV Project - Tkinter front end
+# ============================================================
+
+# Color palette (editable). Each unique instruction IR will be assigned a color from this palette in order.
+PALETTE = [
+    "#FFB3BA", "#FFDFBA", "#FFFFBA", "#BAFFC9", "#BAE1FF",
+    "#D7BAFF", "#FFC2E2", "#C2FFD8", "#FCE2C6", "#BDE0FE",
+    "#F7D6E0", "#DFF7E0", "#E0F7F3", "#F0E6F6", "#E6F0E6",
+    "#F0E6E6", "#E6EAF0", "#FFF5BA", "#E8FFBA", "#BACBFF"
+]
+
+
+# Editing pauses this long before the program is re-validated in the background
+VALIDATE_DELAY_MS = 300
+VALIDATE_POLL_MS = 20
+ERROR_BG = "#FFE0E0"
+
+
+# Pipeline State panel headings, in engine.latches() order
+STAGE_TITLES = ("IF/ID", "ID/EX", "EX/MEM", "MEM/WB", "WB")
+STAGE_TITLES += tuple(f"{title} (lane 2)" for title in STAGE_TITLES)
+# Pipeline map rows colored by instruction, in both lanes
+IR_ROWS = ('IF/ID.IR', 'ID/EX.IR', 'EX/MEM.IR', 'MEM/WB.IR')
+IR_ROWS += tuple(lane_row(row) for row in IR_ROWS)
+# Pipeline choice that swaps in the dual-issue engine (classic stages, two lanes)
+DUAL_ISSUE = "dual-issue"
+# Up to this many changed lines are patched in place instead of redrawing the panel
+PIPELINE_PATCH_LIMIT = 4
+
+
+def value_column(line):
+    """Where the value starts in a Pipeline State line ("  NAME: value"); 0 for headings"""
+    return line.find(": ") + 2 if line.startswith("  ") else 0
+
+
+def heat_color(fraction):
+    """Editor background for a line with this fraction of the hottest line's cycles"""
+    level = int(255 - 175 * max(0.0, min(fraction, 1.0)))
+    return f"#ff{level:02x}{level:02x}"
+
+
+class RiscVGUI:
+    def __init__(self, root):
+        startup_begin = time.perf_counter()
+        self.reg_entries = []
+        self.reg_dec_labels = []
+        self.entry_row_count = 0
+        self.entry_widgets = []
+        self.line_labels = []
+        self.note_labels = []
+        self.root = root
+        self.root.title("μRISCV Assembler Simulator - Pipeline Freeze")
+        self.root.geometry("1300x780")
+
+        # Simulation state (registers, memory, pipeline registers) lives in the engine
+        self.engine = PipelineEngine(verbose=True)
+
+        # map IR -> color
+        self.ir_color_map = {}
+        self.next_color_index = 0
+
+        self.is_running = False
+
+        # Background validation/assembly of the editor contents
+        self.assembler = IncrementalAssembler()
+        self.assembly_worker = ThreadPoolExecutor(max_workers=1)
+        self.edit_generation = 0
+        self.validate_job = None
+        self.error_lines = set()
+
+        self.memory_entries = {}
+        self.memory_heat_labels = {}
+        self.memory_locked = False
+        self.opcode_lines = None
+
+        # Pipeline map table geometry
+        self.max_cycles_display = 20
+        self.table_cell_w = 120
+        self.table_cell_h = 26
+        # Rows follow the engine's stage table (see change_pipeline)
+        self.table_rows = self.engine.map_rows()
+
+        self.create_buttons()
+        self.notebook = ttk.Notebook(root)
+        self.notebook.pack(fill='both', expand=True, padx=10, pady=10)
+
+        # Tabs are only populated the first time they are selected
+        self.lazy_tabs = {}
+        self.add_lazy_tab('program', "Program Input", self.create_program_tab, None)
+        self.add_lazy_tab('registers', "Register Tab", self.create_register_tab, self.update_register_display)
+        self.add_lazy_tab('memory', "Memory Input", self.create_memory_tab, self.refresh_memory_entries)
+        self.add_lazy_tab('opcode', "Opcode Output", self.create_opcode_tab, self.render_opcodes)
+        self.add_lazy_tab('pipeline_state', "Pipeline State", self.create_pipeline_state_tab, self.update_pipeline_display)
+        self.add_lazy_tab('pipeline_table', "Pipeline Map Table", self.create_pipeline_table_tab, self.update_pipeline_table, bg="#F8F8F8", bd=0)
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.on_tab_changed()
+
+        self.status_var = tk.StringVar()
+        status_bar = ttk.Label(root, textvariable=self.status_var, relief='sunken')
+        status_bar.pack(side='bottom', fill='x')
+
+        self.startup_seconds = time.perf_counter() - startup_begin
+        self.status_var.set(f"μRISCV - Pipeline Freeze mode | Color-coded pipeline map | Startup {self.startup_seconds * 1000:.0f} ms")
+
+    # -------------------------
+    # UI Creation
+    # -------------------------
+    def add_lazy_tab(self, name, text, build, refresh, bg="#D3D3D3", bd=3):
+        """Add an empty notebook tab whose widgets are built on first selection"""
+        frame = tk.Frame(self.notebook, bg=bg, bd=bd)
+        self.notebook.add(frame, text=text)
+        self.lazy_tabs[name] = {'frame': frame, 'build': build, 'refresh': refresh, 'built': False}
+
+    def on_tab_changed(self, event=None):
+        """Build the selected tab if needed and bring its contents up to date"""
+        selected = self.notebook.select()
+        for tab in self.lazy_tabs.values():
+            if str(tab['frame']) != selected:
+                continue
+            if not tab['built']:
+                tab['build'](tab['frame'])
+                tab['built'] = True
+            if tab['refresh']:
+                tab['refresh']()
+            return
+
+    def is_tab_visible(self, name):
+        """True if the named tab is built and currently selected"""
+        tab = self.lazy_tabs.get(name)
+        if tab is None or not tab['built']:
+            return False
+        return self.notebook.select() == str(tab['frame'])
+
+    def create_program_tab(self, frame):
+        self.frame = frame
+        self.canvas = tk.Canvas(self.frame, bg="#D3D3D3", highlightthickness=0)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.v_scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.canvas.yview)
+        self.v_scrollbar.pack(side="right", fill="y")
+        self.canvas.configure(yscrollcommand=self.v_scrollbar.set)
+        self.inner_frame = tk.Frame(self.canvas, bg="#D3D3D3")
+        self.canvas_window = self.canvas.create_window((0, 0), window=self.inner_frame, anchor="nw")
+        self.inner_frame.columnconfigure(1, weight=1)
+        self.inner_frame.bind("<Configure>", self._on_frame_configure)
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        self.add_entry(event=None)
+
+    def _on_frame_configure(self, event):
+        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+
+    def _on_canvas_configure(self, event):
+        self.canvas.itemconfig(self.canvas_window, width=self.canvas.winfo_width())
+
+    def create_register_tab(self, frame):
+        registers = self.engine.registers
+        self.canvas1 = tk.Canvas(frame, bg="#D3D3D3", highlightthickness=0)
+        self.canvas1.pack(side="left", fill="both", expand=True)
+        reg_scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.canvas1.yview)
+        reg_scrollbar.pack(side="right", fill="y")
+        self.canvas1.configure(yscrollcommand=reg_scrollbar.set)
+        self.innerFrame = tk.Frame(self.canvas1, bg="#D3D3D3")
+        self.canvas1.create_window((0, 0), window=self.innerFrame, anchor="nw")
+        self.innerFrame.columnconfigure(1, weight=1)
+
+        # Headers
+        ttk.Label(self.innerFrame, text="Reg", font=('Arial', 10, 'bold'), anchor="center").grid(row=0, column=0, padx=5, pady=5, sticky='ew')
+        ttk.Label(self.innerFrame, text="Value (Hex)", font=('Arial', 10, 'bold'), anchor="center").grid(row=0, column=1, pady=5, sticky='ew')
+        ttk.Label(self.innerFrame, text="Value (Dec)", font=('Arial', 10, 'bold'), anchor="center").grid(row=0, column=2, pady=5, sticky='ew')
+
+        self.reg_entries = []
+        self.reg_dec_labels = []
+
+        for i in range(32):
+            reg_name = f"x{i}"
+            ttk.Label(self.innerFrame, text=reg_name).grid(row=i + 1, column=0, padx=5, sticky='w')
+
+            # Hex entry
+            entry = tk.Entry(self.innerFrame, width=15)
+            entry.grid(row=i + 1, column=1, padx=5, pady=1)
+            entry.insert(0, f"0x{registers[i]:08x}")
+            entry.config(state='readonly', bg='#D3D3D3' if i == 0 else 'white')
+            self.reg_entries.append(entry)
+
+            # Decimal label
+            dec_label = ttk.Label(self.innerFrame, text=str(registers[i]))
+            dec_label.grid(row=i + 1, column=2, padx=5, pady=1)
+            self.reg_dec_labels.append(dec_label)
+
+        # PC display
+        ttk.Label(self.innerFrame, text="PC").grid(row=33, column=0, padx=5, sticky='w')
+        self.pc_entry = tk.Entry(self.innerFrame, width=15)
+        self.pc_entry.grid(row=33, column=1, padx=5, pady=1)
+        self.pc_entry.insert(0, f"0x{self.engine.pc:08x}")
+        self.pc_entry.config(state='readonly')
+
+        self.innerFrame.bind("<Configure>", lambda e: self.canvas1.configure(scrollregion=self.canvas1.bbox("all")))
+
+    def create_memory_tab(self, frame):
+        self.memory_frame = frame
+        self.create_memory_table(self.memory_frame)
+
+        goto_frame = tk.Frame(self.memory_frame, bg="#D3D3D3")
+        goto_frame.pack(fill='x', padx=10, pady=5)
+        tk.Label(goto_frame, text="GOTO Address (hex):", bg="#D3D3D3").pack(side='left')
+        self.goto_entry = tk.Entry(goto_frame, width=10)
+        self.goto_entry.pack(side='left', padx=5)
+        self.goto_entry.insert(0, "0x0000")
+        goto_button = tk.Button(goto_frame, text="GOTO", command=self.goto_memory)
+        goto_button.pack(side='left', padx=5)
+        tk.Button(goto_frame, text="Save Image...", command=self.save_memory_image).pack(side='right', padx=5)
+        tk.Button(goto_frame, text="Load Image...", command=self.load_memory_image).pack(side='right', padx=5)
+        tk.Button(goto_frame, text="Save Trace...", command=self.save_memory_trace).pack(side='right', padx=5)
+        tk.Button(goto_frame, text="Access Heat", command=self.show_access_heat).pack(side='right', padx=5)
+
+    def create_memory_table(self, parent):
+        table_frame = tk.Frame(parent, bg="#D3D3D3", bd=3)
+        table_frame.pack(fill='both', expand=True, padx=10, pady=10)
+
+        canvas = tk.Canvas(table_frame, bg="#D3D3D3")
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=canvas.yview)
+        scrollable_frame = tk.Frame(canvas, bg="#D3D3D3")
+
+        scrollable_frame.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        headers = ["Address", "Value", "Accesses"]
+        for col, header in enumerate(headers):
+            label = tk.Label(scrollable_frame, text=header, font=('Arial', 10, 'bold'), bg="#D3D3D3", width=20)
+            label.grid(row=0, column=col, padx=5, pady=2)
+
+        # Word-aligned addresses
+        row_idx = 1
+        for addr in range(self.engine.memory_low, self.engine.memory_high + 1, 4):
+            addr_label = tk.Label(scrollable_frame, text=f"0x{addr:04x}", bg="#D3D3D3", width=20)
+            addr_label.grid(row=row_idx, column=0, padx=5, pady=1)
+            entry = tk.Entry(scrollable_frame, width=20)
+            entry.grid(row=row_idx, column=1, padx=5, pady=1)
+            entry.insert(0, f"0x{self.engine.read_word(addr):08x}")
+            self.memory_entries[addr] = entry
+            entry.bind('<FocusOut>', lambda e, addr=addr: self.update_memory_value(addr))
+            heat_label = tk.Label(scrollable_frame, text="", bg="#D3D3D3", width=20, anchor='w')
+            heat_label.grid(row=row_idx, column=2, padx=5, pady=1)
+            self.memory_heat_labels[addr] = heat_label
+            row_idx += 1
+
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        self.mem_canvas = canvas
+        self.mem_scrollable_frame = scrollable_frame
+
+    def goto_memory(self):
+        memory_low = self.engine.memory_low
+        memory_high = self.engine.memory_high
+        try:
+            addr_str = self.goto_entry.get().strip()
+            addr = int(addr_str, 16)
+            if addr < memory_low or addr > memory_high:
+                messagebox.showerror("Error", f"Address must be in range 0x{memory_low:04x}-0x{memory_high:04x}")
+                return
+            if addr % 4 != 0:
+                messagebox.showwarning("Warning", "Address not word-aligned; navigating to nearest word.")
+                addr = addr - (addr % 4)
+            if addr in self.memory_entries:
+                widget = self.memory_entries[addr]
+                widget.focus_set()
+                try:
+                    self.mem_canvas.yview_moveto(widget.winfo_y() / max(1, self.mem_scrollable_frame.winfo_height()))
+                except Exception:
+                    pass
+        except ValueError:
+            messagebox.showerror("Error", "Invalid address format")
+
+    def load_memory_image(self):
+        """Load a raw/Intel HEX/ELF file into memory; raw files go to the GOTO address"""
+        if self.memory_locked:
+            messagebox.showwarning("Memory Locked", "Reset the simulation before loading a memory image")
+            return
+        path = filedialog.askopenfilename(
+            title="Load memory image",
+            filetypes=[("Memory images", "*.bin *.hex *.ihex *.elf"), ("All files", "*")],
+        )
+        if not path:
+            return
+        try:
+            base = int(self.goto_entry.get().strip(), 16)
+            image = load_image(self.engine, path, base=base)
+        except (ValueError, UriscvError, OSError) as e:
+            messagebox.showerror("Error", f"Could not load {path}: {e}")
+            return
+        self.refresh_memory_entries()
+        self.status_var.set(f"Loaded {image.describe()}")
+
+    def save_memory_image(self):
+        """Write the displayed memory window to a raw binary or Intel HEX file"""
+        path = filedialog.asksaveasfilename(
+            title="Save memory image",
+            filetypes=[("Raw binary", "*.bin"), ("Intel HEX", "*.hex")],
+            defaultextension=".bin",
+        )
+        if not path:
+            return
+        try:
+            dump_image(self.engine, path, self.engine.memory_low, self.engine.memory_high + 1, format_for_path(path))
+        except (UriscvError, OSError) as e:
+            messagebox.showerror("Error", f"Could not save {path}: {e}")
+            return
+        self.status_var.set(f"Saved 0x{self.engine.memory_low:04x}-0x{self.engine.memory_high:04x} to {path}")
+
+    def update_memory_value(self, address):
+        try:
+            entry = self.memory_entries[address]
+            value_str = entry.get().strip()
+            if value_str.startswith('0x'):
+                value = int(value_str, 16)
+            else:
+                value = int(value_str)
+            if value < 0 or value > 0xFFFFFFFF:
+                raise ValueError("Value out of range")
+            if not self.engine.write_word(address, value):
+                raise ValueError("Invalid memory address for write")
+            entry.delete(0, tk.END)
+            entry.insert(0, f"0x{value:08x}")
+        except Exception:
+            entry.delete(0, tk.END)
+            entry.insert(0, f"0x{self.engine.read_word(address):08x}")
+            messagebox.showerror("Error", "Invalid memory value or address")
+
+    def update_memory_display(self):
+        # Once the simulator has run a cycle the table is read-only until a reset
+        self.memory_locked = self.engine.cycle_count > 0
+        if self.is_tab_visible('memory'):
+            self.refresh_memory_entries()
+
+    def refresh_memory_entries(self):
+        for addr, entry in self.memory_entries.items():
+            entry.config(state='normal')
+            entry.delete(0, tk.END)
+            entry.insert(0, f"0x{self.engine.read_word(addr):08x}")
+            entry.config(state='readonly' if self.memory_locked else 'normal')
+
+    def reset_simulation(self):
+        """Reset the entire simulation to initial state"""
+        self.engine.reset()
+        self.clear_heat()
+        # Code shares memory with data, so the reset wiped it; reinstall the editor program
+        if self.collect_program_lines():
+            self.load_program_to_memory()
+        self.ir_color_map.clear()
+        self.next_color_index = 0
+        self.is_running = False
+
+        self.update_register_display()
+        self.update_memory_display()
+        self.update_pipeline_display()
+        self.update_pipeline_table()
+        self.update_pc_display()
+        self.status_var.set("Simulation reset")
+        messagebox.showinfo("Reset", "Simulation has been reset")
+
+    # -------------------------
+    # Register Display Methods
+    # -------------------------
+
+    def update_register_display(self):
+        """Update all register displays from the engine's register file"""
+        if not self.is_tab_visible('registers'):
+            return
+        registers = self.engine.registers
+        for i in range(32):
+            self.reg_entries[i].config(state='normal')
+            self.reg_entries[i].delete(0, tk.END)
+            self.reg_entries[i].insert(0, f"0x{registers[i]:08x}")
+            self.reg_entries[i].config(state='readonly')
+
+            # Update decimal label
+            self.reg_dec_labels[i].config(text=str(registers[i]))
+
+        # Update PC display
+        self.update_pc_display()
+
+    def update_register_display_from_file(self):
+        """Update register display directly from the engine's register file"""
+        if not self.is_tab_visible('registers'):
+            return
+        registers = self.engine.registers
+        for i in range(32):
+            # Update hex entry
+            self.reg_entries[i].config(state='normal')
+            self.reg_entries[i].delete(0, tk.END)
+            self.reg_entries[i].insert(0, f"0x{registers[i]:08x}")
+            if i == 0:
+                self.reg_entries[i].config(state='readonly', bg='#E0E0E0')
+            else:
+                self.reg_entries[i].config(state='readonly', bg='white')
+
+            # Update decimal label
+            self.reg_dec_labels[i].config(text=str(registers[i]))
+
+    # -------------------------
+    # Pipeline stepping
+    # -------------------------
+
+    def step_execution(self):
+        """Execute one pipeline cycle"""
+        # The first step runs what is in the editor, as Run does
+        if self.engine.cycle_count == 0 and self.collect_program_lines():
+            if not self.load_program_to_memory():
+                return
+            self.engine.reset_pipeline()
+        if not self.engine.has_program():
+            messagebox.showwarning("No Program", "No valid program loaded")
+            return
+
+        primed = self.engine.step()
+        self.after_cycle(primed)
+
+        if not primed and self.engine.is_program_complete():
+            self.finalize_execution()
+
+    def after_cycle(self, primed):
+        """Refresh the displays after the engine advanced one cycle"""
+        engine = self.engine
+        if engine.pipeline_history:
+            self.assign_ir_colors(engine.pipeline_history[-1])
+
+        if primed:
+            self.update_pipeline_display()
+            self.update_pipeline_table()
+            self.update_pc_display()
+            self.status_var.set(f"Cycle: {engine.cycle_count} - Pipeline primed")
+            return
+
+        # Update displays
+        self.update_register_display_from_file()
+        self.update_memory_display()
+        self.update_pipeline_display()
+        self.update_pipeline_table()
+
+        if engine.loop_report:
+            self.is_running = False
+            self.status_var.set(f"Stopped at cycle {engine.cycle_count}: non-progressing loop (period {engine.loop_period})")
+        else:
+            self.status_var.set(f"Cycle: {engine.cycle_count} - PC: 0x{engine.pc:04x}")
+
+    def assign_ir_colors(self, snap):
+        """Assign colors for new instruction IRs"""
+        for key in IR_ROWS:
+            val = snap.get(key, "")
+            if val and val not in self.ir_color_map:
+                color = PALETTE[self.next_color_index % len(PALETTE)]
+                self.ir_color_map[val] = color
+                self.next_color_index += 1
+
+    def finalize_execution(self):
+        """Final steps after program completion"""
+        instructions = self.collect_program_lines()
+
+        if instructions:
+            opcodes = generate_opcodes(instructions)
+            self.display_opcodes(opcodes)
+            self.notebook.select(3)
+
+        self.status_var.set("Execution completed - Opcodes generated")
+        self.is_running = False
+        self.runButton["state"] = "disabled"
+        self.stepButton["state"] = "disabled"
+
+    def update_pc_display(self):
+        """Update PC display in register tab"""
+        if not self.is_tab_visible('registers'):
+            return
+        self.pc_entry.config(state='normal')
+        self.pc_entry.delete(0, tk.END)
+        self.pc_entry.insert(0, f"0x{self.engine.pc:08x}")
+        self.pc_entry.config(state='readonly')
+
+    def pipeline_display_lines(self):
+        """Lines of the Pipeline State panel for the engine's current latches"""
+        engine = self.engine
+        lines = [
+            "μRISCV PIPELINE STATE", "=" * 70,
+            f"Cycle: {engine.cycle_count} | PC: 0x{engine.pc:08x}", "=" * 70,
+        ]
+        for stage_name, latch in zip(STAGE_TITLES, engine.latches()):
+            lines.append("")
+            lines.append(f"{stage_name}:")
+            for reg, value in latch.items():
+                if isinstance(value, int):
+                    display_value = f"0x{value:08x}" if value != 0 else "0x00000000"
+                else:
+                    display_value = str(value)
+                lines.append(f"  {reg}: {display_value}")
+        return lines
+
+    def update_pipeline_display(self):
+        """Update pipeline state display (textual)
+
+        Values that changed since the last update are highlighted. A few
+        changes are patched in place; otherwise the panel is rewritten with a
+        single insert of tagged segments. Nothing is done while the tab is hidden.
+        """
+        if not self.is_tab_visible('pipeline_state'):
+            return
+        lines = self.pipeline_display_lines()
+        previous = self.pipeline_lines
+        text = self.pipeline_text
+        if previous is not None and len(previous) != len(lines):
+            previous = None
+        changed = [] if previous is None else [row for row, (old, new) in enumerate(zip(previous, lines)) if old != new]
+        if previous is not None and not changed:
+            return
+
+        text.config(state=tk.NORMAL)
+        if previous is not None and len(changed) <= PIPELINE_PATCH_LIMIT:
+            text.tag_remove('changed', 1.0, tk.END)
+            for row in changed:
+                new = lines[row]
+                column = value_column(new)
+                text.delete(f"{row + 1}.{column}", f"{row + 1}.end")
+                text.insert(f"{row + 1}.{column}", new[column:], 'changed')
+        else:
+            # Alternate (text, tags) segments so the whole panel is one insert call
+            segments = []
+            plain = []
+            changed_rows = set(changed)
+            for row, line in enumerate(lines):
+                if row in changed_rows:
+                    column = value_column(line)
+                    plain.append(line[:column])
+                    segments += ["".join(plain), (), line[column:], ('changed',)]
+                    plain = ["\n"]
+                else:
+                    plain.append(line + "\n")
+            segments += ["".join(plain), ()]
+            top = text.yview()[0]
+            text.delete(1.0, tk.END)
+            text.insert(tk.END, *segments)
+            text.yview_moveto(top)
+        text.config(state=tk.DISABLED)
+        self.pipeline_lines = lines
+
+    # -------------------------
+    # Pipeline Table Tab (detailed)
+    # -------------------------
+    def create_pipeline_table_tab(self, frame):
+        """Create a tab that visualizes pipeline progress as a table"""
+        self.pipeline_table_frame = frame
+
+        control_frame = tk.Frame(self.pipeline_table_frame)
+        control_frame.pack(fill='x', pady=5)
+        tk.Button(control_frame, text="Clear Table", command=self.clear_pipeline_table).pack(side='right', padx=5)
+
+        self.table_canvas = tk.Canvas(self.pipeline_table_frame, bg='white', height=420)
+        self.table_canvas.pack(fill='both', expand=True, padx=10, pady=10)
+
+        legend = tk.Label(self.pipeline_table_frame, text="Legend: each color = one instruction. Rows correspond to pipeline fields (IF/ID.IR, IF/ID.NPC, PC, ID/EX.*, EX/MEM.*, MEM/WB.*, MEM[..], WB).", bg="#F8F8F8", anchor='w', justify='left')
+        legend.pack(fill='x')
+
+    def clear_pipeline_table(self):
+        self.engine.pipeline_history.clear()
+        self.ir_color_map.clear()
+        self.next_color_index = 0
+        self.engine.cycle_count = 0
+        if self.lazy_tabs['pipeline_table']['built']:
+            self.table_canvas.delete('all')
+
+    def update_pipeline_table(self):
+        """Redraw the pipeline table from the recorded pipeline_history"""
+        if not self.is_tab_visible('pipeline_table'):
+            return
+        pipeline_history = self.engine.pipeline_history
+        self.table_canvas.delete('all')
+
+        cols = max(1, min(self.max_cycles_display, len(pipeline_history)))
+        headers = ['Stage'] + [f'cycle {i+1}' for i in range(cols)]
+
+        # Draw headers
+        for c, h in enumerate(headers):
+            x0 = c * self.table_cell_w
+            y0 = 0
+            x1 = x0 + self.table_cell_w
+            y1 = y0 + self.table_cell_h
+            self.table_canvas.create_rectangle(x0, y0, x1, y1, fill='#4E69A2', outline='black')
+            self.table_canvas.create_text(x0 + 5, y0 + 3, anchor='nw', text=h, font=('Arial', 10, 'bold'), fill='white')
+
+        # Draw rows
+        for r, row in enumerate(self.table_rows):
+            for c in range(cols + 1):
+                x0 = c * self.table_cell_w
+                y0 = (r + 1) * self.table_cell_h
+                x1 = x0 + self.table_cell_w
+                y1 = y0 + self.table_cell_h
+
+                if c == 0:
+                    self.table_canvas.create_rectangle(x0, y0, x1, y1, fill='#9BB0E3', outline='black')
+                    self.table_canvas.create_text(x0 + 5, y0 + 3, anchor='nw', text=row, font=('Arial', 9, 'bold'))
+                else:
+                    self.table_canvas.create_rectangle(x0, y0, x1, y1, fill='white', outline='black')
+                    hist_idx = c - 1
+                    if hist_idx < len(pipeline_history):
+                        snap = pipeline_history[hist_idx]
+                        cell_value = snap.get(row, "")
+
+                        # Special handling for ID/EX.IMM - show both decimal and hex
+                        if row == 'ID/EX.IMM' and cell_value:
+                            try:
+                                imm_val = int(cell_value)
+                                if imm_val != 0:
+                                    cell_value = f"{imm_val} (0x{imm_val & 0xFFFFFFFF:08x})"
+                            except ValueError:
+                                pass
+
+                        # Color IR-containing rows
+                        if row in IR_ROWS and cell_value:
+                            color = self.ir_color_map.get(cell_value, None)
+                            if not color:
+                                color = PALETTE[self.next_color_index % len(PALETTE)]
+                                self.ir_color_map[cell_value] = color
+                                self.next_color_index += 1
+                            self.table_canvas.create_rectangle(x0 + 2, y0 + 2, x1 - 2, y1 - 2, fill=color, outline='black')
+                            self.table_canvas.create_text(x0 + 6, y0 + 4, anchor='nw', text=cell_value, font=('Courier', 9))
+                        else:
+                            if cell_value:
+                                self.table_canvas.create_text(x0 + 6, y0 + 4, anchor='nw', text=cell_value, font=('Courier', 9))
+
+    # -------------------------
+    # Program Input and Validation Methods
+    # -------------------------
+
+    def hit_enter(self, event):
+        current_entry = event.widget
+        try:
+            widget_index = self.entry_widgets.index(current_entry)
+        except ValueError:
+            return "break"
+        last_index = len(self.entry_widgets) - 1
+        if widget_index == last_index:
+            self.add_entry(event)
+            self.canvas.yview_moveto(1.0)
+        elif (widget_index + 1) < len(self.entry_widgets):
+            self.entry_widgets[widget_index + 1].focus_set()
+        return "break"
+
+    def hit_backspace(self, event):
+        current_entry = event.widget
+        self.on_edit(event)
+        try:
+            widget_index = self.entry_widgets.index(current_entry)
+        except ValueError:
+            return
+        current_text = current_entry.get()
+        if widget_index != 0 and not current_text:
+            self.entry_widgets[widget_index - 1].focus_set()
+            current_entry.destroy()
+            self.line_labels[widget_index].destroy()
+            self.note_labels[widget_index].destroy()
+            del self.entry_widgets[widget_index]
+            del self.line_labels[widget_index]
+            del self.note_labels[widget_index]
+            for i in range(len(self.entry_widgets)):
+                self.line_labels[i].config(text=str(i + 1))
+            self.inner_frame.update_idletasks()
+            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+            return "break"
+        return
+
+    def add_entry(self, event):
+        self.entry_row_count += 1
+        current_grid_row = self.entry_row_count
+        visible_line_num = len(self.entry_widgets) + 1
+        line_label = tk.Label(self.inner_frame, text=str(visible_line_num), bg="#D3D3D3")
+        line_label.grid(row=current_grid_row, column=0, sticky='w')
+        self.new_entry = tk.Entry(self.inner_frame, bg="white", width=100)
+        self.new_entry.grid(row=current_grid_row, column=1, padx=5, pady=2, sticky='ew')
+        note_label = tk.Label(self.inner_frame, text="", bg="#D3D3D3", anchor='w', font=("Courier New", 9))
+        note_label.grid(row=current_grid_row, column=2, sticky='w')
+        self.entry_widgets.append(self.new_entry)
+        self.line_labels.append(line_label)
+        self.note_labels.append(note_label)
+        self.new_entry.focus_set()
+        self.new_entry.bind("<Return>", self.hit_enter)
+        self.new_entry.bind("<BackSpace>", self.hit_backspace)
+        self.new_entry.bind("<Delete>", self.on_edit)
+        self.new_entry.bind("<Key>", self.on_edit)
+        self.inner_frame.update_idletasks()
+        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+
+    def on_edit(self, event=None):
+        """Disable Run and Step until the edited program has been re-validated (debounced)"""
+        self.runButton["state"] = "disabled"
+        self.stepButton["state"] = "disabled"
+        self.edit_generation += 1
+        if self.validate_job is not None:
+            self.root.after_cancel(self.validate_job)
+        self.validate_job = self.root.after(VALIDATE_DELAY_MS, self.start_validation)
+
+    def start_validation(self):
+        """Hand the current lines to the assembler thread; the Tk thread only polls for the result"""
+        self.validate_job = None
+        future = self.assembly_worker.submit(self.assembler.update, self.collect_program_lines())
+        self.root.after(VALIDATE_POLL_MS, self.finish_validation, future, self.edit_generation)
+
+    def finish_validation(self, future, generation):
+        if not future.done():
+            self.root.after(VALIDATE_POLL_MS, self.finish_validation, future, generation)
+            return
+        # A newer edit has its own pass scheduled
+        if generation != self.edit_generation:
+            return
+        result = future.result()
+        self.show_errors(result.errors)
+        if result.errors:
+            self.status_var.set(f"{len(result.errors)} error(s)")
+        elif result.program_memory:
+            self.runButton["state"] = "normal"
+            self.stepButton["state"] = "normal"
+            self.status_var.set(f"Assembled {len(result.program_memory)} instruction(s)")
+
+    def show_errors(self, errors):
+        """Mark the editor lines in {line_num: message} and unmark lines that were fixed"""
+        for line_num in self.error_lines - errors.keys():
+            if line_num <= len(self.entry_widgets):
+                self.entry_widgets[line_num - 1].config(bg="white")
+                self.note_labels[line_num - 1].config(text="", fg="black")
+        for line_num, message in errors.items():
+            self.entry_widgets[line_num - 1].config(bg=ERROR_BG)
+            self.note_labels[line_num - 1].config(text=message.split(": ", 1)[1], fg="#B00000")
+        self.error_lines = set(errors)
+
+    def collect_program_lines(self):
+        """Return (line_num, text) for every non-empty program line"""
+        lines = []
+        for i, entry in enumerate(self.entry_widgets):
+            text = entry.get().strip()
+            if text:
+                lines.append((i + 1, text))
+        return lines
+
+    def check_program(self):
+        """Validate the program and enable run/step buttons if valid"""
+        instructions = self.collect_program_lines()
+        if not instructions:
+            messagebox.showwarning("No Program", "Please enter some instructions to check.")
+            return
+        # Usually already done by the background pass, in which case this is a lookup
+        result = self.assembler.update(instructions)
+        self.show_errors(result.errors)
+        errors = [result.errors[line_num] for line_num in sorted(result.errors)]
+        valid_instructions = len(instructions) - len(errors)
+        if errors:
+            result_message = f"VALIDATION FAILED\n\nErrors found: {len(errors)}\nValid instructions: {valid_instructions}\n\nERROR DETAILS:\n" + "\n".join(errors)
+            messagebox.showerror("Program Check Results", result_message)
+            self.status_var.set(f"Check failed: {len(errors)} error(s) found")
+            self.runButton["state"] = "disabled"
+            self.stepButton["state"] = "disabled"
+        else:
+            result_message = f"PROGRAM VALID\n\nValid instructions: {valid_instructions}\nAll instructions are syntactically correct!"
+            messagebox.showinfo("Program Check Results", result_message)
+            self.status_var.set(f"Check passed: {valid_instructions} valid instruction(s)")
+            self.runButton["state"] = "active"
+            self.stepButton["state"] = "active"
+            self.load_program_to_memory()
+
+    # -------------------------
+    # Assembler
+    # -------------------------
+
+    def load_program_to_memory(self):
+        """Assemble the editor contents and load them into the engine's program memory"""
+        self.engine.load_program({})
+
+        lines = self.collect_program_lines()
+        if not lines:
+            print("No lines to load")
+            return False
+
+        print(f"Loading {len(lines)} lines into program memory...")
+        result = self.assembler.update(lines)
+        if not result.ok:
+            error = result.errors[min(result.errors)]
+            print(f"Error encoding {error}")
+            messagebox.showerror("Encoding Error", error)
+            return False
+
+        program_memory = result.program_memory
+        self.engine.load_program(program_memory, result.labels)
+        Profiler.for_engine(self.engine)
+        MemoryTrace.for_engine(self.engine)
+        print(f"Successfully loaded {len(program_memory)} instructions")
+        self.debug_program_memory()
+        return True
+
+    def analyze_program(self):
+        """Estimate cycles, CPI and RAW hazards without simulating, annotating each line"""
+        if not self.load_program_to_memory():
+            messagebox.showwarning("No Program", "No valid program to analyze")
+            return
+        analysis = analyze(self.engine.program_memory)
+        self.show_line_notes(annotate(analysis, line_addresses(self.collect_program_lines())))
+        self.status_var.set(analysis.summary())
+
+    def show_line_notes(self, notes):
+        """Show {line_num: text} next to the editor lines, clearing the others"""
+        for i, label in enumerate(self.note_labels):
+            note = notes.get(i + 1, "")
+            label.config(text=note, fg="#B00000" if "RAW" in note else "black")
+
+    def show_profile(self):
+        """Shade each editor line by its share of the profiled cycles and annotate its counters"""
+        profiler = self.engine.profiler
+        if profiler is None or not profiler.total_cycles():
+            messagebox.showinfo("Profile", "Run or step the program first")
+            return
+        heat = profiler.heat()
+        hottest = max(heat.values())
+        notes = {}
+        for addr, line_num in line_addresses(self.collect_program_lines()).items():
+            share = heat.get(addr, 0.0)
+            self.entry_widgets[line_num - 1].config(bg=heat_color(share / hottest) if share else "white")
+            index = profiler.slot(addr)
+            if index < 0 or not profiler.fetches[index]:
+                continue
+            parts = [f"{share:.1%} cycles", f"{profiler.retired[index]} retired"]
+            if profiler.freeze[index]:
+                parts.append(f"{profiler.freeze[index]} freeze")
+            if profiler.stalls[index]:
+                parts.append(f"{profiler.stalls[index]} stall")
+            notes[line_num] = " | ".join(parts)
+        self.show_line_notes(notes)
+        top = profiler.by_label(self.engine.labels)[0]
+        self.status_var.set(f"Profile: {profiler.total_cycles()} cycles, hottest region {top['label']} ({top['share']:.1%})")
+
+    def clear_heat(self):
+        for entry in self.entry_widgets:
+            entry.config(bg="white")
+        for addr, entry in self.memory_entries.items():
+            entry.config(bg="white", readonlybackground="white")
+            self.memory_heat_labels[addr].config(text="")
+
+    def show_access_heat(self):
+        """Shade the memory table by LW/SW count per word and list the per-PC stride patterns"""
+        trace = self.engine.memory_trace
+        if trace is None or not len(trace):
+            messagebox.showinfo("Memory Trace", "Run or step a program that uses LW/SW first")
+            return
+        heat = trace.heat()
+        hottest = max(loads + stores for loads, stores in heat.values())
+        for addr, entry in self.memory_entries.items():
+            loads, stores = heat.get(addr, (0, 0))
+            color = heat_color((loads + stores) / hottest) if loads + stores else "white"
+            entry.config(bg=color, readonlybackground=color)
+            self.memory_heat_labels[addr].config(text=f"R {loads}  W {stores}" if loads + stores else "")
+        outside = sum(1 for addr in heat if addr not in self.memory_entries)
+        patterns = ", ".join(
+            f"0x{row['pc']:04x} {row['pattern']}" + (f" {row['stride']:+d}" if row['pattern'] == "strided" else "")
+            for row in trace.strides(self.engine.labels)[:4]
+        )
+        self.status_var.set(
+            f"{len(trace)} accesses to {len(heat)} word(s)" + (f", {outside} outside this window" if outside else "")
+            + f" | {patterns}"
+        )
+
+    def save_memory_trace(self):
+        """Export the memory access report (.txt), every access (.csv) or the analysis (.json)"""
+        trace = self.engine.memory_trace
+        if trace is None or not len(trace):
+            messagebox.showinfo("Memory Trace", "Run or step a program that uses LW/SW first")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save memory trace",
+            filetypes=[("Report", "*.txt"), ("CSV", "*.csv"), ("JSON", "*.json")],
+            defaultextension=".txt",
+        )
+        if not path:
+            return
+        try:
+            trace.write(path, self.engine.labels)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save {path}: {e}")
+            return
+        self.status_var.set(f"Memory trace saved to {path}")
+
+    def save_profile(self):
+        """Export the flat profile (.txt), or .csv / .json"""
+        profiler = self.engine.profiler
+        if profiler is None or not profiler.total_cycles():
+            messagebox.showinfo("Profile", "Run or step the program first")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save profile",
+            filetypes=[("Flat profile", "*.txt"), ("CSV", "*.csv"), ("JSON", "*.json")],
+            defaultextension=".txt",
+        )
+        if not path:
+            return
+        try:
+            profiler.write(path, self.engine.program_memory, self.engine.labels)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save {path}: {e}")
+            return
+        self.status_var.set(f"Profile saved to {path}")
+
+    def debug_program_memory(self):
+        """Debug method to check what's in program_memory"""
+        program_memory = self.engine.program_memory
+        print("=== DEBUG program_memory ===")
+        if not program_memory:
+            print("program_memory is EMPTY")
+            return
+
+        for addr in sorted(program_memory.keys()):
+            instruction = program_memory[addr]
+            print(f"0x{addr:04x}: 0x{instruction:08x}")
+        print("=== END DEBUG ===")
+
+    def display_opcodes(self, opcodes):
+        self.opcode_lines = opcodes
+        if self.is_tab_visible('opcode'):
+            self.render_opcodes()
+
+    def render_opcodes(self):
+        if self.opcode_lines is None:
+            return
+        opcodes = self.opcode_lines
+        self.opcode_text.config(state=tk.NORMAL)
+        self.opcode_text.delete(1.0, tk.END)
+        if opcodes:
+            header = "μRISCV OPCODE OUTPUT\n" + "=" * 60 + "\n"
+            header += "Address   Opcode      Instruction\n" + "=" * 60 + "\n"
+            self.opcode_text.insert(tk.END, header)
+            for opcode_line in opcodes:
+                self.opcode_text.insert(tk.END, opcode_line + "\n")
+        else:
+            self.opcode_text.insert(tk.END, "No opcodes generated.")
+        self.opcode_text.config(state=tk.DISABLED)
+
+    def create_pipeline_state_tab(self, frame):
+        self.pipeline_frame = frame
+        self.pipeline_text = scrolledtext.ScrolledText(self.pipeline_frame, bg="white", width=120, height=25, font=("Courier New", 10))
+        self.pipeline_text.pack(fill='both', expand=True, padx=10, pady=10)
+        self.pipeline_text.tag_configure('changed', background="#FFF3A0")
+        self.pipeline_text.config(state=tk.DISABLED)
+        # What the panel currently shows, line by line (None until first drawn)
+        self.pipeline_lines = None
+
+    def create_opcode_tab(self, frame):
+        self.opcode_frame = frame
+        self.opcode_text = scrolledtext.ScrolledText(self.opcode_frame, bg="white", width=120, height=25, font=("Courier New", 10))
+        self.opcode_text.pack(fill='both', expand=True, padx=10, pady=10)
+        self.opcode_text.config(state=tk.DISABLED)
+
+    def create_buttons(self):
+        frame = tk.Frame(self.root, bg="#D3D3D3", bd=1, relief="sunken")
+        frame.pack(fill='x', side='top', padx=10, pady=(10, 0))
+        self.runButton = Button(frame, text="Run", width=6, command=self.run_program)
+        self.runButton.pack(side="right", padx=2)
+        self.runButton["state"] = "disabled"
+        self.stepButton = Button(frame, text="Step", width=6, command=self.step_execution)
+        self.stepButton.pack(side="right", padx=2)
+        self.stepButton["state"] = "disabled"
+        self.resetButton = Button(frame, text="Reset", width=6, command=self.reset_simulation)
+        self.resetButton.pack(side="right", padx=2)
+        self.checkButton = Button(frame, text="Check", width=6, command=self.check_program)
+        self.checkButton.pack(side="right", padx=2)
+        self.analyzeButton = Button(frame, text="Analyze", width=7, command=self.analyze_program)
+        self.analyzeButton.pack(side="right", padx=2)
+        self.loadStateButton = Button(frame, text="Load State", width=9, command=self.load_state)
+        self.loadStateButton.pack(side="right", padx=2)
+        self.saveStateButton = Button(frame, text="Save State", width=9, command=self.save_state)
+        self.saveStateButton.pack(side="right", padx=2)
+        self.saveProfileButton = Button(frame, text="Save Profile", width=10, command=self.save_profile)
+        self.saveProfileButton.pack(side="right", padx=2)
+        self.profileButton = Button(frame, text="Profile", width=7, command=self.show_profile)
+        self.profileButton.pack(side="right", padx=2)
+
+        # Run budgets
+        tk.Label(frame, text="Max cycles:", bg="#D3D3D3").pack(side="left", padx=(5, 2))
+        self.cycles_entry = tk.Entry(frame, width=8)
+        self.cycles_entry.pack(side="left")
+        self.cycles_entry.insert(0, str(self.engine.max_cycles))
+        tk.Label(frame, text="Max seconds:", bg="#D3D3D3").pack(side="left", padx=(10, 2))
+        self.seconds_entry = tk.Entry(frame, width=6)
+        self.seconds_entry.pack(side="left")
+        self.seconds_entry.insert(0, f"{self.engine.max_seconds:g}")
+        tk.Label(frame, text="Pipeline:", bg="#D3D3D3").pack(side="left", padx=(10, 2))
+        self.pipeline_choice = ttk.Combobox(frame, values=list(PRESETS) + [DUAL_ISSUE], width=10, state="readonly")
+        self.pipeline_choice.pack(side="left")
+        self.pipeline_choice.set("classic")
+        self.pipeline_choice.bind("<<ComboboxSelected>>", self.change_pipeline)
+
+    def change_pipeline(self, event=None):
+        """Switch the engine to another pipeline variant and restart the pipeline"""
+        choice = self.pipeline_choice.get()
+        engine_class = DualIssueEngine if choice == DUAL_ISSUE else PipelineEngine
+        geometry = CLASSIC if choice == DUAL_ISSUE else PRESETS[choice]
+        if type(self.engine) is not engine_class:
+            # The new engine takes over registers, memory and program
+            self.engine.set_geometry(CLASSIC)
+            self.engine = self.engine.fork(engine_class)
+            Profiler.for_engine(self.engine)
+            MemoryTrace.for_engine(self.engine)
+        self.engine.set_geometry(geometry)
+        self.table_rows = self.engine.map_rows()
+        self.engine.reset_pipeline()
+        self.ir_color_map.clear()
+        self.next_color_index = 0
+        self.is_running = False
+        self.update_pipeline_display()
+        self.update_pipeline_table()
+        self.update_pc_display()
+        width = " (dual issue)" if engine_class is DualIssueEngine else ""
+        self.status_var.set(f"Pipeline: {geometry.describe()}{width}")
+
+    def save_state(self):
+        """Write a checkpoint of the current cycle, pipeline history included"""
+        path = filedialog.asksaveasfilename(
+            title="Save simulation state",
+            filetypes=[("μRISCV checkpoint", "*.urc"), ("All files", "*")],
+            defaultextension=".urc",
+        )
+        if not path:
+            return
+        try:
+            save_checkpoint(self.engine, path, history=True)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save {path}: {e}")
+            return
+        self.status_var.set(f"Saved state at cycle {self.engine.cycle_count} to {path}")
+
+    def load_state(self):
+        """Restore a checkpoint; Step continues from the saved cycle"""
+        path = filedialog.askopenfilename(
+            title="Load simulation state",
+            filetypes=[("μRISCV checkpoint", "*.urc"), ("All files", "*")],
+        )
+        if not path:
+            return
+        try:
+            load_checkpoint(self.engine, path)
+        except (UriscvError, OSError) as e:
+            messagebox.showerror("Error", f"Could not load {path}: {e}")
+            return
+
+        self.ir_color_map.clear()
+        self.next_color_index = 0
+        self.is_running = not self.engine.is_program_complete()
+        self.stepButton["state"] = "normal" if self.is_running else "disabled"
+        self.update_register_display()
+        self.update_memory_display()
+        self.update_pipeline_display()
+        self.update_pipeline_table()
+        self.update_pc_display()
+        self.status_var.set(f"Restored cycle {self.engine.cycle_count} from {path}")
+
+    def run_program(self):
+        """Run program to completion"""
+        if not self.load_program_to_memory():
+            messagebox.showwarning("No Program", "No valid program to execute")
+            return
+
+        # Reset pipeline state
+        self.engine.reset_pipeline()
+        self.ir_color_map.clear()
+        self.next_color_index = 0
+        self.read_run_budgets()
+
+        # Run cycles within the cycle and wall-clock budgets
+        self.is_running = True
+
+        def on_cycle(primed):
+            self.after_cycle(primed)
+            self.root.update()
+
+        # Frozen cache-miss cycles are drawn once per stall
+        result = self.engine.run(on_cycle=on_cycle, batch_idle=True)
+
+        if result.status == RunResult.LOOP:
+            messagebox.showwarning("Execution Stopped", result.loop_report)
+        elif result.status == RunResult.TIME_LIMIT:
+            messagebox.showwarning("Execution Stopped", f"Reached wall-clock limit of {self.engine.max_seconds:g} s at cycle {result.cycles}")
+        elif result.status == RunResult.CYCLE_LIMIT:
+            messagebox.showwarning("Execution Stopped", f"Reached maximum cycle limit ({self.engine.max_cycles})")
+
+        self.finalize_execution()
+
+    def read_run_budgets(self):
+        """Read the cycle and wall-clock budgets from the toolbar, keeping the old values on bad input"""
+        try:
+            max_cycles = int(self.cycles_entry.get().strip())
+            if max_cycles > 0:
+                self.engine.max_cycles = max_cycles
+        except ValueError:
+            pass
+        try:
+            max_seconds = float(self.seconds_entry.get().strip())
+            if max_seconds > 0:
+                self.engine.max_seconds = max_seconds
+        except ValueError:
+            pass
+        self.cycles_entry.delete(0, tk.END)
+        self.cycles_entry.insert(0, str(self.engine.max_cycles))
+        self.seconds_entry.delete(0, tk.END)
+        self.seconds_entry.insert(0, f"{self.engine.max_seconds:g}")
+
+
+# -------------------------
+# main
+# -------------------------
+def main():
+    root = tk.Tk()
+    app = RiscVGUI(root)
+    root.mainloop()
@@ -0,0 +1,269 @@
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+
+from .errors import UriscvError
+from .isa import DATA_START, PROG_START
+
+# ============================================================
+# μRISCV memory images: raw binary, Intel HEX and ELF32 load/dump
+# ============================================================
+
+RAW = "raw"
+IHEX = "ihex"
+ELF = "elf"
+IMAGE_FORMATS = (RAW, IHEX, ELF)
+
+# Files at least this large are mapped instead of read
+MMAP_THRESHOLD = 64 * 1024
+
+ELF_MAGIC = b"\x7fELF"
+ELF_HEADER = struct.Struct("<16sHHIIIIIHHHHHH")
+ELF_PROGRAM_HEADER = struct.Struct("<IIIIIIII")
+ELFCLASS32 = 1
+ELFDATA2LSB = 1
+EM_RISCV = 0xF3
+PT_LOAD = 1
+PF_X = 0x1
+
+# Intel HEX record types
+IHEX_DATA = 0x00
+IHEX_EOF = 0x01
+IHEX_SEGMENT_ADDRESS = 0x02
+IHEX_START_SEGMENT = 0x03
+IHEX_LINEAR_ADDRESS = 0x04
+IHEX_START_LINEAR = 0x05
+IHEX_BYTES_PER_RECORD = 16
+
+IHEX_EXTENSIONS = (".hex", ".ihex", ".ihx")
+PROGRAM_IMAGE_EXTENSIONS = (".bin", ".elf") + IHEX_EXTENSIONS
+
+
+class Image:
+    """What load_image put into memory"""
+
+    def __init__(self, fmt):
+        self.format = fmt
+        # (address, length, executable) for every block written
+        self.segments = []
+        self.entry = None
+
+    def add(self, addr, length, executable=False):
+        if length:
+            self.segments.append((addr, length, executable))
+
+    def code_region(self):
+        """[start, end) covering the executable segments, or every segment if none is marked"""
+        code = [s for s in self.segments if s[2]] or self.segments
+        if not code:
+            return 0, 0
+        return min(addr for addr, _, _ in code), max(addr + length for addr, length, _ in code)
+
+    def size(self):
+        return sum(length for _, length, _ in self.segments)
+
+    def describe(self):
+        blocks = ", ".join(f"0x{addr:08x}+{length}" for addr, length, _ in self.segments)
+        return f"{self.format} image, {self.size()} bytes: {blocks or 'empty'}"
+
+
+# -------------------------
+# Reading
+# -------------------------
+
+@contextmanager
+def open_image(path):
+    """Yield the file contents as a read-only memoryview, mmapped for large files"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            yield memoryview(f.read())
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                # The map cannot close while a slice of it is still exported
+                view.release()
+
+
+def detect_format(path, data):
+    if bytes(data[:4]) == ELF_MAGIC:
+        return ELF
+    extension = os.path.splitext(path)[1].lower()
+    if extension in IHEX_EXTENSIONS or bytes(data[:1]) == b":":
+        return IHEX
+    return RAW
+
+
+def is_program_image(path):
+    """True if path looks like a binary program rather than assembly source"""
+    if os.path.splitext(path)[1].lower() in PROGRAM_IMAGE_EXTENSIONS:
+        return True
+    with open(path, "rb") as f:
+        return f.read(4) == ELF_MAGIC
+
+
+def format_for_path(path):
+    """Dump format implied by a file name"""
+    return IHEX if os.path.splitext(path)[1].lower() in IHEX_EXTENSIONS else RAW
+
+
+def load_raw(engine, data, base, image):
+    if not engine.write_bytes(base, data):
+        raise UriscvError(f"Image of {len(data)} bytes does not fit at 0x{base:08x}")
+    image.add(base, len(data))
+
+
+def load_ihex(engine, data, image):
+    """Intel HEX: data, EOF, extended segment/linear address and start address records"""
+    upper = 0
+    for line_num, line in enumerate(bytes(data).decode("ascii", errors="replace").splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        if not line.startswith(":"):
+            raise UriscvError(f"Intel HEX line {line_num}: missing ':'")
+        try:
+            record = bytes.fromhex(line[1:])
+        except ValueError:
+            raise UriscvError(f"Intel HEX line {line_num}: invalid hex digits") from None
+        if len(record) < 5 or len(record) != record[0] + 5:
+            raise UriscvError(f"Intel HEX line {line_num}: wrong record length")
+        if sum(record) & 0xFF:
+            raise UriscvError(f"Intel HEX line {line_num}: bad checksum")
+
+        count, offset, kind, payload = record[0], int.from_bytes(record[1:3], "big"), record[3], record[4:4 + record[0]]
+        if kind == IHEX_DATA:
+            addr = (upper + offset) & 0xFFFFFFFF
+            if not engine.write_bytes(addr, payload):
+                raise UriscvError(f"Intel HEX line {line_num}: {count} bytes do not fit at 0x{addr:08x}")
+            # Merge with the previous block when the records are contiguous
+            if image.segments and sum(image.segments[-1][:2]) == addr:
+                last_addr, last_length, _ = image.segments[-1]
+                image.segments[-1] = (last_addr, last_length + count, False)
+            else:
+                image.add(addr, count)
+        elif kind == IHEX_EOF:
+            return
+        elif kind == IHEX_SEGMENT_ADDRESS:
+            upper = int.from_bytes(payload, "big") << 4
+        elif kind == IHEX_LINEAR_ADDRESS:
+            upper = int.from_bytes(payload, "big") << 16
+        elif kind == IHEX_START_SEGMENT:
+            image.entry = ((payload[0] << 8 | payload[1]) << 4) + (payload[2] << 8 | payload[3])
+        elif kind == IHEX_START_LINEAR:
+            image.entry = int.from_bytes(payload, "big")
+        else:
+            raise UriscvError(f"Intel HEX line {line_num}: unknown record type {kind:02x}")
+
+
+def load_elf(engine, data, image):
+    """ELF32 little-endian executable: every PT_LOAD segment at its virtual address"""
+    if len(data) < ELF_HEADER.size:
+        raise UriscvError("ELF file is truncated")
+    (ident, _, machine, _, entry, phoff, _, _, _, phentsize, phnum, _, _, _) = ELF_HEADER.unpack_from(data)
+    if ident[4] != ELFCLASS32 or ident[5] != ELFDATA2LSB:
+        raise UriscvError("Only 32-bit little-endian ELF files are supported")
+    if machine != EM_RISCV:
+        raise UriscvError(f"ELF file is not for RISC-V (e_machine 0x{machine:x})")
+    if phnum and (phentsize < ELF_PROGRAM_HEADER.size or phoff + phnum * phentsize > len(data)):
+        raise UriscvError("ELF program headers are truncated")
+
+    for index in range(phnum):
+        kind, offset, vaddr, _, filesz, memsz, flags, _ = ELF_PROGRAM_HEADER.unpack_from(data, phoff + index * phentsize)
+        if kind != PT_LOAD or not memsz:
+            continue
+        if offset + filesz > len(data) or filesz > memsz:
+            raise UriscvError(f"ELF segment {index} lies outside the file")
+        # Slicing the view does not copy; PagedMemory copies straight into its pages
+        if not engine.write_bytes(vaddr, data[offset:offset + filesz]):
+            raise UriscvError(f"ELF segment {index} does not fit at 0x{vaddr:08x}")
+        if memsz > filesz and not engine.write_bytes(vaddr + filesz, bytes(memsz - filesz)):
+            raise UriscvError(f"ELF segment {index} does not fit at 0x{vaddr:08x}")
+        image.add(vaddr, memsz, bool(flags & PF_X))
+    image.entry = entry
+
+
+def load_image(engine, path, base=None, fmt=None, program=False):
+    """Load a raw, Intel HEX or ELF32 file into engine memory and return an Image
+
+    Raw images go to base (DATA_START, or PROG_START for programs); HEX and
+    ELF files carry their own addresses. With program=True the loaded code
+    becomes the engine's program and its entry point (if any) the start PC.
+    """
+    with open_image(path) as data:
+        fmt = fmt or detect_format(path, data)
+        if fmt not in IMAGE_FORMATS:
+            raise UriscvError(f"Unknown image format '{fmt}' (choose from {', '.join(IMAGE_FORMATS)})")
+        image = Image(fmt)
+        if fmt == ELF:
+            load_elf(engine, data, image)
+        elif fmt == IHEX:
+            load_ihex(engine, data, image)
+        else:
+            load_raw(engine, data, (PROG_START if program else DATA_START) if base is None else base, image)
+
+    if program:
+        start, end = image.code_region()
+        if end <= start:
+            raise UriscvError(f"{path} contains no code")
+        engine.set_code_region(start, end)
+        engine.entry_point = image.entry if image.entry is not None else start
+        engine.reset_pipeline()
+    engine.reset_loop_detection()
+    return image
+
+
+# -------------------------
+# Dumping
+# -------------------------
+
+def dump_image(engine, path, start, end, fmt=RAW):
+    """Write memory [start, end) to path as a raw binary or Intel HEX file"""
+    if end <= start:
+        raise UriscvError(f"Empty dump range 0x{start:08x}-0x{end:08x}")
+    data = engine.memory.read_bytes(start, end - start)
+    if fmt == RAW:
+        with open(path, "wb") as f:
+            f.write(data)
+    elif fmt == IHEX:
+        with open(path, "w", encoding="ascii") as f:
+            f.writelines(ihex_records(start, data))
+    else:
+        raise UriscvError(f"Cannot dump to '{fmt}' (choose {RAW} or {IHEX})")
+
+
+def ihex_record(kind, offset, payload):
+    record = bytes([len(payload), offset >> 8, offset & 0xFF, kind]) + payload
+    return f":{record.hex().upper()}{(-sum(record)) & 0xFF:02X}\n"
+
+
+def ihex_records(start, data):
+    upper = None
+    index = 0
+    while index < len(data):
+        addr = start + index
+        # A record must not cross a 64 KiB boundary
+        length = min(IHEX_BYTES_PER_RECORD, len(data) - index, 0x10000 - (addr & 0xFFFF))
+        if addr >> 16 != upper:
+            upper = addr >> 16
+            yield ihex_record(IHEX_LINEAR_ADDRESS, 0, upper.to_bytes(2, "big"))
+        yield ihex_record(IHEX_DATA, addr & 0xFFFF, data[index:index + length])
+        index += length
+    yield ihex_record(IHEX_EOF, 0, b"")
+
+
+def parse_range(text):
+    """'0x0000-0x0080' or '0x0000+128' -> (start, end)"""
+    try:
+        if "+" in text:
+            start, length = text.split("+", 1)
+            start = int(start, 0)
+            return start, start + int(length, 0)
+        start, end = text.split("-", 1)
+        return int(start, 0), int(end, 0)
+    except ValueError:
+        raise UriscvError(f"Invalid memory range '{text}' (use START-END or START+LENGTH)") from None
@@ -0,0 +1,24 @@
+import re
+
+# ============================================================
+# μRISCV ISA and memory layout
+# ============================================================
+
+# ===== MEMORY LAYOUT CONSTANTS (REQUIRED BY SPEC) =====
+DATA_START = 0x0000
+DATA_END   = 0x007F    # 128 bytes
+PROG_START = 0x0080
+PROG_END   = 0x00FF
+
+# Supported instructions (Group 2,5: LW, SW, AND, OR, ORI, BLT, BGE)
+R_TYPE = {"AND": {"0110011": "111"}, "OR": {"0110011": "110"}}
+I_TYPE = {"ORI": {"0010011": "110"}, "LW": {"0000011": "010"}}
+S_TYPE = {"SW": {"0100011": "010"}}
+B_TYPE = {"BLT": {"1100011": "100"}, "BGE": {"1100011": "101"}}
+DIRECTIVE = {".WORD"}
+SUPPORTED_INSTRUCTIONS = set(R_TYPE.keys()) | set(I_TYPE.keys()) | set(S_TYPE.keys()) | set(B_TYPE.keys()) | DIRECTIVE
+
+# Patterns
+REGISTER_PATTERN = re.compile(r'^x([0-9]|[1-2][0-9]|3[0-1])$')
+IMMEDIATE_PATTERN = re.compile(r'^-?[0-9]+$')
+HEX_PATTERN = re.compile(r'^0x[0-9a-fA-F]+$')
@@ -0,0 +1,101 @@
+from .instructions import handler_for
+
+# ============================================================
+# μRISCV pipeline latches: fixed-slot objects with a valid bit
+# ============================================================
+
+
+class Latch:
+    """One pipeline register; a bubble is a latch whose valid bit is clear
+
+    Latches are preallocated and overwritten in place every cycle, so the
+    hot path never builds dicts. The mapping-style helpers (get, items,
+    as_dict) are for displays, snapshots and checkpoints.
+    """
+    __slots__ = ('valid',)
+    FIELDS = ()
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Turn the latch into a bubble (all fields zero)"""
+        self.valid = False
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+
+    def get(self, name, default=0):
+        return getattr(self, name, default)
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.FIELDS]
+
+    def values(self):
+        return tuple(getattr(self, name) for name in self.FIELDS)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def load(self, fields):
+        """Set the fields from a mapping (missing fields read as 0)"""
+        for name in self.FIELDS:
+            setattr(self, name, fields.get(name, 0))
+        # An all-zero word is not an instruction, so it always travels as a bubble
+        self.valid = bool(self.IR)
+
+
+class DecodedLatch(Latch):
+    """A latch behind ID, which also carries the handler ID selected for its IR
+
+    The handler is not a field: snapshots, checkpoints and state hashes only
+    see IR, and load() selects the handler again from it.
+    """
+    __slots__ = ('handler',)
+
+    def clear(self):
+        super().clear()
+        self.handler = BUBBLE_HANDLER
+
+    def load(self, fields):
+        super().load(fields)
+        self.handler = handler_for(self.IR)
+
+
+# Handler of an empty latch (that of the word 0)
+BUBBLE_HANDLER = handler_for(0)
+
+
+class IfId(Latch):
+    FIELDS = ('IR', 'NPC', 'PC')
+    __slots__ = FIELDS
+
+
+class IdEx(DecodedLatch):
+    FIELDS = ('A', 'B', 'IMM', 'IR', 'NPC')
+    __slots__ = FIELDS
+
+
+class ExMem(DecodedLatch):
+    # PC is carried so MEM can attribute memory accesses to their instruction
+    FIELDS = ('ALUOUTPUT', 'cond', 'IR', 'B', 'PC')
+    __slots__ = FIELDS
+
+
+class MemWb(Latch):
+    FIELDS = ('LMD', 'IR', 'ALUOUTPUT')
+    __slots__ = FIELDS
+
+
+class WbLatch(Latch):
+    FIELDS = ('IR', 'RD', 'VALUE')
+    __slots__ = FIELDS
+
+
+# Latch names as used by pipeline_state, snapshots and checkpoints, in pipeline order
+LATCH_NAMES = ('IF_ID', 'ID_EX', 'EX_MEM', 'MEM_WB', 'WB')
+# Latches of the second lane of a dual-issue pipeline
+SECOND_LANE_NAMES = tuple(f"{name}_2" for name in LATCH_NAMES)
+LATCH_CLASSES = (IfId, IdEx, ExMem, MemWb, WbLatch)
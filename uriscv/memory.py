@@ -0,0 +1,138 @@
+import struct
+
+# ============================================================
+# μRISCV paged memory (sparse, copy-on-write)
+# ============================================================
+
+PAGE_BITS = 12
+PAGE_SIZE = 1 << PAGE_BITS      # 4 KiB
+PAGE_MASK = PAGE_SIZE - 1
+ADDRESS_MASK = 0xFFFFFFFF
+
+WORD = struct.Struct('<I')
+ZERO_PAGE = bytes(PAGE_SIZE)
+
+
+def word_digest(addr, value):
+    """Contribution of one word to PagedMemory.digest(); zero words contribute nothing"""
+    return hash((addr, value)) if value else 0
+
+
+class PagedMemory:
+    """Byte-addressable 32-bit address space backed by 4 KiB pages
+
+    Pages are allocated on the first write that touches them; reads of
+    untouched memory return 0. snapshot() shares every page with the copy,
+    and whichever side writes to a shared page first copies just that page.
+
+    A content digest (XOR of a hash of every nonzero word) is kept up to
+    date by write_word, so comparing whole memories is O(1).
+    """
+
+    def __init__(self):
+        # page number -> bytearray(PAGE_SIZE)
+        self.pages = {}
+        # page numbers this instance may write in place (not shared with a snapshot)
+        self.owned = set()
+        # None after write_bytes; recomputed on demand
+        self._digest = 0
+
+    def clear(self):
+        """Drop every page, returning the whole address space to zero"""
+        self.pages = {}
+        self.owned = set()
+        self._digest = 0
+
+    def page_count(self):
+        return len(self.pages)
+
+    def snapshot(self):
+        """Return a copy-on-write copy of this memory"""
+        copy = PagedMemory()
+        copy.pages = dict(self.pages)
+        copy._digest = self._digest
+        # From now on every existing page is shared between the two
+        self.owned = set()
+        return copy
+
+    def writable_page(self, page_number):
+        """Return the page for writing, allocating or un-sharing it first"""
+        if page_number in self.owned:
+            return self.pages[page_number]
+        page = self.pages.get(page_number)
+        page = bytearray(page) if page is not None else bytearray(PAGE_SIZE)
+        self.pages[page_number] = page
+        self.owned.add(page_number)
+        return page
+
+    def read_word(self, addr):
+        """Read a little-endian word; addr must be word-aligned"""
+        page = self.pages.get((addr & ADDRESS_MASK) >> PAGE_BITS)
+        if page is None:
+            return 0
+        return WORD.unpack_from(page, addr & PAGE_MASK)[0]
+
+    def write_word(self, addr, value):
+        """Write a little-endian word; addr must be word-aligned"""
+        value &= 0xFFFFFFFF
+        page = self.writable_page((addr & ADDRESS_MASK) >> PAGE_BITS)
+        offset = addr & PAGE_MASK
+        if self._digest is not None:
+            old = WORD.unpack_from(page, offset)[0]
+            if old != value:
+                self._digest ^= word_digest(addr, old) ^ word_digest(addr, value)
+        WORD.pack_into(page, offset, value)
+
+    def read_bytes(self, addr, length):
+        """Read length bytes starting at addr (may cross pages)"""
+        out = bytearray()
+        while length > 0:
+            offset = addr & PAGE_MASK
+            chunk = min(length, PAGE_SIZE - offset)
+            page = self.pages.get((addr & ADDRESS_MASK) >> PAGE_BITS)
+            out += page[offset:offset + chunk] if page is not None else bytes(chunk)
+            addr += chunk
+            length -= chunk
+        return bytes(out)
+
+    def write_bytes(self, addr, data):
+        """Write a bytes-like object starting at addr (may cross pages)"""
+        data = memoryview(data)
+        while len(data):
+            offset = addr & PAGE_MASK
+            chunk = min(len(data), PAGE_SIZE - offset)
+            page = self.writable_page((addr & ADDRESS_MASK) >> PAGE_BITS)
+            page[offset:offset + chunk] = data[:chunk]
+            addr += chunk
+            data = data[chunk:]
+        self._digest = None
+
+    def digest(self):
+        """Hash of the contents; equal contents always give equal digests"""
+        if self._digest is None:
+            digest = 0
+            for page_number, page in self.pages.items():
+                if page == ZERO_PAGE:
+                    continue
+                base = page_number << PAGE_BITS
+                for index, (value,) in enumerate(WORD.iter_unpack(page)):
+                    if value:
+                        digest ^= word_digest(base + 4 * index, value)
+            self._digest = digest
+        return self._digest
+
+    def diff_words(self, other):
+        """Yield (addr, mine, theirs) for every word that differs from other"""
+        for page_number in sorted(set(self.pages) | set(other.pages)):
+            mine = self.pages.get(page_number)
+            theirs = other.pages.get(page_number)
+            if mine is theirs or mine == theirs:
+                continue
+            mine = mine if mine is not None else ZERO_PAGE
+            theirs = theirs if theirs is not None else ZERO_PAGE
+            base = page_number << PAGE_BITS
+            for offset in range(0, PAGE_SIZE, 4):
+                a = WORD.unpack_from(mine, offset)[0]
+                b = WORD.unpack_from(theirs, offset)[0]
+                if a != b:
+                    yield base + offset, a, b
@@ -0,0 +1,168 @@
+import json
+from array import array
+from collections import Counter
+
+from .profiler import label_lookup
+
+# ============================================================
+# μRISCV memory access trace: every LW/SW with stride analysis
+# ============================================================
+
+# Records kept before the trace stops growing (about 21 bytes each)
+DEFAULT_LIMIT = 1_000_000
+
+# A PC is strided when this share of its successive accesses move by one stride
+STRIDE_CONFIDENCE = 0.75
+
+# Access patterns reported per PC
+CONSTANT = "constant"
+STRIDED = "strided"
+IRREGULAR = "irregular"
+SINGLE = "single"
+
+
+class MemoryTrace:
+    """(cycle, pc, address, R/W, value) for every aligned LW/SW, in column arrays
+
+    The engine records in MEM, the functional model when it executes the
+    access. Unaligned accesses never reach memory and are not recorded.
+    """
+
+    def __init__(self, limit=DEFAULT_LIMIT):
+        self.limit = limit
+        self.cycles = array('Q')
+        self.pcs = array('I')
+        self.addresses = array('I')
+        self.values = array('I')
+        self.stores = array('B')
+        # Accesses seen after the buffer filled up
+        self.dropped = 0
+
+    @classmethod
+    def for_engine(cls, engine, limit=DEFAULT_LIMIT):
+        """A new trace attached to engine"""
+        trace = cls(limit)
+        engine.memory_trace = trace
+        return trace
+
+    def reset(self):
+        for column in (self.cycles, self.pcs, self.addresses, self.values, self.stores):
+            del column[:]
+        self.dropped = 0
+
+    def record(self, cycle, pc, addr, is_store, value):
+        if len(self.cycles) >= self.limit:
+            self.dropped += 1
+            return
+        self.cycles.append(cycle)
+        self.pcs.append(pc & 0xFFFFFFFF)
+        self.addresses.append(addr)
+        self.values.append(value & 0xFFFFFFFF)
+        self.stores.append(1 if is_store else 0)
+
+    def __len__(self):
+        return len(self.cycles)
+
+    def records(self):
+        """Yield (cycle, pc, address, 'R' or 'W', value) in program order"""
+        for index in range(len(self.cycles)):
+            yield (self.cycles[index], self.pcs[index], self.addresses[index],
+                   "W" if self.stores[index] else "R", self.values[index])
+
+    # -------------------------
+    # Analysis
+    # -------------------------
+
+    def strides(self, labels=None):
+        """One dict per accessing PC: its dominant stride and how regular the pattern is"""
+        by_pc = {}
+        for pc, addr, is_store in zip(self.pcs, self.addresses, self.stores):
+            entry = by_pc.get(pc)
+            if entry is None:
+                entry = by_pc[pc] = [[], 0]
+            entry[0].append(addr)
+            entry[1] += is_store
+
+        label_at = label_lookup(labels or {})
+        rows = []
+        for pc, (addresses, stores) in by_pc.items():
+            deltas = Counter(b - a for a, b in zip(addresses, addresses[1:]))
+            if deltas:
+                stride, count = deltas.most_common(1)[0]
+                confidence = count / (len(addresses) - 1)
+            else:
+                stride, confidence = 0, 0.0
+            if len(addresses) < 2:
+                pattern = SINGLE
+            elif confidence < STRIDE_CONFIDENCE:
+                pattern = IRREGULAR
+            else:
+                pattern = CONSTANT if stride == 0 else STRIDED
+            rows.append({
+                'pc': pc,
+                'label': label_at(pc),
+                'accesses': len(addresses),
+                'loads': len(addresses) - stores,
+                'stores': stores,
+                'words': len(set(addresses)),
+                'low': min(addresses),
+                'high': max(addresses),
+                'stride': stride,
+                'confidence': round(confidence, 4),
+                'pattern': pattern,
+            })
+        rows.sort(key=lambda row: (-row['accesses'], row['pc']))
+        return rows
+
+    def heat(self):
+        """{word address: (loads, stores)}"""
+        counts = {}
+        for addr, is_store in zip(self.addresses, self.stores):
+            entry = counts.get(addr)
+            if entry is None:
+                entry = counts[addr] = [0, 0]
+            entry[is_store] += 1
+        return {addr: tuple(entry) for addr, entry in counts.items()}
+
+    def as_dict(self, labels=None):
+        heat = self.heat()
+        return {
+            'accesses': len(self),
+            'dropped': self.dropped,
+            'pcs': self.strides(labels),
+            'words': [
+                {'address': addr, 'loads': loads, 'stores': stores}
+                for addr, (loads, stores) in sorted(heat.items(), key=lambda item: (-sum(item[1]), item[0]))
+            ],
+        }
+
+    def report(self, labels=None):
+        """Text report: per-PC patterns, then the busiest words"""
+        out = [f"{len(self)} accesses" + (f" ({self.dropped} more not recorded)" if self.dropped else "")]
+        out.append("")
+        out.append("  pc          accesses  loads stores  words  stride  conf  pattern    range                    label")
+        for row in self.strides(labels):
+            out.append(
+                f"  0x{row['pc']:08x} {row['accesses']:>9} {row['loads']:>6} {row['stores']:>6} {row['words']:>6} "
+                f"{row['stride']:>7} {row['confidence']:>5.2f}  {row['pattern']:<10} "
+                f"0x{row['low']:08x}-0x{row['high']:08x}  {row['label']}"
+            )
+        out.append("")
+        out.append("  address     loads  stores")
+        for word in self.as_dict(labels)['words']:
+            out.append(f"  0x{word['address']:08x} {word['loads']:>6} {word['stores']:>7}")
+        return "\n".join(out) + "\n"
+
+    def write(self, path, labels=None):
+        """Export: the analysis as JSON for .json, every record as CSV for .csv, the text report otherwise"""
+        if path.endswith(".json"):
+            text = json.dumps(self.as_dict(labels), indent=2)
+        elif path.endswith(".csv"):
+            lines = ["cycle,pc,address,access,value"]
+            for cycle, pc, addr, access, value in self.records():
+                lines.append(f"{cycle},0x{pc:08x},0x{addr:08x},{access},0x{value:08x}")
+            text = "\n".join(lines) + "\n"
+        else:
+            text = self.report(labels)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
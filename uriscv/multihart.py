@@ -0,0 +1,262 @@
+import functools
+import time
+
+from .engine import PipelineEngine, RunResult, DEFAULT_MAX_CYCLES, DEFAULT_MAX_SECONDS
+from .memory import PagedMemory
+
+# ============================================================
+# μRISCV multi-hart simulation: N pipelines sharing one memory
+# ============================================================
+
+# Every hart starts with its hart id in a0, as RISC-V boot code expects
+HART_ID_REGISTER = 10
+
+# Shared words listed in reports
+MAX_REPORTED_WORDS = 10
+
+
+class ContentionTracker:
+    """Per-word LW/SW counts for every hart, and same-cycle conflicts between harts"""
+
+    def __init__(self, hart_count):
+        self.hart_count = hart_count
+        # addr -> ([loads per hart], [stores per hart])
+        self.words = {}
+        # addr -> [(hart, is_store)] during the current lockstep cycle
+        self.pending = {}
+        # addr -> cycles in which several harts touched it and at least one stored
+        self.conflicts = {}
+
+    def record(self, hart_id, addr, is_store):
+        entry = self.words.get(addr)
+        if entry is None:
+            entry = self.words[addr] = ([0] * self.hart_count, [0] * self.hart_count)
+        entry[1 if is_store else 0][hart_id] += 1
+        self.pending.setdefault(addr, []).append((hart_id, is_store))
+
+    def end_cycle(self):
+        if not self.pending:
+            return
+        for addr, accesses in self.pending.items():
+            if len(accesses) > 1 and len({h for h, _ in accesses}) > 1 and any(s for _, s in accesses):
+                self.conflicts[addr] = self.conflicts.get(addr, 0) + 1
+        self.pending.clear()
+
+    def shared_words(self):
+        """Words used by more than one hart, at least one of which stores to it"""
+        shared = {}
+        for addr, (loads, stores) in self.words.items():
+            users = sum(1 for l, s in zip(loads, stores) if l or s)
+            if users > 1 and any(stores):
+                shared[addr] = (loads, stores)
+        return shared
+
+    def report(self, same_cycle=True):
+        shared = self.shared_words()
+        busiest = sorted(shared.items(), key=lambda item: -(sum(item[1][0]) + sum(item[1][1])))
+        return {
+            'shared_words': len(shared),
+            'conflict_cycles': sum(self.conflicts.values()) if same_cycle else None,
+            'words': [
+                {
+                    'address': f"0x{addr:08x}",
+                    'loads': loads,
+                    'stores': stores,
+                    'conflict_cycles': self.conflicts.get(addr, 0) if same_cycle else None,
+                }
+                for addr, (loads, stores) in busiest[:MAX_REPORTED_WORDS]
+            ],
+        }
+
+
+class MultiHartResult:
+    """Outcome of MultiHartSimulator.run / run_parallel"""
+
+    def __init__(self, status, cycles, seconds, hart_statuses):
+        self.status = status
+        self.cycles = cycles
+        self.seconds = seconds
+        self.hart_statuses = hart_statuses
+
+
+class MultiHartSimulator:
+    """N PipelineEngine harts with private latches and registers over one PagedMemory
+
+    run() steps the harts round-robin, one cycle each per global cycle, in
+    hart order. A store made in MEM by hart i is seen by a load in MEM of
+    harts i+1.. in the same cycle and of harts 0..i-1 from the next cycle on,
+    so the hart order breaks ties between harts racing on a word. run_parallel()
+    runs each hart to completion in its own process, which is only faithful
+    when the harts do not communicate through memory; words that break that
+    assumption are reported as shared.
+    """
+
+    def __init__(self, hart_count, verbose=False):
+        self.memory = PagedMemory()
+        self.harts = []
+        for hart_id in range(hart_count):
+            hart = PipelineEngine(verbose)
+            hart.record_history = False
+            hart.detect_loops = False
+            hart.memory = self.memory
+            hart.registers[HART_ID_REGISTER] = hart_id
+            self.harts.append(hart)
+        # One decode cache, so a store to code by any hart invalidates it for all
+        for hart in self.harts[1:]:
+            hart.decode_cache = self.harts[0].decode_cache
+        self.tracker = ContentionTracker(hart_count)
+        self.same_cycle_conflicts = True
+        self.cycle_count = 0
+        self.max_cycles = DEFAULT_MAX_CYCLES
+        self.max_seconds = DEFAULT_MAX_SECONDS
+        self.attach_tracker()
+
+    def set_geometry(self, geometry):
+        """Give every hart the same pipeline variant"""
+        for hart in self.harts:
+            hart.set_geometry(geometry)
+
+    def attach_tracker(self):
+        for hart_id, hart in enumerate(self.harts):
+            hart.data_access_hook = functools.partial(self.tracker.record, hart_id)
+
+    def load_program(self, program_memory, labels=None):
+        """Install the program once in shared memory; every hart starts at its first word"""
+        self.harts[0].load_program(program_memory, labels)
+        self.share_program()
+
+    def share_program(self):
+        """Give every hart the program (code range, entry point, labels) loaded into hart 0"""
+        first = self.harts[0]
+        for hart in self.harts[1:]:
+            hart.labels = first.labels
+            hart.code_start, hart.code_end = first.code_start, first.code_end
+            hart.entry_point = first.entry_point
+            hart.pc = first.pc
+
+    def write_word(self, addr, value):
+        return self.harts[0].write_word(addr, value)
+
+    def read_word(self, addr):
+        return self.harts[0].read_word(addr)
+
+    def set_data_cache(self, data_cache):
+        """Give every hart a private cold copy of data_cache (or none)"""
+        for hart in self.harts:
+            hart.data_cache = data_cache.empty_copy() if data_cache is not None else None
+
+    def is_complete(self):
+        return all(hart.is_program_complete() for hart in self.harts)
+
+    def step(self):
+        """Advance every hart that is still running by one cycle, in hart order"""
+        self.cycle_count += 1
+        for hart in self.harts:
+            if not hart.is_program_complete():
+                hart.step()
+        self.tracker.end_cycle()
+
+    def run(self, max_cycles=None, max_seconds=None):
+        """Lockstep round-robin run; returns a MultiHartResult"""
+        if max_cycles is not None:
+            self.max_cycles = max_cycles
+        if max_seconds is not None:
+            self.max_seconds = max_seconds
+
+        start = time.perf_counter()
+        deadline = start + self.max_seconds
+        status = RunResult.COMPLETE
+        while not self.is_complete():
+            if self.cycle_count >= self.max_cycles:
+                status = RunResult.CYCLE_LIMIT
+                break
+            self.step()
+            if time.perf_counter() > deadline:
+                status = RunResult.TIME_LIMIT
+                break
+
+        statuses = [RunResult.COMPLETE if hart.is_program_complete() else status for hart in self.harts]
+        return MultiHartResult(status, self.cycle_count, time.perf_counter() - start, statuses)
+
+    def run_parallel(self, jobs=None, max_cycles=None, max_seconds=None):
+        """Run every hart to completion in a process pool, then merge their stores"""
+        import multiprocessing
+
+        if max_cycles is not None:
+            self.max_cycles = max_cycles
+        if max_seconds is not None:
+            self.max_seconds = max_seconds
+
+        start = time.perf_counter()
+        work = [(hart_id, hart.snapshot(), hart.labels, hart.geometry, self.max_cycles, self.max_seconds)
+                for hart_id, hart in enumerate(self.harts)]
+        with multiprocessing.Pool(jobs or min(len(work), multiprocessing.cpu_count())) as pool:
+            results = pool.map(_run_hart_job, work)
+
+        statuses = []
+        for hart_id, status, state, stores, accesses in results:
+            hart = self.harts[hart_id]
+            hart.registers[:] = state['registers']
+            hart.pipeline_state = state['pipeline_state']
+            hart.cycle_count = state['cycle_count']
+            hart.instructions_retired = state['instructions_retired']
+            hart.taken_branches = state['taken_branches']
+            hart.data_cache = state['data_cache']
+            # Stores are merged in hart order; a word stored by two harts keeps the last
+            for addr, value in sorted(stores.items()):
+                hart.write_word(addr, value)
+            for addr, (loads, stores_count) in accesses.items():
+                entry = self.tracker.words.setdefault(addr, ([0] * len(self.harts), [0] * len(self.harts)))
+                entry[0][hart_id] += loads
+                entry[1][hart_id] += stores_count
+            statuses.append(status)
+
+        # Harts did not run in lockstep, so there is no notion of a same-cycle conflict
+        self.same_cycle_conflicts = False
+        self.cycle_count = max(hart.cycle_count for hart in self.harts)
+        overall = next((s for s in statuses if s != RunResult.COMPLETE), RunResult.COMPLETE)
+        return MultiHartResult(overall, self.cycle_count, time.perf_counter() - start, statuses)
+
+    def counters(self):
+        """Aggregate counters plus one dict per hart"""
+        instructions = sum(hart.instructions_retired for hart in self.harts)
+        return {
+            'cycles': self.cycle_count,
+            'instructions': instructions,
+            'ipc': round(instructions / self.cycle_count, 4) if self.cycle_count else 0.0,
+            'harts': [dict(hart=hart_id, **hart.counters()) for hart_id, hart in enumerate(self.harts)],
+        }
+
+    def contention(self):
+        return self.tracker.report(same_cycle=self.same_cycle_conflicts)
+
+
+def _run_hart_job(job):
+    """Worker: run one hart from its snapshot; return its final state, stores and access counts"""
+    hart_id, snap, labels, geometry, max_cycles, max_seconds = job
+    hart = PipelineEngine()
+    hart.record_history = False
+    hart.set_geometry(geometry)
+    hart.detect_loops = False
+    hart.labels = labels
+    hart.restore(snap)
+    hart.dirty_addresses = set()
+
+    accesses = {}
+
+    def record(addr, is_store):
+        counts = accesses.setdefault(addr, [0, 0])
+        counts[1 if is_store else 0] += 1
+
+    hart.data_access_hook = record
+    result = hart.run(max_cycles=max_cycles, max_seconds=max_seconds)
+    state = {
+        'registers': list(hart.registers),
+        'pipeline_state': hart.latch_state(),
+        'cycle_count': hart.cycle_count,
+        'instructions_retired': hart.instructions_retired,
+        'taken_branches': hart.taken_branches,
+        'data_cache': hart.data_cache,
+    }
+    stores = {addr: hart.read_word(addr) for addr in hart.dirty_addresses}
+    return hart_id, result.status, state, stores, {addr: tuple(c) for addr, c in accesses.items()}
@@ -0,0 +1,193 @@
+import bisect
+import json
+from array import array
+from collections import deque
+
+# ============================================================
+# μRISCV guest profiler: per-PC counters for the simulated program
+# ============================================================
+
+# Counter arrays kept per instruction slot of the code region
+COUNTERS = ("fetches", "retired", "freeze", "stalls", "loads", "stores")
+
+# Label used for instructions before the first label
+START_LABEL = "<start>"
+
+
+class Profiler:
+    """Flat per-PC counters, indexed by (pc - code_start) >> 2
+
+    The engine reports fetches in IF, executions in EX (where taken
+    branches cost their freeze bubble and LW/SW are counted), data cache
+    stalls in MEM and retirements in WB. Nothing is flushed after EX, so
+    the PCs of instructions between EX and WB are kept in a FIFO that WB
+    pops to credit the retirement to the right address.
+
+    cycles(slot) = retired + freeze + stalls; summed over the program this
+    differs from the run's cycle count only by the pipeline fill and drain.
+    """
+
+    def __init__(self, code_start, code_end):
+        self.code_start = code_start
+        self.size = max(code_end - code_start, 0) >> 2
+        for name in COUNTERS:
+            setattr(self, name, array('Q', bytes(8 * self.size)))
+        self.in_flight = deque()
+
+    @classmethod
+    def for_engine(cls, engine):
+        """A profiler covering engine's loaded program, attached to it"""
+        profiler = cls(engine.code_start, engine.code_end)
+        engine.profiler = profiler
+        return profiler
+
+    def reset(self):
+        for name in COUNTERS:
+            counters = getattr(self, name)
+            for index in range(self.size):
+                counters[index] = 0
+        self.in_flight.clear()
+
+    def slot(self, pc):
+        """Index of pc in the counter arrays, or -1 outside the code region"""
+        index = (pc - self.code_start) >> 2
+        return index if 0 <= index < self.size else -1
+
+    # -------------------------
+    # Engine hooks
+    # -------------------------
+
+    def on_fetch(self, pc):
+        index = self.slot(pc)
+        if index >= 0:
+            self.fetches[index] += 1
+
+    def on_execute(self, pc, handler, taken):
+        index = self.slot(pc)
+        self.in_flight.append(index)
+        if index < 0:
+            return
+        if taken:
+            self.freeze[index] += 1
+        if handler.is_load:
+            self.loads[index] += 1
+        elif handler.is_store:
+            self.stores[index] += 1
+
+    def on_stall(self, pc, cycles):
+        """Cycles the pipeline freezes behind the LW/SW at pc in MEM"""
+        index = self.slot(pc)
+        if index >= 0:
+            self.stalls[index] += cycles
+
+    def on_retire(self):
+        if not self.in_flight:
+            # Attached with instructions already in flight
+            return
+        index = self.in_flight.popleft()
+        if index >= 0:
+            self.retired[index] += 1
+
+    # -------------------------
+    # Reports
+    # -------------------------
+
+    def cycles(self, index):
+        return self.retired[index] + self.freeze[index] + self.stalls[index]
+
+    def total_cycles(self):
+        return sum(self.cycles(index) for index in range(self.size))
+
+    def rows(self, program_memory=None, labels=None):
+        """One dict per executed instruction, hottest first"""
+        label_at = label_lookup(labels or {})
+        total = self.total_cycles() or 1
+        rows = []
+        for index in range(self.size):
+            if not self.fetches[index] and not self.retired[index]:
+                continue
+            pc = self.code_start + 4 * index
+            row = {'pc': pc, 'label': label_at(pc)}
+            if program_memory is not None:
+                row['instruction'] = program_memory.get(pc, 0)
+            for name in COUNTERS:
+                row[name] = getattr(self, name)[index]
+            row['cycles'] = self.cycles(index)
+            row['share'] = round(row['cycles'] / total, 6)
+            rows.append(row)
+        rows.sort(key=lambda row: (-row['cycles'], row['pc']))
+        return rows
+
+    def by_label(self, labels):
+        """Counters summed per label (each PC belongs to the nearest label at or before it)"""
+        label_at = label_lookup(labels)
+        totals = {}
+        for row in self.rows(labels=labels):
+            entry = totals.setdefault(label_at(row['pc']), dict.fromkeys(COUNTERS + ('cycles',), 0))
+            for name in COUNTERS + ('cycles',):
+                entry[name] += row[name]
+        total = self.total_cycles() or 1
+        result = [{'label': label, **entry, 'share': round(entry['cycles'] / total, 6)} for label, entry in totals.items()]
+        result.sort(key=lambda row: (-row['cycles'], row['label']))
+        return result
+
+    def heat(self):
+        """{pc: fraction of all profiled cycles}"""
+        total = self.total_cycles()
+        if not total:
+            return {}
+        return {
+            self.code_start + 4 * index: self.cycles(index) / total
+            for index in range(self.size) if self.cycles(index)
+        }
+
+    def as_dict(self, program_memory=None, labels=None):
+        return {
+            'cycles': self.total_cycles(),
+            'instructions': self.rows(program_memory, labels),
+            'labels': self.by_label(labels or {}),
+        }
+
+    def flat_profile(self, program_memory=None, labels=None):
+        """gprof-style text: one line per label, then one per instruction"""
+        out = ["  %cycles    cycles   retired  freeze  stalls   loads  stores  label"]
+        for row in self.by_label(labels or {}):
+            out.append(
+                f"{row['share'] * 100:8.2f} {row['cycles']:>9} {row['retired']:>9} {row['freeze']:>7} "
+                f"{row['stalls']:>7} {row['loads']:>7} {row['stores']:>7}  {row['label']}"
+            )
+        out.append("")
+        out.append("  %cycles    cycles   fetches  retired  freeze  stalls  pc          label")
+        for row in self.rows(program_memory, labels):
+            out.append(
+                f"{row['share'] * 100:8.2f} {row['cycles']:>9} {row['fetches']:>9} {row['retired']:>8} "
+                f"{row['freeze']:>7} {row['stalls']:>7}  0x{row['pc']:08x}  {row['label']}"
+            )
+        return "\n".join(out) + "\n"
+
+    def write(self, path, program_memory=None, labels=None):
+        """Export the profile: JSON for .json, CSV for .csv, the flat text profile otherwise"""
+        if path.endswith(".json"):
+            text = json.dumps(self.as_dict(program_memory, labels), indent=2)
+        elif path.endswith(".csv"):
+            fields = ("pc", "label") + COUNTERS + ("cycles", "share")
+            lines = [",".join(fields)]
+            for row in self.rows(program_memory, labels):
+                lines.append(",".join(f"0x{row[f]:08x}" if f == "pc" else str(row[f]) for f in fields))
+            text = "\n".join(lines) + "\n"
+        else:
+            text = self.flat_profile(program_memory, labels)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def label_lookup(labels):
+    """Return a function mapping a pc to the nearest label at or before it"""
+    ordered = sorted((addr, name) for name, addr in labels.items())
+    addresses = [addr for addr, _ in ordered]
+
+    def label_at(pc):
+        position = bisect.bisect_right(addresses, pc)
+        return ordered[position - 1][1] if position else START_LABEL
+
+    return label_at
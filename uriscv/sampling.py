@@ -0,0 +1,184 @@
+import math
+import time
+
+from .analysis import PIPELINE_FILL
+from .engine import PipelineEngine, RunResult, DEFAULT_MAX_SECONDS
+from .geometry import CLASSIC
+
+# ============================================================
+# μRISCV sampled simulation: functional fast-forward, detailed windows
+# ============================================================
+
+# Instructions between the starts of two detailed windows
+DEFAULT_PERIOD = 10000
+# Instructions retired by a detailed window before measuring starts (fills the latches)
+DEFAULT_WARMUP = 32
+# Instructions measured per detailed window
+DEFAULT_WINDOW = 1000
+
+# Two-sided 95 % normal quantile for the confidence bound
+CONFIDENCE_Z = 1.96
+
+# A detailed window gives up after this many cycles per instruction asked for
+# (plus the worst-case cache stall, when a data cache is modelled)
+WINDOW_CYCLE_FACTOR = 8
+
+
+class SampledResult:
+    """Outcome of run_sampled: exact instruction count, extrapolated cycles"""
+
+    def __init__(self, status, instructions, samples, seconds, exact_cycles=None):
+        self.status = status
+        self.instructions = instructions
+        # CPI measured in each detailed window
+        self.samples = samples
+        self.seconds = seconds
+
+        if exact_cycles is not None:
+            # Too short to sample: the whole run was simulated in detail
+            self.cpi = exact_cycles / instructions if instructions else 0.0
+            self.cpi_bound = 0.0
+            self.cycles = exact_cycles
+            self.cycles_bound = 0.0
+            return
+
+        count = len(samples)
+        if not count:
+            # The detailed run that should have replaced sampling was cut short
+            self.cpi = self.cpi_bound = self.cycles = self.cycles_bound = None
+            return
+        self.cpi = sum(samples) / count
+        self.cycles = PIPELINE_FILL + instructions * self.cpi
+        if count > 1:
+            variance = sum((s - self.cpi) ** 2 for s in samples) / (count - 1)
+            self.cpi_bound = CONFIDENCE_Z * math.sqrt(variance / count)
+            self.cycles_bound = instructions * self.cpi_bound
+        else:
+            # One window says nothing about the spread
+            self.cpi_bound = self.cycles_bound = None
+
+    def summary(self):
+        if self.cycles is None:
+            return f"{self.instructions} instructions, cycles unknown (detailed run stopped: {self.status})"
+        if self.cpi_bound is None:
+            return (
+                f"{self.instructions} instructions, ~{self.cycles:.0f} cycles, "
+                f"CPI {self.cpi:.4f} (no bound from {len(self.samples)} window(s))"
+            )
+        return (
+            f"{self.instructions} instructions, ~{self.cycles:.0f} ± {self.cycles_bound:.0f} cycles, "
+            f"CPI {self.cpi:.4f} ± {self.cpi_bound:.4f} (95%, {len(self.samples)} window(s))"
+        )
+
+    def as_dict(self):
+        return {
+            'status': self.status,
+            'instructions': self.instructions,
+            'cycles': rounded(self.cycles, 2),
+            'cycles_bound': rounded(self.cycles_bound, 2),
+            'cpi': rounded(self.cpi, 6),
+            'cpi_bound': rounded(self.cpi_bound, 6),
+            'windows': len(self.samples),
+            'seconds': self.seconds,
+        }
+
+
+def rounded(value, digits):
+    """round(), passing None (no estimate) through as JSON null"""
+    return None if value is None else round(value, digits)
+
+
+def cycle_limit_per_instruction(data_cache, geometry=CLASSIC):
+    limit = WINDOW_CYCLE_FACTOR + geometry.mem_cycles - 1
+    if data_cache is None:
+        return limit
+    # A miss that also writes back a dirty victim pays the penalty twice
+    return limit + 2 * data_cache.miss_penalty
+
+
+def detailed_fork(functional, snap=None, geometry=CLASSIC):
+    """PipelineEngine with empty latches, starting from the functional model's state (or snap)"""
+    detailed = PipelineEngine()
+    detailed.record_history = False
+    detailed.set_geometry(geometry)
+    detailed.labels = functional.labels
+    # Memory pages are shared copy-on-write; the window never disturbs the functional run
+    detailed.restore(snap if snap is not None else functional.snapshot())
+    detailed.cycle_count = 0
+    detailed.instructions_retired = 0
+    detailed.taken_branches = 0
+    return detailed
+
+
+def measure_window(functional, warmup=DEFAULT_WARMUP, window=DEFAULT_WINDOW, data_cache=None, geometry=CLASSIC):
+    """Run the detailed pipeline from the current state and return the window's CPI
+
+    The first `warmup` retired instructions only fill the latches; cycles are
+    counted over the next `window`. Returns None if the program ends (or the
+    pipeline stalls for too long) before the window is complete. A cold copy
+    of data_cache, if given, is warmed by the same warmup instructions.
+    """
+    detailed = detailed_fork(functional, geometry=geometry)
+    if data_cache is not None:
+        detailed.data_cache = data_cache.empty_copy()
+    limit = (warmup + window) * cycle_limit_per_instruction(data_cache, geometry)
+    start = None
+    while not detailed.is_program_complete() and detailed.cycle_count < limit:
+        detailed.step()
+        if start is None:
+            if detailed.instructions_retired >= warmup:
+                start = (detailed.cycle_count, detailed.instructions_retired)
+        elif detailed.instructions_retired >= start[1] + window:
+            return (detailed.cycle_count - start[0]) / (detailed.instructions_retired - start[1])
+    return None
+
+
+def run_sampled(functional, period=DEFAULT_PERIOD, warmup=DEFAULT_WARMUP, window=DEFAULT_WINDOW,
+                max_instructions=None, max_seconds=DEFAULT_MAX_SECONDS, data_cache=None, geometry=CLASSIC):
+    """Fast-forward a loaded FunctionalSimulator, sampling the pipeline every `period` instructions
+
+    The functional model carries the architectural state for the whole run;
+    each detailed window runs on a copy-on-write fork and is discarded, so
+    the final registers and memory are exact. Returns a SampledResult.
+    """
+    if max_instructions is None:
+        max_instructions = functional.max_cycles
+    start = time.perf_counter()
+    deadline = start + max_seconds
+    initial = functional.snapshot()
+    samples = []
+
+    status = RunResult.COMPLETE
+    next_sample = functional.cycle_count
+    while True:
+        if functional.cycle_count >= next_sample:
+            cpi = measure_window(functional, warmup, window, data_cache, geometry)
+            if cpi is not None:
+                samples.append(cpi)
+            next_sample += period
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            status = RunResult.TIME_LIMIT
+            break
+        result = functional.run(max_cycles=min(next_sample, max_instructions), max_seconds=remaining)
+        if result.status != RunResult.CYCLE_LIMIT or functional.cycle_count >= max_instructions:
+            status = result.status
+            break
+
+    seconds = time.perf_counter() - start
+    if samples:
+        return SampledResult(status, functional.cycle_count, samples, seconds)
+
+    # Nothing long enough to sample: simulate the whole run in detail instead
+    detailed = detailed_fork(functional, initial, geometry)
+    if data_cache is not None:
+        detailed.data_cache = data_cache.empty_copy()
+    result = detailed.run(max_cycles=max_instructions * cycle_limit_per_instruction(data_cache, geometry),
+                          max_seconds=max(deadline - time.perf_counter(), 0.0))
+    seconds = time.perf_counter() - start
+    if result.status != RunResult.COMPLETE:
+        # The detailed run did not get as far as the functional one; its cycles are not the run's
+        if status == RunResult.COMPLETE:
+            status = result.status
+        return SampledResult(status, functional.cycle_count, samples, seconds)
+    return SampledResult(status, functional.cycle_count, samples, seconds, exact_cycles=detailed.cycle_count)
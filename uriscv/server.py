@@ -0,0 +1,455 @@
+import asyncio
+import itertools
+import json
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .assembler import IncrementalAssembler, split_source
+from .engine import PipelineEngine, RunResult, DEFAULT_MAX_SECONDS
+from .errors import UriscvError
+from .functional import FunctionalSimulator
+from .geometry import parse_geometry
+from .superscalar import DualIssueEngine
+
+# ============================================================
+# μRISCV simulation server: one warm simulator shared over a local socket
+# ============================================================
+
+# Protocol: newline-delimited JSON in both directions. A request is
+#   {"id": 7, "op": "run", "source": "...", "max_cycles": 5000}
+# and is answered by zero or more {"id": 7, "event": "progress", ...} lines
+# followed by exactly one {"id": 7, "event": "result", ...} or
+# {"id": 7, "event": "error", "error": "..."}. Requests on one connection may
+# overlap; replies carry the request id.
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_JOB_CYCLES = 100000
+MAX_JOB_CYCLES = 10_000_000
+# Cycles simulated between two progress events of a run
+SLICE_CYCLES = 20000
+MAX_SESSIONS = 64
+# Longest request or reply line; longer requests are answered with an error
+MAX_LINE_BYTES = 16 << 20
+# Largest memory range a request may dump, in bytes
+MAX_DUMP_BYTES = 1 << 20
+
+MODES = {"pipelined": PipelineEngine, "dual-issue": DualIssueEngine, "functional": FunctionalSimulator}
+
+# Answered on the connection without going through the job queue
+IMMEDIATE_OPS = ("stats",)
+JOB_OPS = ("assemble", "run", "open", "step", "state", "close")
+
+
+class Job:
+    """One queued request and the connection to answer on"""
+
+    def __init__(self, request, send):
+        self.id = request.get("id")
+        self.op = request["op"]
+        self.request = request
+        self.send = send
+        self.queued_at = time.perf_counter()
+
+    async def reply(self, event, **fields):
+        await self.send({"id": self.id, "event": event, **fields})
+
+
+class Session:
+    """An engine kept between requests so a client can step it"""
+
+    def __init__(self, session_id, engine):
+        self.id = session_id
+        self.engine = engine
+        self.lock = asyncio.Lock()
+
+
+class SimulationServer:
+    """Serve assemble/run/step/state requests from a bounded queue to a pool of warm engines
+
+    Each worker owns an engine per mode and an IncrementalAssembler that
+    outlive the jobs, so a run costs neither startup nor reassembly of an
+    unchanged source. Simulation happens on a thread per worker in slices of
+    SLICE_CYCLES, between which progress is streamed and the event loop
+    keeps accepting requests. A job is refused when the queue is full.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE, max_cycles=MAX_JOB_CYCLES,
+                 max_seconds=DEFAULT_MAX_SECONDS):
+        self.worker_count = workers
+        self.queue_size = queue_size
+        self.max_cycles = max_cycles
+        self.max_seconds = max_seconds
+        self.queue = None
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+        self.server = None
+        self.workers = []
+        self.stats = {'completed': 0, 'failed': 0, 'rejected': 0, 'cycles': 0}
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+
+    async def start(self, path=None, host="127.0.0.1", port=0):
+        """Listen on a Unix socket at path, or on host:port; returns the address"""
+        self.queue = asyncio.Queue(self.queue_size)
+        self.workers = [asyncio.create_task(self.worker(index)) for index in range(self.worker_count)]
+        if path is not None:
+            if os.path.exists(path):
+                # A stale socket from an earlier server; never remove anything else
+                if not stat.S_ISSOCK(os.stat(path).st_mode):
+                    raise UriscvError(f"{path} exists and is not a socket")
+                os.unlink(path)
+            self.server = await asyncio.start_unix_server(self.handle_connection, path=path, limit=MAX_LINE_BYTES)
+            return path
+        self.server = await asyncio.start_server(self.handle_connection, host=host, port=port, limit=MAX_LINE_BYTES)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        for task in self.workers:
+            task.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.executor.shutdown(wait=True)
+
+    # -------------------------
+    # Connections
+    # -------------------------
+
+    async def handle_connection(self, reader, writer):
+        async def send(message):
+            if writer.is_closing():
+                return
+            writer.write(json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n")
+            await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await read_line(reader)
+                except LineTooLong:
+                    await send({"id": None, "event": "error", "error": f"request longer than {MAX_LINE_BYTES} bytes"})
+                    continue
+                if not line:
+                    break
+                if line.strip():
+                    await self.dispatch(line, send)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, line, send):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+        except ValueError as e:
+            await send({"id": None, "event": "error", "error": f"bad request: {e}"})
+            return
+        op = request.get("op")
+        if op in IMMEDIATE_OPS:
+            await send({"id": request.get("id"), "event": "result", **self.server_stats()})
+            return
+        if op not in JOB_OPS:
+            await send({"id": request.get("id"), "event": "error", "error": f"unknown op '{op}'"})
+            return
+        try:
+            self.queue.put_nowait(Job(request, send))
+        except asyncio.QueueFull:
+            self.stats['rejected'] += 1
+            await send({"id": request.get("id"), "event": "error", "error": "queue full, retry later"})
+
+    def server_stats(self):
+        return {
+            'workers': self.worker_count,
+            'queued': self.queue.qsize(),
+            'queue_size': self.queue_size,
+            'sessions': len(self.sessions),
+            **self.stats,
+        }
+
+    # -------------------------
+    # Workers
+    # -------------------------
+
+    async def worker(self, index):
+        engines = {}
+        assembler = IncrementalAssembler()
+        while True:
+            job = await self.queue.get()
+            try:
+                handler = getattr(self, f"op_{job.op}")
+                await job.reply("result", **await handler(job, engines, assembler))
+                self.stats['completed'] += 1
+            except (UriscvError, KeyError, TypeError, ValueError) as e:
+                self.stats['failed'] += 1
+                message = f"missing field {e}" if isinstance(e, KeyError) else str(e)
+                await job.reply("error", error=message)
+            except ConnectionError:
+                self.stats['failed'] += 1
+            except Exception as e:
+                # A bug reached by one request must not take the worker down with it
+                self.stats['failed'] += 1
+                await job.reply("error", error=f"internal error: {type(e).__name__}: {e}")
+            finally:
+                self.queue.task_done()
+
+    async def call(self, function, *args):
+        """Run blocking simulator work on the worker threads"""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def budget(self, request):
+        """The request's max_cycles, capped by the server's"""
+        cycles = int(request.get("max_cycles", DEFAULT_JOB_CYCLES))
+        if cycles <= 0:
+            raise ValueError("max_cycles must be positive")
+        return min(cycles, self.max_cycles)
+
+    def session(self, request):
+        session = self.sessions.get(request["session"])
+        if session is None:
+            raise UriscvError(f"no session {request['session']}")
+        return session
+
+    # -------------------------
+    # Operations
+    # -------------------------
+
+    async def op_assemble(self, job, engines, assembler):
+        result = await self.call(assembler.update, split_source(field(job.request, "source", str)))
+        return {
+            'errors': [result.errors[line_num] for line_num in sorted(result.errors)],
+            'program': {f"0x{addr:08x}": f"0x{word:08x}" for addr, word in sorted((result.program_memory or {}).items())},
+            'labels': result.labels,
+        }
+
+    async def op_run(self, job, engines, assembler):
+        request = job.request
+        mode = request.get("mode", "pipelined")
+        engine = engines.get(mode)
+        if engine is None:
+            engine = engines[mode] = new_engine(mode)
+        await self.call(prepare, engine, assembler, request)
+        result = await self.simulate(job, engine, self.budget(request))
+        return {**result.as_dict(), **engine_state(engine, request)}
+
+    async def simulate(self, job, engine, budget):
+        """Run engine up to budget more cycles, streaming progress after every slice"""
+        start = time.perf_counter()
+        deadline = start + self.max_seconds
+        target = engine.cycle_count + budget
+        progress = job.request.get("progress", True)
+        while True:
+            before = engine.cycle_count
+            limit = min(engine.cycle_count + SLICE_CYCLES, target)
+            result = await self.call(engine.run, limit, max(deadline - time.perf_counter(), 0.0))
+            self.stats['cycles'] += engine.cycle_count - before
+            if result.status != RunResult.CYCLE_LIMIT or engine.cycle_count >= target:
+                break
+            if time.perf_counter() > deadline:
+                result.status = RunResult.TIME_LIMIT
+                break
+            if progress:
+                await job.reply("progress", cycles=engine.cycle_count, instructions=engine.instructions_retired)
+        result.cycles = engine.cycle_count
+        result.seconds = time.perf_counter() - start
+        return result
+
+    async def op_open(self, job, engines, assembler):
+        if len(self.sessions) >= MAX_SESSIONS:
+            raise UriscvError(f"too many sessions (limit {MAX_SESSIONS})")
+        engine = new_engine(job.request.get("mode", "pipelined"))
+        await self.call(prepare, engine, assembler, job.request)
+        session = Session(next(self.session_ids), engine)
+        self.sessions[session.id] = session
+        return {'session': session.id, **engine_state(engine, job.request)}
+
+    async def op_step(self, job, engines, assembler):
+        session = self.session(job.request)
+        async with session.lock:
+            engine = session.engine
+            cycles = self.budget({'max_cycles': job.request.get("cycles", 1)})
+            if engine.is_program_complete():
+                status = RunResult.COMPLETE
+            elif cycles == 1:
+                await self.call(engine.step)
+                status = RunResult.COMPLETE if engine.is_program_complete() else RunResult.CYCLE_LIMIT
+            else:
+                status = (await self.simulate(job, engine, cycles)).status
+            return {'session': session.id, 'status': status, **engine_state(engine, job.request)}
+
+    async def op_state(self, job, engines, assembler):
+        session = self.session(job.request)
+        async with session.lock:
+            return {'session': session.id, **engine_state(session.engine, job.request)}
+
+    async def op_close(self, job, engines, assembler):
+        session = self.session(job.request)
+        async with session.lock:
+            del self.sessions[session.id]
+        return {'session': session.id}
+
+
+def new_engine(mode):
+    engine_class = MODES.get(mode)
+    if engine_class is None:
+        raise UriscvError(f"unknown mode '{mode}' (choose from {', '.join(MODES)})")
+    engine = engine_class()
+    engine.record_history = False
+    return engine
+
+
+def field(request, name, kind, default=None):
+    """request[name], checked to be of type kind (a type or tuple of types); default if absent
+
+    A missing field without a default raises KeyError, a value of the
+    wrong type ValueError, so both are answered as bad requests.
+    """
+    if name not in request:
+        if default is None:
+            raise KeyError(name)
+        return default
+    value = request[name]
+    if not isinstance(value, kind) or isinstance(value, bool) and kind is not bool:
+        raise ValueError(f"'{name}' has the wrong type ({type(value).__name__})")
+    return value
+
+
+def parse_word(value, what):
+    """An address or word, given as a JSON number or a string such as 0x40"""
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"{what} must be a number or a string, not {type(value).__name__}")
+    return int(value, 0) if isinstance(value, str) else value
+
+
+def prepare(engine, assembler, request):
+    """Reset engine and install the request's program and initial memory"""
+    source = field(request, "source", str)
+    geometry = parse_geometry(field(request, "pipeline", str, "classic"))
+    memory = field(request, "memory", dict, {})
+    result = assembler.update(split_source(source))
+    if not result.ok:
+        raise UriscvError("\n".join(result.errors[line_num] for line_num in sorted(result.errors)))
+    if not result.program_memory:
+        raise UriscvError("empty program")
+    engine.reset()
+    engine.set_geometry(geometry)
+    # A spin loop waiting for nothing is usually a bug, but a client may run one on purpose
+    engine.detect_loops = bool(request.get("detect_loops", True))
+    for addr, value in memory.items():
+        if not engine.write_word(parse_word(addr, "memory address"), parse_word(value, f"memory[{addr}]")):
+            raise UriscvError(f"cannot write memory at {addr}")
+    engine.load_program(result.program_memory, result.labels)
+    engine.reset_pipeline()
+
+
+def engine_state(engine, request):
+    """Counters, PC and registers, plus latches and a memory range when the request asks"""
+    state = {
+        'counters': engine.counters(),
+        'pc': engine.pc,
+        'registers': list(engine.registers),
+        'complete': engine.is_program_complete(),
+    }
+    if request.get("latches") and isinstance(engine, PipelineEngine) and not isinstance(engine, FunctionalSimulator):
+        state['latches'] = engine.latch_state()
+    if "dump" in request:
+        dump = field(request, "dump", list)
+        if len(dump) != 2:
+            raise ValueError("'dump' must be [start, end]")
+        start, end = (parse_word(value, "dump bound") for value in dump)
+        # Capped like the cycle budget, so a reply stays well under MAX_LINE_BYTES
+        end = min(end, start + MAX_DUMP_BYTES)
+        state['memory'] = {f"0x{addr:08x}": engine.read_word(addr) for addr in range(start & ~3, end, 4)}
+    return state
+
+
+class LineTooLong(Exception):
+    """A line exceeded MAX_LINE_BYTES; it has been read past and dropped"""
+
+
+async def read_line(reader):
+    """The next line from reader (b"" at the end of the stream)
+
+    A line longer than the reader's limit is consumed up to and including
+    its newline and raises LineTooLong, so the following lines still parse.
+    """
+    overrun = False
+    while True:
+        try:
+            line = await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            # The stream ended; e.partial is a last line without a newline
+            line = e.partial
+        except asyncio.LimitOverrunError as e:
+            overrun = True
+            await reader.readexactly(e.consumed)
+            continue
+        if overrun:
+            raise LineTooLong()
+        return line
+
+
+# -------------------------
+# Client
+# -------------------------
+
+async def request(address, message, on_progress=None):
+    """Send one request to a server at a socket path or (host, port); returns the result fields
+
+    Progress events are passed to on_progress; an error event raises UriscvError.
+    """
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address, limit=MAX_LINE_BYTES)
+    else:
+        reader, writer = await asyncio.open_connection(*address, limit=MAX_LINE_BYTES)
+    try:
+        message = {"id": 1, **message}
+        writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await writer.drain()
+        while True:
+            try:
+                line = await read_line(reader)
+            except LineTooLong:
+                raise UriscvError(f"reply longer than {MAX_LINE_BYTES} bytes") from None
+            if not line:
+                raise UriscvError("server closed the connection")
+            reply = json.loads(line)
+            if reply["event"] == "progress":
+                if on_progress is not None:
+                    on_progress(reply)
+                continue
+            if reply["event"] == "error":
+                raise UriscvError(reply["error"])
+            return reply
+    finally:
+        writer.close()
+
+
+def serve(path=None, host="127.0.0.1", port=0, workers=DEFAULT_WORKERS, queue_size=DEFAULT_QUEUE_SIZE,
+          max_cycles=MAX_JOB_CYCLES, on_ready=None):
+    """Run a server until interrupted; on_ready(address) is called once it listens"""
+    async def main():
+        server = SimulationServer(workers, queue_size, max_cycles)
+        address = await server.start(path=path, host=host, port=port)
+        if on_ready is not None:
+            on_ready(address)
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,251 @@
+import importlib.util
+import os
+import struct
+import sys
+from array import array
+
+from .errors import UriscvError
+
+# ============================================================
+# μRISCV state hashing: per-cycle hash streams and divergence bisection
+# ============================================================
+
+# File layout (little-endian): magic, format version, unused, number of cycles,
+# then one 64-bit rolling hash per cycle. Hashes are only comparable between
+# runs of the same Python minor version.
+MAGIC = b"URVHASH\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHHQ")
+
+MASK64 = (1 << 64) - 1
+
+# Latch fields covered by the hash: the classic contents of each pipeline
+# register. Bookkeeping fields (such as EX_MEM.PC) are left out, so streams
+# stay comparable with versions of the engine that do not have them.
+HASHED_LATCH_FIELDS = (
+    ('IF_ID', ('IR', 'NPC', 'PC')),
+    ('ID_EX', ('A', 'B', 'IMM', 'IR', 'NPC')),
+    ('EX_MEM', ('ALUOUTPUT', 'cond', 'IR', 'B')),
+    ('MEM_WB', ('LMD', 'IR', 'ALUOUTPUT')),
+    ('WB', ('IR', 'RD', 'VALUE')),
+)
+
+# Snapshot spacing of bisect runs, in cycles
+DEFAULT_CHECKPOINT_INTERVAL = 1024
+
+
+def state_fields(engine):
+    """[(name, value)] for PC, registers, latch fields and stall counter, in hash order
+
+    Works on any engine with a pipeline_state mapping, including versions
+    whose latches are plain dicts. Second-lane latches are included when the
+    engine has them.
+    """
+    state = engine.pipeline_state
+    fields = [('PC', state['PC'])]
+    fields += [(f"x{index}", value) for index, value in enumerate(engine.registers)]
+    for name, names in HASHED_LATCH_FIELDS:
+        latch = state[name]
+        fields += [(f"{name}.{field}", latch.get(field, 0)) for field in names]
+    # The second lane of a dual-issue engine
+    for name, names in HASHED_LATCH_FIELDS:
+        latch = state.get(f"{name}_2")
+        if latch is not None:
+            fields += [(f"{name}_2.{field}", latch.get(field, 0)) for field in names]
+    fields.append(('stall_remaining', getattr(engine, 'stall_remaining', 0)))
+    return fields
+
+
+def state_hash(engine):
+    """64-bit hash of the architectural and latch state, memory included"""
+    return hash((tuple(value for _, value in state_fields(engine)), engine.memory.digest())) & MASK64
+
+
+def frozen_state_hashes(engine, cycles):
+    """state_hash for each of the last cycles frozen cycles, oldest first
+
+    Only the stall counter changed while the pipeline was frozen: it
+    counted down by one per cycle to its current value.
+    """
+    values = [value for _, value in state_fields(engine)]
+    digest = engine.memory.digest()
+    hashes = []
+    for ahead in range(cycles - 1, -1, -1):
+        values[-1] = engine.stall_remaining + ahead
+        hashes.append(hash((tuple(values), digest)) & MASK64)
+    return hashes
+
+
+class HashStream:
+    """One rolling hash per cycle in an array('Q')
+
+    hashes[n] folds in the state after every cycle up to cycle n + 1, so two
+    runs that differ at some cycle differ from there on, even if their states
+    later converge again. The engine calls record() at the end of each step.
+    """
+
+    def __init__(self, hashes=None):
+        self.hashes = hashes if hashes is not None else array('Q')
+
+    @classmethod
+    def for_engine(cls, engine):
+        """A new stream recording engine's cycles from now on"""
+        stream = cls()
+        engine.state_hashes = stream
+        return stream
+
+    def reset(self):
+        del self.hashes[:]
+
+    def record(self, engine):
+        previous = self.hashes[-1] if self.hashes else 0
+        self.hashes.append(hash((previous, state_hash(engine))) & MASK64)
+
+    def record_frozen(self, engine, cycles):
+        """Record the last cycles cycles, all spent frozen by a memory stall"""
+        previous = self.hashes[-1] if self.hashes else 0
+        for current in frozen_state_hashes(engine, cycles):
+            previous = hash((previous, current)) & MASK64
+            self.hashes.append(previous)
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, len(self.hashes)))
+            f.write(self.hashes.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise UriscvError(f"{path} is not a μRISCV hash stream")
+        magic, version, _, count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise UriscvError(f"{path} is not a μRISCV hash stream")
+        if version != VERSION:
+            raise UriscvError(f"{path} is hash stream version {version}; this simulator reads version {VERSION}")
+        hashes = array('Q')
+        hashes.frombytes(data[HEADER.size:HEADER.size + 8 * count])
+        if len(hashes) != count:
+            raise UriscvError(f"{path} is truncated")
+        return cls(hashes)
+
+    def first_divergence(self, golden):
+        """First cycle (1-based) at which the streams differ, or None if they are identical
+
+        A run that stops earlier than the other diverges at the cycle after its last.
+        """
+        mine, theirs = self.hashes, golden.hashes
+        common = min(len(mine), len(theirs))
+        if common and mine[common - 1] != theirs[common - 1]:
+            # Rolling hashes stay different once they part, so bisect for the first mismatch
+            low, high = 0, common - 1
+            while low < high:
+                middle = (low + high) // 2
+                if mine[middle] != theirs[middle]:
+                    high = middle
+                else:
+                    low = middle + 1
+            return low + 1
+        if len(mine) != len(theirs):
+            return common + 1
+        return None
+
+
+# -------------------------
+# Bisection between two engines
+# -------------------------
+
+class Divergence:
+    """Where and how a candidate run first departs from its reference"""
+
+    def __init__(self, cycle, differences, memory_differences, ended=None):
+        self.cycle = cycle
+        # [(field, reference value, candidate value)]
+        self.differences = differences
+        # [(address, reference word, candidate word)]
+        self.memory_differences = memory_differences
+        # 'reference' or 'candidate' when that run stopped before this cycle
+        self.ended = ended
+
+    def as_dict(self):
+        return {
+            'cycle': self.cycle,
+            'ended': self.ended,
+            'fields': [{'field': name, 'reference': a, 'candidate': b} for name, a, b in self.differences],
+            'memory': [{'address': addr, 'reference': a, 'candidate': b} for addr, a, b in self.memory_differences],
+        }
+
+
+def record_run(engine, max_cycles, interval=DEFAULT_CHECKPOINT_INTERVAL):
+    """Step engine to completion or max_cycles, hashing every cycle
+
+    Returns (HashStream, {cycle_count: snapshot}) with a snapshot at the
+    start and every interval cycles. The engine's own hooks are not used,
+    so any engine version with step()/snapshot() can be recorded.
+    """
+    stream = HashStream()
+    checkpoints = {engine.cycle_count: engine.snapshot()}
+    start = engine.cycle_count
+    while not engine.is_program_complete() and engine.cycle_count < max_cycles:
+        engine.step()
+        stream.record(engine)
+        if (engine.cycle_count - start) % interval == 0:
+            checkpoints[engine.cycle_count] = engine.snapshot()
+        if engine.loop_report:
+            break
+    return stream, checkpoints
+
+
+def step_to(engine, checkpoints, cycle):
+    """Restore the last checkpoint before cycle and step until cycle_count == cycle (or the run stops)"""
+    base = max(c for c in checkpoints if c < cycle)
+    engine.restore(checkpoints[base])
+    while engine.cycle_count < cycle and not engine.is_program_complete():
+        engine.step()
+    return engine.cycle_count == cycle
+
+
+def bisect_divergence(reference, candidate, max_cycles, interval=DEFAULT_CHECKPOINT_INTERVAL, golden=None):
+    """Find the first cycle where candidate's state departs from reference's, and what differs
+
+    Both engines must start in the same state. Each run is recorded once
+    with snapshots every interval cycles; the first differing cycle is
+    found by bisecting the hash streams, then both engines are restored
+    from their snapshots and stepped to that cycle to compare field by
+    field. golden, a saved HashStream of the reference, is checked first
+    when given. Returns a Divergence, or None when the runs agree.
+    """
+    offset = candidate.cycle_count
+    candidate_stream, candidate_checkpoints = record_run(candidate, max_cycles, interval)
+    if golden is not None and candidate_stream.first_divergence(golden) is None:
+        return None
+    reference_stream, reference_checkpoints = record_run(reference, max_cycles, interval)
+    index = candidate_stream.first_divergence(reference_stream)
+    if index is None:
+        return None
+
+    cycle = offset + index
+    reference_reached = step_to(reference, reference_checkpoints, cycle)
+    candidate_reached = step_to(candidate, candidate_checkpoints, cycle)
+    ended = None if reference_reached and candidate_reached else ('reference' if not reference_reached else 'candidate')
+    differences = [
+        (name, a, b) for (name, a), (_, b) in zip(state_fields(reference), state_fields(candidate)) if a != b
+    ]
+    memory_differences = list(reference.memory.diff_words(candidate.memory))
+    return Divergence(cycle, differences, memory_differences, ended)
+
+
+def load_reference(path, name="uriscv_reference"):
+    """Import another copy of the uriscv package (e.g. an older checkout) under a different name"""
+    init = os.path.join(path, "__init__.py")
+    if not os.path.exists(init):
+        raise UriscvError(f"{path} is not a uriscv package directory")
+    spec = importlib.util.spec_from_file_location(name, init, submodule_search_locations=[path])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,261 @@
+from .engine import PipelineEngine
+from .errors import SimulationError
+from .geometry import CLASSIC
+from .instructions import handler_for
+from .latches import IfId, IdEx, ExMem, MemWb, WbLatch, LATCH_NAMES, SECOND_LANE_NAMES
+
+# ============================================================
+# μRISCV dual-issue pipeline: two in-order lanes of IF/ID/EX/MEM/WB
+# ============================================================
+
+# Why IF fetched a single instruction instead of a pair
+SINGLE_REASONS = ("memory", "dependency", "branch", "fetch")
+
+# Pipeline map rows that get a second-lane row below them
+LANE_ROWS = ('IF/ID.IR', 'ID/EX.IR', 'EX/MEM.IR', 'MEM/WB.IR', 'WB')
+
+
+def lane_row(row):
+    """Pipeline map row (pipeline_history key) of the second lane"""
+    return f"{row} 2"
+
+
+class DualIssueEngine(PipelineEngine):
+    """2-wide in-order pipeline: instructions move through the stages in pairs
+
+    Lane 1 uses the inherited latches and always holds the older
+    instruction of a pair; lane 2 has its own set (IF_ID_2 ... WB_2). IF
+    fetches a pair unless the second instruction cannot go with the first:
+    both are LW/SW (there is one memory port), it reads the first one's
+    destination, the first is a branch (a taken branch would have to
+    squash its partner), or it is not an instruction in the code region.
+
+    The single-issue pipeline relies on programs keeping RAW dependences
+    three slots apart; pairing brings them closer in time, so ID interlocks
+    instead: a pair waits in IF/ID while an instruction in EX or MEM has
+    yet to write a register it reads.
+    """
+    latch_names = LATCH_NAMES + SECOND_LANE_NAMES
+
+    def __init__(self, verbose=False):
+        self.if_id2, self.id_ex2, self.ex_mem2, self.mem_wb2, self.wb2 = IfId(), IdEx(), ExMem(), MemWb(), WbLatch()
+        self.next_if_id2, self.next_id_ex2, self.next_ex_mem2, self.next_mem_wb2, self.next_wb2 = (
+            IfId(), IdEx(), ExMem(), MemWb(), WbLatch())
+        # Why the group in IF/ID is a single instruction (None for a pair)
+        self.if_id_single = None
+        self.issue_counts = self.empty_issue_counts()
+        super().__init__(verbose)
+
+    @staticmethod
+    def empty_issue_counts():
+        return {'groups': 0, 'paired': 0, 'interlock_stalls': 0, **{reason: 0 for reason in SINGLE_REASONS}}
+
+    def set_geometry(self, geometry):
+        if geometry != CLASSIC:
+            raise SimulationError("The dual-issue pipeline only has the classic stage layout")
+        super().set_geometry(geometry)
+
+    def latches(self):
+        return (self.if_id, self.id_ex, self.ex_mem, self.mem_wb, self.wb,
+                self.if_id2, self.id_ex2, self.ex_mem2, self.mem_wb2, self.wb2)
+
+    def map_rows(self):
+        rows = []
+        for row in super().map_rows():
+            rows.append(row)
+            if row in LANE_ROWS:
+                rows.append(lane_row(row))
+        return rows
+
+    def reset_pipeline(self):
+        super().reset_pipeline()
+        self.if_id_single = None
+        self.issue_counts = self.empty_issue_counts()
+
+    def snapshot(self):
+        snap = super().snapshot()
+        snap['issue'] = (dict(self.issue_counts), self.if_id_single)
+        return snap
+
+    def restore(self, snap):
+        super().restore(snap)
+        counts, self.if_id_single = snap.get('issue', (self.empty_issue_counts(), None))
+        self.issue_counts = dict(counts)
+
+    def counters(self):
+        counters = super().counters()
+        counts = self.issue_counts
+        groups = counts['groups']
+        counters.update({
+            'ipc': round(self.instructions_retired / self.cycle_count, 4) if self.cycle_count else 0.0,
+            'issue_groups': groups,
+            'dual_issued': counts['paired'],
+            'pair_rate': round(counts['paired'] / groups, 4) if groups else 0.0,
+            **{f"single_{reason}": counts[reason] for reason in SINGLE_REASONS},
+            'interlock_stalls': counts['interlock_stalls'],
+        })
+        return counters
+
+    # -------------------------
+    # Pipeline
+    # -------------------------
+
+    def step(self):
+        """Execute one cycle of both lanes; returns True for the priming cycle"""
+        if not self.has_program():
+            raise SimulationError("No valid program loaded")
+
+        if self.cycle_count == 0 and not self.if_id.valid:
+            self.log("Priming pipeline - first cycle")
+            self.if_id_single = self.fetch_group(self.if_id, self.if_id2)
+            self.cycle_count += 1
+            self.record_pipeline_snapshot()
+            if self.state_hashes is not None:
+                self.state_hashes.record(self)
+            return True
+
+        if self.stall_remaining:
+            self.skip_idle(1)
+            return False
+
+        self.cycle_count += 1
+        self.log(f"\n=== Cycle {self.cycle_count} ===")
+        self.record_pipeline_snapshot()
+
+        # WB: the older instruction retires first
+        if self.wb.valid:
+            self.retire(self.wb)
+        if self.wb2.valid:
+            self.retire(self.wb2)
+
+        # MEM: at most one of the two is a LW/SW
+        self.memory_access(self.ex_mem, self.next_wb)
+        self.memory_access(self.ex_mem2, self.next_wb2)
+
+        # EX: a branch is never followed by a partner in its own group, so a
+        # taken branch only squashes the group in IF/ID
+        branch_taken = self.execute(self.id_ex, self.next_ex_mem)
+        branch_taken = self.execute(self.id_ex2, self.next_ex_mem2) or branch_taken
+
+        # ID: issue the group in IF/ID, or hold it there until its operands are written
+        held = False
+        if branch_taken or not self.if_id.valid:
+            self.next_id_ex.clear()
+            self.next_id_ex2.clear()
+        elif self.waits_for_operands():
+            held = True
+            self.issue_counts['interlock_stalls'] += 1
+            self.log("ID Stage: operands not written back yet, holding IF/ID")
+            self.next_id_ex.clear()
+            self.next_id_ex2.clear()
+        else:
+            self.instruction_decode(self.if_id, self.next_id_ex)
+            self.instruction_decode(self.if_id2, self.next_id_ex2)
+            self.issue_counts['groups'] += 1
+            if self.if_id2.valid:
+                self.issue_counts['paired'] += 1
+            else:
+                self.issue_counts[self.if_id_single] += 1
+
+        self.advance_lanes(held)
+        if self.state_hashes is not None:
+            self.state_hashes.record(self)
+
+        if self.back_edge_taken:
+            self.back_edge_taken = False
+            self.check_loop_progress()
+        return False
+
+    def waits_for_operands(self):
+        """True if an instruction in EX or MEM (either lane) writes a register the IF/ID group reads"""
+        pending = [
+            (latch.IR >> 7) & 0x1F
+            for latch in (self.id_ex, self.id_ex2, self.ex_mem, self.ex_mem2)
+            if latch.valid and latch.handler.writes_rd
+        ]
+        if not any(pending):
+            return False
+        for latch in (self.if_id, self.if_id2):
+            if latch.valid:
+                sources = handler_for(latch.IR).sources(latch.IR)
+                if any(rd and rd in sources for rd in pending):
+                    return True
+        return False
+
+    def pairing_conflict(self, first, pc):
+        """Why the word at pc cannot issue together with instruction first, or None if it can"""
+        if not self.in_code(pc):
+            return "fetch"
+        second = self.fetch_decoded(pc)
+        if second == 0:
+            return "fetch"
+        older, younger = handler_for(first), handler_for(second)
+        if older.is_branch:
+            return "branch"
+        if (older.is_load or older.is_store) and (younger.is_load or younger.is_store):
+            return "memory"
+        rd = (first >> 7) & 0x1F
+        if older.writes_rd and rd and rd in younger.sources(second):
+            return "dependency"
+        return None
+
+    def fetch_group(self, first, second):
+        """IF: fetch one instruction, and its successor too when they can pair
+
+        Returns why the group is single, or None for a pair.
+        """
+        self.instruction_fetch(first)
+        if not first.valid:
+            second.clear()
+            return "fetch"
+        reason = self.pairing_conflict(first.IR, self.pc)
+        if reason is None:
+            self.instruction_fetch(second)
+        else:
+            second.clear()
+        return reason
+
+    def advance_lanes(self, held):
+        """Copy EX/MEM into MEM/WB, fetch the next group unless IF/ID is held, and swap the latch sets"""
+        for ex, mem_wb in ((self.ex_mem, self.next_mem_wb), (self.ex_mem2, self.next_mem_wb2)):
+            mem_wb.valid = ex.valid
+            mem_wb.LMD = 0
+            mem_wb.IR = ex.IR
+            mem_wb.ALUOUTPUT = ex.ALUOUTPUT
+
+        if not held:
+            self.if_id_single = self.fetch_group(self.next_if_id, self.next_if_id2)
+            self.if_id, self.next_if_id = self.next_if_id, self.if_id
+            self.if_id2, self.next_if_id2 = self.next_if_id2, self.if_id2
+        self.id_ex, self.next_id_ex = self.next_id_ex, self.id_ex
+        self.ex_mem, self.next_ex_mem = self.next_ex_mem, self.ex_mem
+        self.mem_wb, self.next_mem_wb = self.next_mem_wb, self.mem_wb
+        self.wb, self.next_wb = self.next_wb, self.wb
+        self.id_ex2, self.next_id_ex2 = self.next_id_ex2, self.id_ex2
+        self.ex_mem2, self.next_ex_mem2 = self.next_ex_mem2, self.ex_mem2
+        self.mem_wb2, self.next_mem_wb2 = self.next_mem_wb2, self.mem_wb2
+        self.wb2, self.next_wb2 = self.next_wb2, self.wb2
+
+    def is_program_complete(self):
+        pipeline_empty = not any(latch.valid for latch in self.latches())
+        return pipeline_empty and not self.in_code(self.pc) and not self.stall_remaining
+
+    def record_pipeline_snapshot(self):
+        """The single-issue snapshot plus a row per stage for the second lane"""
+        if not self.record_history:
+            return
+        super().record_pipeline_snapshot()
+        snap = self.pipeline_history[-1]
+
+        def fmt(v):
+            return f"0x{v:08x}" if v != 0 else ""
+
+        snap[lane_row('IF/ID.IR')] = fmt(self.if_id2.IR)
+        snap[lane_row('ID/EX.IR')] = fmt(self.id_ex2.IR)
+        snap[lane_row('EX/MEM.IR')] = fmt(self.ex_mem2.IR)
+        snap[lane_row('MEM/WB.IR')] = fmt(self.mem_wb2.IR)
+        wb_rd_str = ""
+        if self.mem_wb2.IR:
+            rd = (self.mem_wb2.IR >> 7) & 0x1F
+            wb_rd_str = f"x{rd}=0x{self.registers[rd]:08x}"
+        snap[lane_row('WB')] = wb_rd_str